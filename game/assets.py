@@ -5,24 +5,35 @@ import pygame
 
 ASSET_VERSION = "v9"
 
+# Tailles des sprites generes (largeur, hauteur) : permet de simuler le jeu
+# sans charger d'images (mode headless)
+SPRITE_SIZES = {
+    "skier": (52, 64),
+    "rock": (46, 36),
+    "bonus": (26, 26),
+    "speed_boost": (48, 28),
+    "drone": (44, 20),
+    "drop": (32, 32),
+    "tree": (56, 84),
+    "yeti": (54, 72),
+    "bg_tile": (200, 200),
+}
+ROCK_VARIANTS = 3
+BONUS_SPRITES = {"moonwalk": "bonus", "speed": "speed_boost"}  # sprite de chaque type de bonus
+
 
 def _asset_dir():
     return os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
 
 
-def ensure_assets():
-    asset_dir = _asset_dir()
-    os.makedirs(asset_dir, exist_ok=True)
-
-    def save_asset(name, surf):
-        path = os.path.join(asset_dir, name)
-        pygame.image.save(surf, path)
-        return path
-
-    tile_dir = _asset_dir()
+def draw_sprites():
+    # Dessine les sprites generes, sans fichier ni ecran : les memes surfaces
+    # servent aux images du jeu (ensure_assets) et aux masques de collision
+    # (masks.py, aussi en headless)
+    sprites = {}
 
     # Skier frames (design plus clean)
-    skier_paths = []
+    skier_frames = []
     suit_colors = [(210, 30, 30), (230, 50, 50), (200, 20, 20), (240, 70, 70)]
     for i, c in enumerate(suit_colors):
         surf = pygame.Surface((52, 64), pygame.SRCALPHA)
@@ -51,10 +62,11 @@ def ensure_assets():
         pygame.draw.line(surf, (110, 90, 50), (36, 26), (46, 56), 2)
         pygame.draw.circle(surf, (60, 60, 60), (16, 26), 2)
         pygame.draw.circle(surf, (60, 60, 60), (36, 26), 2)
-        skier_paths.append(save_asset(f"skier_{i}_{ASSET_VERSION}.png", surf))
+        skier_frames.append(surf)
+    sprites["skier"] = skier_frames
 
     # Rock (3 variantes anguleuses)
-    rock_paths = []
+    rocks = []
     rock_shapes = [
         [(4, 22), (10, 10), (24, 6), (38, 10), (42, 20), (32, 28), (18, 30), (8, 28)],
         [(6, 24), (14, 8), (28, 6), (40, 14), (40, 24), (30, 30), (16, 30), (6, 26)],
@@ -73,7 +85,8 @@ def ensure_assets():
                                                     (main_poly[3][0] - 4, main_poly[3][1] + 6),
                                                     (main_poly[2][0] - 2, main_poly[2][1] + 2)])
         pygame.draw.polygon(rock, (30, 30, 40), main_poly, 1)
-        rock_paths.append(save_asset(f"rock_{idx}_{ASSET_VERSION}.png", rock))
+        rocks.append(rock)
+    sprites["rock"] = rocks
 
     # Bonus (moonwalk)
     bonus = pygame.Surface((26, 26), pygame.SRCALPHA)
@@ -81,7 +94,7 @@ def ensure_assets():
     pygame.draw.circle(bonus, (255, 240, 200), (10, 10), 4)
     pygame.draw.circle(bonus, (220, 170, 40), (16, 16), 7, 2)
     pygame.draw.arc(bonus, (150, 110, 20), (6, 6, 14, 14), math.pi, 2 * math.pi, 2)
-    bonus_path = save_asset(f"bonus_{ASSET_VERSION}.png", bonus)
+    sprites["bonus"] = bonus
 
     # Speed boost (anneaux olympiques)
     speed_boost = pygame.Surface((48, 28), pygame.SRCALPHA)
@@ -97,7 +110,7 @@ def ensure_assets():
         # petit contour clair pour mieux ressortir sur la neige
         pygame.draw.circle(speed_boost, (245, 245, 245), center, 7, 4)
         pygame.draw.circle(speed_boost, color, center, 7, 3)
-    speed_boost_path = save_asset(f"speed_boost_{ASSET_VERSION}.png", speed_boost)
+    sprites["speed_boost"] = speed_boost
 
     # Drone
     drone = pygame.Surface((44, 20), pygame.SRCALPHA)
@@ -107,7 +120,7 @@ def ensure_assets():
     pygame.draw.circle(drone, (140, 140, 140), (6, 10), 3, 1)
     pygame.draw.circle(drone, (140, 140, 140), (38, 10), 3, 1)
     pygame.draw.circle(drone, (200, 40, 40), (22, 10), 2)
-    drone_path = save_asset(f"drone_{ASSET_VERSION}.png", drone)
+    sprites["drone"] = drone
 
     # Drone drop (bloc de glace) plus gros
     drop = pygame.Surface((32, 32), pygame.SRCALPHA)
@@ -115,7 +128,7 @@ def ensure_assets():
     pygame.draw.rect(drop, (120, 180, 230), (8, 10, 16, 8), border_radius=3)
     pygame.draw.line(drop, (220, 240, 255), (8, 12), (22, 12), 1)
     pygame.draw.rect(drop, (80, 120, 170), (4, 6, 24, 18), 1, border_radius=4)
-    drop_path = save_asset(f"drone_drop_{ASSET_VERSION}.png", drop)
+    sprites["drop"] = drop
 
     # Tree (plus details)
     tree = pygame.Surface((56, 84), pygame.SRCALPHA)
@@ -127,26 +140,21 @@ def ensure_assets():
     pygame.draw.circle(tree, (230, 240, 245), (38, 34), 2)
     pygame.draw.line(tree, (10, 80, 35), (28, 12), (12, 42), 2)
     pygame.draw.line(tree, (20, 100, 45), (28, 26), (16, 58), 2)
-    tree_path = save_asset(f"tree_{ASSET_VERSION}.png", tree)
-
-    # Yeti (tiles)
-    yeti_paths = []
-    tile_yeti = ["tile_0078.png", "tile_0079.png", "tile_0080.png"]
-    if all(os.path.exists(os.path.join(tile_dir, t)) for t in tile_yeti):
-        yeti_paths = [os.path.join(tile_dir, t) for t in tile_yeti]
-    else:
-        yeti = pygame.Surface((54, 72), pygame.SRCALPHA)
-        pygame.draw.ellipse(yeti, (235, 235, 240), (4, 14, 46, 52))  # body
-        pygame.draw.ellipse(yeti, (210, 210, 220), (10, 20, 34, 38))  # chest
-        pygame.draw.circle(yeti, (235, 235, 240), (27, 12), 10)  # head
-        pygame.draw.circle(yeti, (200, 200, 210), (22, 12), 4)  # left eye bg
-        pygame.draw.circle(yeti, (200, 200, 210), (32, 12), 4)  # right eye bg
-        pygame.draw.circle(yeti, (40, 40, 40), (22, 12), 2)  # left eye
-        pygame.draw.circle(yeti, (40, 40, 40), (32, 12), 2)  # right eye
-        pygame.draw.arc(yeti, (60, 60, 60), (20, 16, 14, 8), 0, math.pi, 2)  # mouth
-        pygame.draw.rect(yeti, (180, 180, 190), (14, 46, 12, 18))  # legs
-        pygame.draw.rect(yeti, (180, 180, 190), (28, 46, 12, 18))
-        yeti_paths = [save_asset(f"yeti_{ASSET_VERSION}.png", yeti)]
+    sprites["tree"] = tree
+
+    # Yeti (dessine si les tiles ne sont pas la, voir ensure_assets)
+    yeti = pygame.Surface((54, 72), pygame.SRCALPHA)
+    pygame.draw.ellipse(yeti, (235, 235, 240), (4, 14, 46, 52))  # body
+    pygame.draw.ellipse(yeti, (210, 210, 220), (10, 20, 34, 38))  # chest
+    pygame.draw.circle(yeti, (235, 235, 240), (27, 12), 10)  # head
+    pygame.draw.circle(yeti, (200, 200, 210), (22, 12), 4)  # left eye bg
+    pygame.draw.circle(yeti, (200, 200, 210), (32, 12), 4)  # right eye bg
+    pygame.draw.circle(yeti, (40, 40, 40), (22, 12), 2)  # left eye
+    pygame.draw.circle(yeti, (40, 40, 40), (32, 12), 2)  # right eye
+    pygame.draw.arc(yeti, (60, 60, 60), (20, 16, 14, 8), 0, math.pi, 2)  # mouth
+    pygame.draw.rect(yeti, (180, 180, 190), (14, 46, 12, 18))  # legs
+    pygame.draw.rect(yeti, (180, 180, 190), (28, 46, 12, 18))
+    sprites["yeti"] = yeti
 
     # Background tile (piste de ski plus propre)
     bg = pygame.Surface((200, 200))
@@ -164,12 +172,42 @@ def ensure_assets():
         pygame.draw.line(bg, (210, 222, 238), (x, 0), (x + 70, 200), 2)
         pygame.draw.line(bg, (240, 248, 255), (x + 4, 0), (x + 74, 200), 1)
 
-    random.seed(4)
+    rng = random.Random(4)
     for _ in range(60):
-        x = random.randint(0, 199)
-        y = random.randint(0, 199)
-        pygame.draw.circle(bg, (245, 250, 255), (x, y), random.randint(1, 2))
-    bg_path = save_asset(f"bg_tile_{ASSET_VERSION}.png", bg)
+        x = rng.randint(0, 199)
+        y = rng.randint(0, 199)
+        pygame.draw.circle(bg, (245, 250, 255), (x, y), rng.randint(1, 2))
+    sprites["bg_tile"] = bg
+
+    return sprites
+
+
+def ensure_assets():
+    asset_dir = _asset_dir()
+    os.makedirs(asset_dir, exist_ok=True)
+
+    def save_asset(name, surf):
+        path = os.path.join(asset_dir, name)
+        pygame.image.save(surf, path)
+        return path
+
+    tile_dir = _asset_dir()
+    sprites = draw_sprites()
+    skier_paths = [save_asset(f"skier_{i}_{ASSET_VERSION}.png", surf) for i, surf in enumerate(sprites["skier"])]
+    rock_paths = [save_asset(f"rock_{idx}_{ASSET_VERSION}.png", rock) for idx, rock in enumerate(sprites["rock"])]
+    bonus_path = save_asset(f"bonus_{ASSET_VERSION}.png", sprites["bonus"])
+    speed_boost_path = save_asset(f"speed_boost_{ASSET_VERSION}.png", sprites["speed_boost"])
+    drone_path = save_asset(f"drone_{ASSET_VERSION}.png", sprites["drone"])
+    drop_path = save_asset(f"drone_drop_{ASSET_VERSION}.png", sprites["drop"])
+    tree_path = save_asset(f"tree_{ASSET_VERSION}.png", sprites["tree"])
+
+    # Yeti (tiles)
+    tile_yeti = ["tile_0078.png", "tile_0079.png", "tile_0080.png"]
+    if all(os.path.exists(os.path.join(tile_dir, t)) for t in tile_yeti):
+        yeti_paths = [os.path.join(tile_dir, t) for t in tile_yeti]
+    else:
+        yeti_paths = [save_asset(f"yeti_{ASSET_VERSION}.png", sprites["yeti"])]
+    bg_path = save_asset(f"bg_tile_{ASSET_VERSION}.png", sprites["bg_tile"])
 
     return {
         "skier": skier_paths,
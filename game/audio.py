@@ -2,6 +2,7 @@ import math
 import os
 from array import array
 import pygame
+from .events import GATE_PASSED, ROCK_HIT, BONUS_TAKEN, YETI_CONTACT, FINISH
 
 
 # ca c'est pour creer un son simple (je debute, c'est pas parfait mais ca marche).
@@ -193,6 +194,30 @@ def play_sfx(sfx, name):
         sound.play()
 
 
+# son de chaque événement du ski (type, variante) ; variante None : toutes
+EVENT_SOUNDS = {
+    (GATE_PASSED, None): "gate",
+    (ROCK_HIT, None): "rock",
+    (BONUS_TAKEN, "moonwalk"): "bonus",
+    (BONUS_TAKEN, "speed"): "speed",
+    (YETI_CONTACT, None): "rock",
+    (FINISH, "missed"): "game_over",
+    (FINISH, "crash"): "game_over",
+}
+
+
+def event_sounds(sfx):
+    """Consommateur du bus d'événements (events.py) : chaque son au plus une fois par image"""
+    def play(events):
+        played = set()
+        for event in events:
+            name = EVENT_SOUNDS.get((event.type, event.variant), EVENT_SOUNDS.get((event.type, None)))
+            if name is not None and name not in played:
+                played.add(name)
+                play_sfx(sfx, name)
+    return play
+
+
 def set_master_volume(audio, volume):
     """Applique un volume global (0.0 à 1.0)"""
     volume = max(0.0, min(1.0, float(volume)))
@@ -0,0 +1,293 @@
+"""
+Pilote automatique du skieur (tests d'endurance, mesures, démo)
+
+L'Autopilot s'utilise comme une policy de headless.simulate_run : il lit le
+GameManager et retourne un masque de touches (inputs.py), exactement ce que
+Player.update reçoit d'un joueur.
+
+A chaque image, il essaie plusieurs trajectoires : « aller à la colonne x
+puis y rester ». Chaque trajectoire est jouée en avance sur un horizon
+court, contre les portes, rochers, blocs de glace et bonus qui descendent
+(y compris ceux que le planificateur d'apparitions a déjà prévus) ; la moins
+coûteuse gagne. Les trajectoires sont évaluées par paquets, la plus
+prometteuse d'abord, et la recherche s'arrête quand le budget de temps de
+l'image est dépassé : le pilote donne toujours une réponse à temps.
+
+Le temps de décision de chaque image est mesuré (voir stats()).
+"""
+
+import time
+import numpy as np
+from .config import SCREEN_WIDTH, SCREEN_HEIGHT, SIM_DT, AUTOPILOT_BUDGET_MS
+from .entities import Gate
+from .entity_store import KIND_ROCK, KIND_DRONE_DROP, KIND_MOONWALK, KIND_SPEED
+from .inputs import KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN
+
+HORIZON = 1.2  # secondes jouées en avance
+LOOKAHEAD = 6.0  # secondes de planificateur lues pour préparer les portes suivantes
+STRIDE = 2  # un pas sur STRIDE est vérifié (les entités bougent de ~4 px par pas)
+CANDIDATES = 25  # colonnes essayées sur la largeur de l'écran
+BATCH = 8  # trajectoires évaluées entre deux vérifications du budget
+MARGIN = 4  # marge de sécurité autour des rectangles (pixels)
+
+# coût d'une rencontre (avant la pondération par la proximité dans le temps)
+COSTS = {
+    "gate": 1000.0,
+    KIND_ROCK: 60.0,
+    KIND_DRONE_DROP: 80.0,
+    KIND_MOONWALK: 5.0,
+    KIND_SPEED: -20.0,
+}
+MOVE_COST = 0.02  # par pixel de déplacement (évite de zigzaguer pour rien)
+GATE_PULL = 0.05  # par pixel d'écart au centre de la prochaine porte
+
+HOME_Y = SCREEN_HEIGHT * 0.55  # hauteur de croisière du skieur
+YETI_DANGER = 170  # distance (pixels) à partir de laquelle on remonte
+
+HIST_BIN_MS = 0.01  # histogramme des temps de décision (percentiles)
+HIST_BINS = 2000
+
+
+def _gate_passage(gate, y, speed):
+    # (y, vitesse, x min, x max, hauteur) d'une rangée de sapins : bandes
+    # pleines [0, left_end) et [right_start, right_end), voir Gate.collides
+    lo = gate.left_end if gate.left_end > 0 else -np.inf
+    hi = gate.right_start if gate.right_start < gate.right_end else np.inf
+    return y, speed, lo, hi, gate.tree_h
+
+
+class Autopilot:
+    """Pilote automatique : autopilot(game) -> masque de touches"""
+
+    def __init__(self, budget_ms=AUTOPILOT_BUDGET_MS):
+        self.budget = budget_ms / 1000.0
+        self.target = None
+        self.steps = np.arange(0, int(HORIZON / SIM_DT) + 1, STRIDE)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.decisions = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.over_budget = 0
+        self.partial = 0  # décisions prises sans avoir essayé toutes les trajectoires
+        self.hist = np.zeros(HIST_BINS, dtype=np.int64)
+
+    def stats(self):
+        """Temps de décision : moyenne, percentiles et pire cas (ms)"""
+        count = max(1, self.decisions)
+        cumulative = np.cumsum(self.hist)
+
+        def percentile(p):
+            index = int(np.searchsorted(cumulative, p * self.decisions))
+            return min(index + 1, HIST_BINS) * HIST_BIN_MS
+
+        return {
+            "decisions": self.decisions,
+            "mean_ms": self.total / count * 1000.0,
+            "p50_ms": percentile(0.5) if self.decisions else 0.0,
+            "p99_ms": percentile(0.99) if self.decisions else 0.0,
+            "max_ms": self.worst * 1000.0,
+            "budget_ms": self.budget * 1000.0,
+            "over_budget": self.over_budget,
+            "partial": self.partial,
+        }
+
+    def __call__(self, game):
+        start = time.perf_counter()
+        mask = self.decide(game, start)
+        elapsed = time.perf_counter() - start
+        self.decisions += 1
+        self.total += elapsed
+        self.worst = max(self.worst, elapsed)
+        if elapsed > self.budget:
+            self.over_budget += 1
+        self.hist[min(int(elapsed * 1000.0 / HIST_BIN_MS), HIST_BINS - 1)] += 1
+        return mask
+
+    # --- Planification ---
+
+    def _hazards(self, game, step_px):
+        """Ce que le skieur va croiser sur l'horizon
+
+        Retourne (entités, passages, centre) :
+        - entités : colonnes (x, y, w, h, vitesse écran, coût) des rochers,
+          blocs de glace et bonus ; les rochers planifiés mais pas encore
+          apparus sont placés à leur point d'apparition, reculé dans le temps ;
+        - passages : portes et ligne d'arrivée, (y, vitesse, x min, x max,
+          hauteur), le skieur doit rester entre x min et x max ;
+        - centre : milieu du premier passage au-delà de l'horizon (vers où
+          se préparer), ou None.
+        """
+        state = game.state
+        player = state.player
+        camera_y = state.camera_y
+        xs, ys, ws, hs, vs, costs = [], [], [], [], [], []
+        for name in ("obstacles", "drops", "bonuses"):
+            store = game.stores[name]
+            rows = store.indices()
+            if not rows:
+                continue
+            xs.append(store.x[rows])
+            ys.append(store.y[rows] - camera_y)
+            ws.append(store.w[rows].astype(np.float64))
+            hs.append(store.h[rows].astype(np.float64))
+            vs.append(step_px + store.speed[rows] * SIM_DT)
+            costs.append(np.array([COSTS[kind] for kind in store.kind[rows].tolist()]))
+
+        # une porte franchie (passed) touche encore le skieur tant qu'elle n'est
+        # pas entièrement passée sous lui : elle reste un passage
+        passages = []
+        ahead = []  # passages pas encore franchis, pour le centre
+        store = game.stores["gates"]
+        for i in store.indices():
+            passage = _gate_passage(store.items[i], store.y[i] - camera_y, step_px)
+            passages.append(passage)
+            if not store.items[i].passed:
+                ahead.append(passage)
+        finish = state.finish_line
+        if finish is not None and not state.finish_passed:
+            # ligne d'arrivée : il suffit d'en toucher le trou
+            passage = (finish["y"] - camera_y - 1, step_px, finish["gap_x"] - player.w, finish["gap_x"] + finish["gap_w"] + player.w, 2)
+            passages.append(passage)
+            ahead.append(passage)
+
+        tree_size = game._size("tree")
+        rock_size = game._rock_args(0)[2]
+        for time_at, kind, payload in game.scheduler.preview(state.race_time + LOOKAHEAD):
+            late_steps = (time_at - state.race_time) / SIM_DT
+            if kind == "rock" and late_steps <= self.steps[-1]:
+                xs.append(np.array([float(payload[0])]))
+                ys.append(np.array([-60.0 - late_steps * step_px]))
+                ws.append(np.array([float(rock_size[0])]))
+                hs.append(np.array([float(rock_size[1])]))
+                vs.append(np.array([step_px]))
+                costs.append(np.array([COSTS[KIND_ROCK]]))
+            elif kind == "gate":
+                gate = Gate(payload[0], payload[1], None, SCREEN_WIDTH, tree_size)
+                passage = _gate_passage(gate, -80.0 - late_steps * step_px, step_px)
+                passages.append(passage)
+                ahead.append(passage)
+
+        if xs:
+            hazards = tuple(np.concatenate(column) for column in (xs, ys, ws, hs, vs, costs))
+        else:
+            hazards = None
+
+        center = None
+        reach = step_px * self.steps[-1]
+        for y, _, lo, hi, h in sorted(ahead, key=lambda passage: -passage[0]):
+            if y + reach + h < player.y - MARGIN:
+                center = (max(lo, 0.0) + min(hi, SCREEN_WIDTH)) / 2
+                break
+        return hazards, passages, center
+
+    def _costs(self, targets, x0, move, player, hazards, passages, free_steps):
+        """Coût de chaque trajectoire « aller en x = target puis y rester »"""
+        ks = self.steps
+        # positions x du skieur aux pas ks, une ligne par trajectoire
+        reach = move * np.maximum(ks - free_steps, 0)
+        px = x0 + np.clip(targets[:, None] - x0, -reach[None, :], reach[None, :])
+        pw = player.w
+        top = player.y
+        bottom = player.y + player.h
+        # plus la rencontre est proche, plus elle compte
+        urgency = 2.0 - ks / max(1, ks[-1])
+        cost = np.zeros(len(targets))
+
+        if hazards is not None:
+            hx, hy, hw, hh, hv, hc = hazards
+            ey = hy[:, None] + hv[:, None] * ks[None, :]
+            vertical = (ey < bottom + MARGIN) & (ey + hh[:, None] > top - MARGIN)
+            keep = vertical.any(axis=1)
+            if keep.any():
+                vertical = vertical[keep]
+                left = hx[keep] - MARGIN
+                right = hx[keep] + hw[keep] + MARGIN
+                horizontal = (px[:, None, :] < right[None, :, None]) & (px[:, None, :] + pw > left[None, :, None])
+                hit = horizontal & vertical[None, :, :]
+                first = np.where(hit.any(axis=2), urgency[hit.argmax(axis=2)], 0.0)
+                cost += first @ hc[keep]
+
+        for y, v, lo, hi, h in passages:
+            ey = y + v * ks
+            vertical = (ey < bottom + MARGIN) & (ey + h > top - MARGIN)
+            if not vertical.any():
+                continue
+            outside = (px < lo + MARGIN) | (px + pw > hi - MARGIN)
+            hit = outside & vertical[None, :]
+            cost += np.where(hit.any(axis=1), urgency[hit.argmax(axis=1)], 0.0) * COSTS["gate"]
+
+        cost += MOVE_COST * np.abs(targets - x0)
+        return cost
+
+    def decide(self, game, start=None):
+        """Masque de touches de l'image (dans le budget de temps si possible)"""
+        if start is None:
+            start = time.perf_counter()
+        state = game.state
+        player = state.player
+        x0 = player.x
+        move = player.base_speed * (1.8 if player.boost_timer > 0 else 1.0) * (0.6 if player.slow_timer > 0 else 1.0)
+        free_steps = int(player.freeze_timer / SIM_DT)
+        step_px = (state.speed + 30) * SIM_DT
+        hazards, passages, center = self._hazards(game, step_px)
+
+        # trajectoires candidates : la cible actuelle d'abord, puis les plus proches
+        lo = 10.0
+        hi = SCREEN_WIDTH - player.w - 10.0
+        targets = np.concatenate(([x0], np.linspace(lo, hi, CANDIDATES)))
+        if self.target is not None:
+            targets = np.concatenate(([min(max(self.target, lo), hi)], targets))
+        if move > 0:
+            # le skieur avance par pas de move pixels : cibles atteignables exactement
+            targets = np.clip(x0 + np.round((targets - x0) / move) * move, lo, hi)
+        anchor = targets[0]
+        targets = targets[np.argsort(np.abs(targets - anchor), kind="stable")]
+
+        best_target = x0
+        best_cost = np.inf
+        done = 0
+        while done < len(targets):
+            batch = targets[done:done + BATCH]
+            cost = self._costs(batch, x0, move, player, hazards, passages, free_steps)
+            if center is not None:
+                cost += GATE_PULL * np.abs(batch + player.w / 2 - center)
+            i = int(np.argmin(cost))
+            if cost[i] < best_cost:
+                best_cost = cost[i]
+                best_target = float(batch[i])
+            done += len(batch)
+            if time.perf_counter() - start > self.budget:
+                break
+        if done < len(targets):
+            self.partial += 1
+        self.target = best_target
+
+        # hauteur : croisière, ou plus haut si un yeti s'approche
+        target_y = HOME_Y
+        yetis = state.yetis
+        if len(yetis):
+            below = yetis.y - player.y
+            if np.any((np.abs(yetis.x - x0) < YETI_DANGER) & (below > 0) & (below < YETI_DANGER)):
+                target_y = 70
+        return self._keys(best_target - x0, target_y - player.y, move, player.moonwalk > 0)
+
+    def _keys(self, dx, dy, move, inverted):
+        mask = 0
+        if dx > move / 2:
+            mask |= KEY_RIGHT
+        elif dx < -move / 2:
+            mask |= KEY_LEFT
+        if dy > move / 2:
+            mask |= KEY_DOWN
+        elif dy < -move / 2:
+            mask |= KEY_UP
+        if inverted:
+            # bonus « moonwalk » : les commandes sont inversées
+            swapped = 0
+            for a, b in ((KEY_LEFT, KEY_RIGHT), (KEY_RIGHT, KEY_LEFT), (KEY_UP, KEY_DOWN), (KEY_DOWN, KEY_UP)):
+                if mask & a:
+                    swapped |= b
+            mask = swapped
+        return mask
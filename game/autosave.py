@@ -0,0 +1,164 @@
+"""
+Sauvegarde automatique de la session (reprise après plantage ou coupure)
+
+La boucle principale prend régulièrement une copie de la session : quelques
+champs simples (classement, étape des JO, scores en attente...), le snapshot
+binaire de la course de ski (snapshot.py) et les journaux d'entrées des
+mini-jeux (replay.py), qui suffisent à les reconstruire. Ces copies sont des
+octets ou des valeurs simples : la boucle ne fait que les déposer.
+
+Un fil d'arrière-plan fait le reste (encodage, somme de contrôle, écriture,
+fsync), donc aucune image n'attend le disque. L'écriture passe par un
+fichier temporaire remplacé d'un coup (os.replace) : le fichier de
+sauvegarde est toujours soit l'ancien, soit le nouveau, jamais un mélange.
+
+Format (.sav) :
+    b"WSV" | version | crc32 du reste | taille + session (JSON)
+    | taille + octets de chaque bloc (BLOCKS, taille 0 = absent)
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+
+MAGIC = b"WSV"
+VERSION = 1
+
+SAVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "saves")
+SAVE_PATH = os.path.join(SAVE_DIR, "session.sav")
+
+# blocs binaires joints à la session, dans l'ordre du fichier
+BLOCKS = ("ski", "ski_log", "curling_log", "biathlon_log")
+
+
+def encode(session, blocks):
+    """Fichier de sauvegarde complet (bytes) ; blocks : {nom: bytes ou None}"""
+    text = json.dumps(session, separators=(",", ":")).encode("utf-8")
+    body = bytearray(struct.pack("<I", len(text)))
+    body += text
+    for name in BLOCKS:
+        data = blocks.get(name) or b""
+        body += struct.pack("<I", len(data))
+        body += data
+    return MAGIC + bytes([VERSION]) + struct.pack("<I", zlib.crc32(body)) + bytes(body)
+
+
+def decode(data):
+    """Inverse d'encode : (session, blocks) ; ValueError si le fichier est abîmé"""
+    if len(data) < 8 or data[:3] != MAGIC:
+        raise ValueError("fichier de sauvegarde invalide")
+    if data[3] != VERSION:
+        raise ValueError(f"version de sauvegarde non supportée : {data[3]}")
+    body = data[8:]
+    if struct.unpack_from("<I", data, 4)[0] != zlib.crc32(body):
+        raise ValueError("sauvegarde incomplète ou abîmée")
+    try:
+        size = struct.unpack_from("<I", body, 0)[0]
+        pos = 4 + size
+        session = json.loads(body[4:pos].decode("utf-8"))
+        blocks = {}
+        for name in BLOCKS:
+            size = struct.unpack_from("<I", body, pos)[0]
+            pos += 4
+            blocks[name] = bytes(body[pos:pos + size]) or None
+            pos += size
+    except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"sauvegarde illisible : {e}") from e
+    return session, blocks
+
+
+def write_atomic(path, data):
+    """Écrit data dans path sans jamais laisser un fichier à moitié écrit"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    # le renommage lui-même doit survivre à une coupure (pas possible sous Windows)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def load(path=SAVE_PATH):
+    """Dernière sauvegarde (session, blocks), ou None s'il n'y en a pas d'utilisable"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"Sauvegarde non lue : {e}")
+        return None
+    try:
+        return decode(data)
+    except ValueError as e:
+        print(f"Sauvegarde ignorée : {e}")
+        return None
+
+
+class AutoSaver:
+    """Écrit en arrière-plan la dernière copie de session déposée par submit()
+
+    Si plusieurs copies arrivent pendant une écriture, seule la plus récente
+    est écrite ensuite (les intermédiaires ne servent plus à rien).
+    """
+
+    def __init__(self, path=SAVE_PATH):
+        self.path = path
+        self.cond = threading.Condition()
+        self.pending = None
+        self.closed = False
+        self.last_data = None
+        self.saves = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.thread.start()
+
+    def submit(self, session, blocks):
+        """Dépose une copie de la session (ne bloque pas)"""
+        with self.cond:
+            self.pending = (session, blocks)
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.pending is None and not self.closed:
+                    self.cond.wait()
+                job = self.pending
+                self.pending = None
+                if job is None:
+                    return
+            data = encode(*job)
+            if data == self.last_data:
+                continue
+            try:
+                write_atomic(self.path, data)
+            except OSError as e:
+                if self.error is None:
+                    print(f"Sauvegarde automatique impossible : {e}")
+                self.error = e
+                continue
+            self.last_data = data
+            self.saves += 1
+            self.error = None
+
+    def close(self):
+        """Écrit la dernière copie déposée puis arrête le fil"""
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join()
@@ -8,48 +8,57 @@ import random
 import math
 from .config import *
 from .audio import play_sfx
+from .rng import make_rng, new_seed
+from .replay import InputLog, EdgeRecorder, key_mask
 
 
 class Target:
     """Cible de tir"""
     
-    def __init__(self, x, y, size=40):
+    def __init__(self, x, y, size=40, rng=None):
+        rng = rng if rng is not None else random.Random()
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.size = size
         self.hit = False
         self.hit_animation = 0
-        self.vx = random.choice([-1, 1]) * random.uniform(30, 60)
-        self.vy = random.choice([-1, 1]) * random.uniform(20, 40)
+        self.vx = rng.choice([-1, 1]) * rng.uniform(30, 60)
+        self.vy = rng.choice([-1, 1]) * rng.uniform(20, 40)
         
-    def draw(self, screen, fonts):
+    def draw(self, screen, fonts, alpha=1.0):
         """Dessine la cible"""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
         if self.hit:
             # Animation de touché
             if self.hit_animation < 0.3:
                 # Flash blanc
-                pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.size)
+                pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), self.size)
             else:
                 # Cible touchée (vert)
-                pygame.draw.circle(screen, (50, 200, 50), (int(self.x), int(self.y)), self.size)
-                pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.size, 3)
+                pygame.draw.circle(screen, (50, 200, 50), (int(x), int(y)), self.size)
+                pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), self.size, 3)
                 # X au centre
                 offset = self.size // 2
                 pygame.draw.line(screen, (255, 255, 255),
-                               (self.x - offset//2, self.y - offset//2),
-                               (self.x + offset//2, self.y + offset//2), 4)
+                               (x - offset//2, y - offset//2),
+                               (x + offset//2, y + offset//2), 4)
                 pygame.draw.line(screen, (255, 255, 255),
-                               (self.x + offset//2, self.y - offset//2),
-                               (self.x - offset//2, self.y + offset//2), 4)
+                               (x + offset//2, y - offset//2),
+                               (x - offset//2, y + offset//2), 4)
         else:
             # Cible non touchée (cercles concentriques)
-            pygame.draw.circle(screen, (200, 50, 50), (int(self.x), int(self.y)), self.size)
-            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), int(self.size * 0.7))
-            pygame.draw.circle(screen, (200, 50, 50), (int(self.x), int(self.y)), int(self.size * 0.4))
-            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), int(self.size * 0.2))
+            pygame.draw.circle(screen, (200, 50, 50), (int(x), int(y)), self.size)
+            pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), int(self.size * 0.7))
+            pygame.draw.circle(screen, (200, 50, 50), (int(x), int(y)), int(self.size * 0.4))
+            pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), int(self.size * 0.2))
             
     def update(self, dt, bounds):
         """Met à jour l'animation"""
+        self.prev_x = self.x
+        self.prev_y = self.y
         if self.hit:
             self.hit_animation += dt
             return
@@ -71,6 +80,8 @@ class Arrow:
     def __init__(self, x, y, angle, power):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.angle = angle
         self.power = power
         self.speed = power * 8
@@ -83,6 +94,8 @@ class Arrow:
         
     def update(self, dt):
         """Met à jour la position de la flèche"""
+        self.prev_x = self.x
+        self.prev_y = self.y
         if self.active:
             self.x += self.vx * dt
             self.y += self.vy * dt
@@ -91,17 +104,19 @@ class Arrow:
             if self.x < 0 or self.x > SCREEN_WIDTH or self.y < 0 or self.y > SCREEN_HEIGHT:
                 self.active = False
                 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         """Dessine la flèche"""
         if self.active:
+            x = self.prev_x + (self.x - self.prev_x) * alpha
+            y = self.prev_y + (self.y - self.prev_y) * alpha
             # Corps de la flèche
             length = 25
             angle_rad = math.radians(self.angle)
-            end_x = self.x + length * math.cos(angle_rad)
-            end_y = self.y + length * math.sin(angle_rad)
+            end_x = x + length * math.cos(angle_rad)
+            end_y = y + length * math.sin(angle_rad)
             
             pygame.draw.line(screen, (150, 100, 50), 
-                           (int(self.x), int(self.y)), 
+                           (int(x), int(y)), 
                            (int(end_x), int(end_y)), 3)
             
             # Pointe
@@ -111,18 +126,25 @@ class Arrow:
 class BiathlonGame:
     """Gestionnaire du mode Biathlon"""
     
-    def __init__(self, screen, fonts, audio):
+    def __init__(self, screen, fonts, audio, seed=None):
         self.screen = screen
         self.fonts = fonts
         self.audio = audio
-        self.reset()
+        self.reset(seed)
         
-    def reset(self):
-        """Réinitialise le jeu"""
+    def reset(self, seed=None):
+        """Réinitialise le jeu (même graine = mêmes cibles)"""
+        if seed is None:
+            seed = new_seed()
+        self.seed = seed
+        self.rng = make_rng(seed, "targets")
+        self.input_log = InputLog("biathlon", seed)
+        self.edges = EdgeRecorder(self.input_log)
         self.targets = []
         self.arrows = []
         self.crosshair_x = SCREEN_WIDTH // 2
         self.crosshair_y = SCREEN_HEIGHT // 2
+        self.crosshair_prev = (self.crosshair_x, self.crosshair_y)
         self.active_target = None
         self.power = 0
         self.power_increasing = True
@@ -146,6 +168,7 @@ class BiathlonGame:
                 # Placer la visée sur la cible pour aider le joueur
                 self.crosshair_x = target.x
                 self.crosshair_y = target.y
+                self.crosshair_prev = (self.crosshair_x, self.crosshair_y)
                 return
         
     def create_targets(self):
@@ -156,9 +179,9 @@ class BiathlonGame:
         self.target_bounds = (target_zone_x[0] + 20, target_zone_x[1] - 20, target_zone_y[0] + 20, target_zone_y[1] - 20)
         
         for i in range(5):
-            x = random.randint(target_zone_x[0], target_zone_x[1])
-            y = random.randint(target_zone_y[0], target_zone_y[1])
-            size = random.randint(30, 45)
+            x = self.rng.randint(target_zone_x[0], target_zone_x[1])
+            y = self.rng.randint(target_zone_y[0], target_zone_y[1])
+            size = self.rng.randint(30, 45)
             
             # Éviter les chevauchements
             overlap = True
@@ -169,17 +192,18 @@ class BiathlonGame:
                     dist = math.sqrt((x - target.x)**2 + (y - target.y)**2)
                     if dist < (size + target.size + 20):
                         overlap = True
-                        x = random.randint(target_zone_x[0], target_zone_x[1])
-                        y = random.randint(target_zone_y[0], target_zone_y[1])
+                        x = self.rng.randint(target_zone_x[0], target_zone_x[1])
+                        y = self.rng.randint(target_zone_y[0], target_zone_y[1])
                         break
                 attempts += 1
                 
-            self.targets.append(Target(x, y, size))
+            self.targets.append(Target(x, y, size, self.rng))
             
     def update(self, dt, keys):
         """Met à jour le jeu"""
         if self.game_over:
             return
+        self.edges.step(key_mask(keys))
             
         # Timer
         self.time_left -= dt
@@ -189,6 +213,7 @@ class BiathlonGame:
             return
             
         # Déplacement de la visée
+        self.crosshair_prev = (self.crosshair_x, self.crosshair_y)
         speed = 300
         if keys[pygame.K_LEFT]:
             self.crosshair_x = max(50, self.crosshair_x - speed * dt)
@@ -227,7 +252,7 @@ class BiathlonGame:
                             target.hit_animation = 0
                             arrow.active = False
                             self.hits += 1
-                            play_sfx(self.audio["sfx"], "bonus")
+                            self._sfx("bonus")
                             self.select_next_target()
                             break
                             
@@ -246,6 +271,7 @@ class BiathlonGame:
     def handle_input(self, event):
         """Gère les entrées clavier"""
         if event.type == pygame.KEYDOWN:
+            self.edges.key_down(event.key)
             if not self.game_over:
                 if event.key == pygame.K_SPACE:
                     if self.shots_left > 0:
@@ -283,10 +309,17 @@ class BiathlonGame:
             self.power = 0
             
             # Son de tir
-            play_sfx(self.audio["sfx"], "arrow_shot")
+            self._sfx("arrow_shot")
             
-    def draw(self):
-        """Dessine le jeu"""
+    def _sfx(self, name):
+        """Joue un effet sonore (ignoré sans audio, ex: rejeu headless)"""
+        if self.audio is not None:
+            play_sfx(self.audio["sfx"], name)
+            
+    def draw(self, alpha=1.0):
+        """Dessine le jeu (alpha : interpolation entre deux pas de simulation)"""
+        if self.game_over:
+            alpha = 1.0
         # Fond (montagne enneigée)
         for i in range(SCREEN_HEIGHT):
             shade = 228 + int(18 * (i / SCREEN_HEIGHT))
@@ -309,11 +342,11 @@ class BiathlonGame:
         
         # Cibles
         for target in self.targets:
-            target.draw(self.screen, self.fonts)
+            target.draw(self.screen, self.fonts, alpha)
             
         # Flèches
         for arrow in self.arrows:
-            arrow.draw(self.screen)
+            arrow.draw(self.screen, alpha)
             
         # Tireur (en bas)
         shooter_x = SCREEN_WIDTH // 2
@@ -328,17 +361,20 @@ class BiathlonGame:
         
         # Réticule
         if not self.game_over:
+            prev_x, prev_y = self.crosshair_prev
+            crosshair_x = prev_x + (self.crosshair_x - prev_x) * alpha
+            crosshair_y = prev_y + (self.crosshair_y - prev_y) * alpha
             crosshair_size = 20
             # Croix
             pygame.draw.line(self.screen, (255, 0, 0),
-                           (self.crosshair_x - crosshair_size, self.crosshair_y),
-                           (self.crosshair_x + crosshair_size, self.crosshair_y), 2)
+                           (crosshair_x - crosshair_size, crosshair_y),
+                           (crosshair_x + crosshair_size, crosshair_y), 2)
             pygame.draw.line(self.screen, (255, 0, 0),
-                           (self.crosshair_x, self.crosshair_y - crosshair_size),
-                           (self.crosshair_x, self.crosshair_y + crosshair_size), 2)
+                           (crosshair_x, crosshair_y - crosshair_size),
+                           (crosshair_x, crosshair_y + crosshair_size), 2)
             # Cercle
             pygame.draw.circle(self.screen, (255, 0, 0), 
-                             (int(self.crosshair_x), int(self.crosshair_y)), 
+                             (int(crosshair_x), int(crosshair_y)), 
                              crosshair_size, 2)
         
         # HUD
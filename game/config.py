@@ -6,6 +6,56 @@ SCREEN_WIDTH = 960
 SCREEN_HEIGHT = 640
 FPS = 60
 
+# Simulation à pas fixe : le gameplay avance toujours par pas de SIM_DT,
+# l'affichage interpole entre deux pas (on peut donc afficher à 144 Hz)
+SIM_HZ = 60
+SIM_DT = 1.0 / SIM_HZ
+MAX_SIM_STEPS = 5  # pas de rattrapage maximum par image (évite la spirale)
+RENDER_FPS = 0  # limite d'images/s à l'affichage (0 = pas de limite)
+VSYNC = True  # synchro verticale si disponible
+
+# Taille des cases de la grille de collisions (spatial_hash.py), en pixels
+GRID_CELL = 64
+
+# Nombre de rangées de sapins pré-dessinées gardées en cache (portes)
+GATE_CACHE_SIZE = 32
+
+# Archivage des entrées de chaque partie terminée (dossier replays/)
+RECORD_RUNS = True
+
+# Sauvegarde automatique de la session (dossier saves/) : reprise après un
+# plantage ou une coupure de courant, au dernier point sauvegardé
+AUTOSAVE = True
+AUTOSAVE_INTERVAL = 2.0  # secondes entre deux sauvegardes
+
+# Pilote automatique (autopilot.py) : temps de réflexion maximum par image,
+# et démo lancée après ATTRACT_DELAY secondes sans toucher au menu
+AUTOPILOT_BUDGET_MS = 2.0
+ATTRACT_DELAY = 30.0
+
+# Portes toujours passables (course_check.py) : un trou que le skieur ne peut
+# pas atteindre depuis la porte précédente est retiré avant d'apparaître.
+# Marge : temps perdu entre deux portes (un rocher = 1,2 s à 60 % de vitesse),
+# plus le gel d'un bloc de glace quand le drone en largue un (course_check.py)
+COURSE_CHECK = True
+COURSE_CHECK_LOSS = 0.48
+
+# Collisions du skieur au pixel près (masks.py) : un contact des rectangles
+# n'est gardé que si des pixels opaques se touchent (coins des sapins, des
+# rochers et des bonus). False : rectangles seuls
+PIXEL_COLLISIONS = True
+
+# Course sans fin (entraînement) : la difficulté monte d'un niveau toutes les
+# ENDLESS_LEVEL_TIME secondes, y compris au-delà du niveau 5 (timeline.py)
+ENDLESS_LEVEL_TIME = 40.0
+
+# Yetis : taille des cases du champ de poursuite (flow_field.py), en pixels,
+# nombre de yetis à partir duquel il sert (en dessous, poursuite directe,
+# bien moins chère) et nombre de yetis lâchés en mode horde (entraînement)
+FLOW_CELL = 40
+FLOW_MIN_YETIS = 8
+HORDE_SIZE = 40
+
 # Mode d'affichage
 FULLSCREEN = True  # Changer en True pour le plein écran
 # Si FULLSCREEN = True, le jeu s'adaptera à la résolution de votre écran
@@ -58,7 +108,8 @@ LEVEL_SETTINGS = {
         "bonus_range": (4.2, 6.5),
         "finish_score": 100,
         "finish_time": 25.0,
-        "distance_m": 100
+        "distance_m": 100,
+        "pools": {"obstacles": 8, "gates": 4, "bonuses": 2}
     },
     2: {
         "speed_base": 140,
@@ -69,7 +120,8 @@ LEVEL_SETTINGS = {
         "bonus_range": (3.8, 6.0),
         "finish_score": 140,
         "finish_time": 24.0,
-        "distance_m": 120
+        "distance_m": 120,
+        "pools": {"obstacles": 8, "gates": 4, "bonuses": 2}
     },
     3: {
         "speed_base": 150,
@@ -80,7 +132,8 @@ LEVEL_SETTINGS = {
         "bonus_range": (3.3, 5.5),
         "finish_score": 180,
         "finish_time": 23.0,
-        "distance_m": 140
+        "distance_m": 140,
+        "pools": {"obstacles": 9, "gates": 5, "bonuses": 3}
     },
     4: {
         "speed_base": 160,
@@ -91,7 +144,8 @@ LEVEL_SETTINGS = {
         "bonus_range": (2.9, 5.0),
         "finish_score": 220,
         "finish_time": 22.0,
-        "distance_m": 160
+        "distance_m": 160,
+        "pools": {"obstacles": 9, "gates": 5, "bonuses": 3}
     },
     5: {
         "speed_base": 170,
@@ -102,6 +156,7 @@ LEVEL_SETTINGS = {
         "bonus_range": (2.5, 4.6),
         "finish_score": 260,
         "finish_time": 21.0,
-        "distance_m": 180
+        "distance_m": 180,
+        "pools": {"obstacles": 10, "gates": 5, "bonuses": 3}
     }
 }
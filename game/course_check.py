@@ -0,0 +1,279 @@
+"""
+Vérification des portes : le skieur peut-il passer de l'une à la suivante ?
+
+Entre deux portes, le skieur n'est libre que pendant le temps qui sépare la
+fin de la rangée de sapins précédente de l'arrivée de la suivante ; il se
+déplace de base_speed pixels par pas. En partant de l'intervalle des x
+atteignables au passage d'une porte, on obtient celui de la suivante :
+
+    atteignable = (précédent élargi de la distance parcourable) ∩ trou
+
+Un intervalle vide = course impossible. Le calcul est prudent : le skieur
+reste à la même hauteur et peut perdre loss secondes par intervalle
+(un rocher : 1,2 s à 60 % de vitesse, soit ~0,5 s ; un bloc de glace : 0,8 s).
+
+Les largages du drone ne dépendent que de la graine (DropSchedule) : un
+intervalle où un bloc de glace peut tomber perd en plus FREEZE_TIME.
+
+La génération des courses (timeline.py) fait ce calcul à chaque porte et
+retire les trous impossibles avant qu'ils n'apparaissent. check_batch() fait
+le même calcul pour des milliers de courses à la fois (tableaux NumPy), pour
+noter des graines :
+
+    python -m game.course_check --level 5 --seeds 100000
+
+Le calcul lui-même est rapide (des millions de courses/s) ; c'est la
+génération des courses, en Python, qui coûte (quelques milliers par seconde
+et par cœur) : generate() la répartit sur un pool de processus, comme le
+réglage des niveaux (tuner.py).
+"""
+
+import argparse
+import bisect
+import multiprocessing
+import os
+import time
+import numpy as np
+from .config import SCREEN_WIDTH, SIM_HZ, LEVEL_SETTINGS
+from .entities import Drone, gate_spans
+from .rng import make_rng
+
+EDGE = 10  # le skieur reste à 10 px des bords (Player.update)
+SCROLL_EXTRA = 30  # la piste défile à speed + 30 px/s (GameManager.update)
+FREEZE_TIME = 0.8  # skieur gelé par un bloc de glace (GameManager._check_collisions)
+CHUNK = 2000  # courses générées par tâche envoyée à un processus
+
+
+def track_speed(t, speed0, max_speed, ramp):
+    """Vitesse de la piste au temps de course t (rampe plafonnée)"""
+    return np.minimum(max_speed, speed0 + ramp * t)
+
+
+def free_time(t0, t1, speed0, max_speed, ramp, row_h):
+    """Temps libre entre la porte planifiée à t0 et celle planifiée à t1
+
+    row_h : hauteur pendant laquelle une rangée gêne le skieur (sapin +
+    skieur). Les deux portes descendent à la même vitesse : l'écart en
+    temps se conserve, moins la traversée de la rangée.
+    """
+    return (t1 - t0) - row_h / (track_speed(t1, speed0, max_speed, ramp) + SCROLL_EXTRA)
+
+
+def passage(gap_x, gap_w, tree_w, player_w):
+    """Intervalle des x du skieur qui passent le trou (bords des sapins compris)"""
+    left_end, right_start, right_end = gate_spans(gap_x, gap_w, tree_w, SCREEN_WIDTH)
+    lo = max(EDGE, left_end)
+    hi = SCREEN_WIDTH - player_w - EDGE
+    if right_start < right_end:
+        hi = min(hi, right_start - player_w)
+    return lo, hi
+
+
+def finish_passage(gap_x, gap_w, player_w):
+    """Intervalle des x qui passent la ligne d'arrivée (il suffit d'en toucher le trou)"""
+    return max(EDGE, gap_x - player_w), min(SCREEN_WIDTH - player_w - EDGE, gap_x + gap_w)
+
+
+def reach(lo, hi, free, move, loss, player_w):
+    """Intervalle [lo, hi] élargi de ce que le skieur parcourt en free secondes"""
+    distance = move * SIM_HZ * max(0.0, free - loss)
+    return max(EDGE, lo - distance), min(SCREEN_WIDTH - player_w - EDGE, hi + distance)
+
+
+class DropSchedule:
+    """Temps des largages du drone d'une course (mêmes tirages que le jeu)
+
+    Le générateur "drone" de la graine ne sert qu'aux délais entre largages
+    (Drone.next_drop_delay) : leurs temps sont connus avant la partie.
+    """
+
+    def __init__(self, seed):
+        self.drone = Drone(0, None, make_rng(seed, "drone"))
+        self.times = [self.drone.next_drop_delay()]
+
+    def loss(self, start, end, loss):
+        """loss, plus FREEZE_TIME si un bloc largué peut geler le skieur entre start et end
+
+        Un bloc largué un peu avant start gèle encore le skieur après.
+        """
+        times = self.times
+        while times[-1] <= end:
+            times.append(times[-1] + self.drone.next_drop_delay())
+        first = times[bisect.bisect_left(times, start - FREEZE_TIME)]
+        return loss + FREEZE_TIME if first <= end else loss
+
+
+def check_batch(times, lo, hi, speed0, max_speed, ramp, row_h, move, loss, player_w, start_x):
+    """Vérifie S courses d'un coup
+
+    times, lo, hi : tableaux (S, G) des portes de chaque course, dans
+    l'ordre (temps de course, intervalle de passage), complétés par NaN.
+    loss : temps perdu par intervalle, le même partout ou un tableau (S, G).
+    Retourne (faisable, première porte impossible ou -1, marge) : la marge
+    est la plus petite largeur d'intervalle atteignable rencontrée (pixels).
+    """
+    count, gates = times.shape
+    r_lo = np.full(count, float(start_x))
+    r_hi = np.full(count, float(start_x))
+    prev = np.zeros(count)
+    ok = np.ones(count, dtype=bool)
+    fail_at = np.full(count, -1)
+    slack = np.full(count, np.inf)
+    right = SCREEN_WIDTH - player_w - EDGE
+    for g in range(gates):
+        t = times[:, g]
+        valid = ~np.isnan(t)
+        if not valid.any():
+            break
+        free = free_time(prev, t, speed0, max_speed, ramp, row_h)
+        lost = loss[:, g] if np.ndim(loss) == 2 else loss
+        distance = move * SIM_HZ * np.maximum(0.0, free - lost)
+        n_lo = np.maximum(np.maximum(EDGE, r_lo - distance), lo[:, g])
+        n_hi = np.minimum(np.minimum(right, r_hi + distance), hi[:, g])
+        width = n_hi - n_lo
+        bad = valid & ok & (width < 0)
+        fail_at[bad] = g
+        ok &= ~bad
+        live = valid & ok
+        slack[live] = np.minimum(slack[live], width[live])
+        r_lo = np.where(live, n_lo, r_lo)
+        r_hi = np.where(live, n_hi, r_hi)
+        prev = np.where(valid, t, prev)
+    return ok, fail_at, slack
+
+
+def finish_time(t, speed0, max_speed, ramp, tree_h):
+    """Temps « de porte » équivalent à la ligne d'arrivée apparue à t
+
+    La ligne apparaît 20 px plus haut qu'une porte et n'a pas d'épaisseur :
+    elle est vérifiée quand elle atteint le haut du skieur.
+    """
+    return t + (20 + tree_h) / (track_speed(t, speed0, max_speed, ramp) + SCROLL_EXTRA)
+
+
+def course_gates(course, loss=0.0):
+    """Portes d'une course pré-générée (temps, intervalle de passage, temps perdu), ligne d'arrivée comprise
+
+    Le temps perdu avant chaque porte est loss, plus le gel d'un bloc de
+    glace si le drone peut en larguer un (DropSchedule).
+
+    Seulement pour les niveaux de LEVEL_SETTINGS : la course sans fin n'a
+    pas de portes fixes (ValueError).
+    """
+    from .assets import SPRITE_SIZES
+    from . import timeline
+
+    cfg = LEVEL_SETTINGS.get(course.level)
+    if cfg is None:
+        raise ValueError(f"pas de portes fixes à vérifier pour le niveau {course.level}")
+    speed0 = timeline.speed_base(cfg)
+    finish_at = timeline.finish_eta(course.distance_m, timeline.distance_scale(cfg), speed0, cfg["max_speed"])
+    tree_w, tree_h = SPRITE_SIZES["tree"]
+    player_w = SPRITE_SIZES["skier"][0]
+    drops = DropSchedule(course.seed)
+    times, los, his, losses = [], [], [], []
+    prev = 0.0
+    for at, gap_x, gap_w in zip(*(column.tolist() for column in course.gates())):
+        if at > finish_at:
+            break
+        lo, hi = passage(gap_x, gap_w, tree_w, player_w)
+        times.append(at)
+        los.append(lo)
+        his.append(hi)
+        losses.append(drops.loss(prev, at, loss))
+        prev = at
+    lo, hi = finish_passage(course.finish_x, timeline.FINISH_GAP, player_w)
+    at = finish_time(finish_at, speed0, cfg["max_speed"], timeline.SPEED_RAMP, tree_h)
+    times.append(at)
+    los.append(lo)
+    his.append(hi)
+    losses.append(drops.loss(prev, at, loss))
+    return times, los, his, losses
+
+
+def _generate_chunk(task):
+    """Génère un paquet de courses (dans un processus du pool) : tableaux (n, G) complétés par NaN"""
+    from . import timeline
+
+    level, seeds, checked, loss = task
+    courses = [course_gates(timeline.build(level, seed, checked), loss) for seed in seeds]
+    longest = max(len(course[0]) for course in courses)
+    times = np.full((len(courses), longest), np.nan)
+    lo = np.full_like(times, np.nan)
+    hi = np.full_like(times, np.nan)
+    losses = np.zeros_like(times)
+    for i, (t, l, h, lost) in enumerate(courses):
+        times[i, :len(t)] = t
+        lo[i, :len(l)] = l
+        hi[i, :len(h)] = h
+        losses[i, :len(lost)] = lost
+    return seeds[0], times, lo, hi, losses
+
+
+def generate(level, seeds, checked=False, loss=0.0, workers=None):
+    """Portes des courses des graines seeds, prêtes pour check_batch : (times, lo, hi, losses)
+
+    Les paquets de CHUNK graines sont générés sur workers processus (un
+    par cœur par défaut ; 1 : dans ce processus) et remis dans l'ordre.
+    """
+    seeds = list(seeds)
+    tasks = [(level, seeds[i:i + CHUNK], checked, loss) for i in range(0, len(seeds), CHUNK)]
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(tasks) == 1:
+        parts = [_generate_chunk(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            parts = pool.map(_generate_chunk, tasks)
+    parts.sort(key=lambda part: part[0])
+    longest = max(part[1].shape[1] for part in parts)
+    columns = []
+    for k, fill in ((1, np.nan), (2, np.nan), (3, np.nan), (4, 0.0)):
+        # paquets complétés jusqu'à la plus longue course
+        columns.append(np.concatenate([np.pad(part[k], ((0, 0), (0, longest - part[k].shape[1])), constant_values=fill)
+                                       for part in parts]))
+    return tuple(columns)
+
+
+def main(argv=None):
+    from .assets import SPRITE_SIZES
+    from .config import COURSE_CHECK_LOSS
+    from . import timeline
+
+    parser = argparse.ArgumentParser(description="Faisabilité des portes sur une plage de graines")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--seeds", type=int, default=10000)
+    parser.add_argument("--start", type=int, default=0, help="première graine")
+    parser.add_argument("--checked", action="store_true", help="garder le tri des portes à la génération (sinon : tirage brut)")
+    parser.add_argument("--workers", type=int, default=None, help="processus de génération (par défaut : un par cœur)")
+    args = parser.parse_args(argv)
+    if timeline.is_endless(args.level):
+        parser.error("la course sans fin se génère pendant la partie, ses portes ne se vérifient pas d'avance")
+    if args.level not in LEVEL_SETTINGS:
+        parser.error(f"niveau inconnu : {args.level} (niveaux {min(LEVEL_SETTINGS)} à {max(LEVEL_SETTINGS)})")
+
+    started = time.perf_counter()
+    times, lo, hi, losses = generate(args.level, range(args.start, args.start + args.seeds), args.checked,
+                                     COURSE_CHECK_LOSS, args.workers)
+    generated = time.perf_counter() - started
+    longest = times.shape[1]
+
+    cfg = LEVEL_SETTINGS[args.level]
+    player_w, player_h = SPRITE_SIZES["skier"]
+    row_h = SPRITE_SIZES["tree"][1] + player_h
+    start_x = SCREEN_WIDTH // 2 - player_w // 2
+    print(f"Niveau {args.level} : {args.seeds} courses générées en {generated:.1f}s "
+          f"({args.seeds / max(generated, 1e-9):,.0f} courses/s), {longest} portes au plus")
+    # la troisième ligne est le modèle de la génération (timeline.py)
+    for label, loss in (("sans erreur", 0.0), ("un rocher par porte", COURSE_CHECK_LOSS),
+                        ("rocher + blocs du drone", losses), ("un bloc de glace par porte", FREEZE_TIME)):
+        started = time.perf_counter()
+        ok, fail_at, slack = check_batch(times, lo, hi, timeline.speed_base(cfg), cfg["max_speed"], timeline.SPEED_RAMP,
+                                         row_h, timeline.PLAYER_SPEED, loss, player_w, start_x)
+        checked = time.perf_counter() - started
+        margin = np.percentile(slack[ok], [5, 50]) if ok.any() else (np.nan, np.nan)
+        print(f"  {label:<28} faisables {ok.mean() * 100:5.1f}%  |  marge p5 {margin[0]:.0f} px, médiane {margin[1]:.0f} px"
+              f"  |  vérifiées à {args.seeds / max(checked, 1e-9):,.0f} courses/s")
+
+
+if __name__ == "__main__":
+    main()
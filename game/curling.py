@@ -7,6 +7,7 @@ import pygame
 import math
 from .config import *
 from .audio import play_sfx
+from .replay import InputLog, EdgeRecorder, key_mask
 
 
 class Stone:
@@ -15,6 +16,8 @@ class Stone:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.vx = 0
         self.vy = 0
         self.radius = 20
@@ -23,7 +26,9 @@ class Stone:
         self.stopped = False
         
     def update(self, dt):
-        """Met à jour la position de la pierre"""
+        """Met à jour la position de la pierre (friction appliquée par pas fixe)"""
+        self.prev_x = self.x
+        self.prev_y = self.y
         if self.active and not self.stopped:
             self.x += self.vx * dt
             self.y += self.vy * dt
@@ -45,17 +50,19 @@ class Stone:
                 self.vy = 0
                 self.stopped = True
                 
-    def draw(self, screen):
-        """Dessine la pierre"""
+    def draw(self, screen, alpha=1.0):
+        """Dessine la pierre (interpolée entre les deux derniers pas)"""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
         # Pierre (cercle bleu/rouge)
         color = (200, 50, 50) if self.active else (100, 150, 200)
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.radius, 3)
+        pygame.draw.circle(screen, color, (int(x), int(y)), self.radius)
+        pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), self.radius, 3)
         
         # Poignée
-        handle_y = int(self.y - 5)
+        handle_y = int(y - 5)
         pygame.draw.rect(screen, (220, 220, 220), 
-                        (int(self.x) - 8, handle_y - 10, 16, 20), border_radius=3)
+                        (int(x) - 8, handle_y - 10, 16, 20), border_radius=3)
 
 
 class CurlingGame:
@@ -80,6 +87,9 @@ class CurlingGame:
         self.best_score = 0
         self.time_left = CURLING_TIME_LIMIT
         self.state = "aiming"  # aiming, throwing, result
+        self.seed = 0  # pas de hasard dans le curling
+        self.input_log = InputLog("curling", self.seed)
+        self.edges = EdgeRecorder(self.input_log)
         
         # Créer la première pierre
         self.create_new_stone()
@@ -97,6 +107,7 @@ class CurlingGame:
         """Met à jour le jeu"""
         if self.game_over:
             return
+        self.edges.step(key_mask(keys))
             
         # Timer
         self.time_left -= dt
@@ -176,6 +187,7 @@ class CurlingGame:
     def handle_input(self, event):
         """Gère les entrées clavier"""
         if event.type == pygame.KEYDOWN:
+            self.edges.key_down(event.key)
             if self.state == "aiming":
                 if event.key == pygame.K_SPACE:
                     if not self.charging:
@@ -209,7 +221,12 @@ class CurlingGame:
             self.charging = False
             
             # Son de lancement
-            play_sfx(self.audio["sfx"], "curling_slide")
+            self._sfx("curling_slide")
+            
+    def _sfx(self, name):
+        """Joue un effet sonore (ignoré sans audio, ex: rejeu headless)"""
+        if self.audio is not None:
+            play_sfx(self.audio["sfx"], name)
             
     def calculate_score(self, stone):
         """Calcule le score en fonction de la distance au centre"""
@@ -232,8 +249,10 @@ class CurlingGame:
         else:
             return 0
             
-    def draw(self):
-        """Dessine le jeu"""
+    def draw(self, alpha=1.0):
+        """Dessine le jeu (alpha : interpolation entre deux pas de simulation)"""
+        if self.game_over:
+            alpha = 1.0
         # Fond
         self.screen.fill((240, 245, 255))
         
@@ -257,11 +276,11 @@ class CurlingGame:
         
         # Pierres lancées
         for stone in self.stones:
-            stone.draw(self.screen)
+            stone.draw(self.screen, alpha)
             
         # Pierre actuelle
         if self.current_stone and not self.game_over:
-            self.current_stone.draw(self.screen)
+            self.current_stone.draw(self.screen, alpha)
             
             # Flèche de direction (en mode visée)
             if self.state == "aiming":
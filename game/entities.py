@@ -1,15 +1,68 @@
 import math
 import random
+from functools import lru_cache
 import pygame
+from .config import GATE_CACHE_SIZE, SIM_HZ
+from .entity_store import KIND_DRONE_DROP
+
+DROP_RATE = -math.log(1 - 0.02) * SIM_HZ  # largages par seconde apres la recharge
+
+
+def _sprite_size(image, size):
+    # ca c'est pour prendre la taille donnee (mode headless) sinon celle de l'image
+    if size is not None:
+        return size
+    if image is None:
+        return 0, 0
+    return image.get_width(), image.get_height()
+
+
+def _lerp(a, b, t):
+    # ca c'est pour interpoler l'affichage entre deux pas de simulation
+    return a + (b - a) * t
+
+
+def gate_spans(gap_x, gap_w, tree_w, screen_w):
+    # ca c'est pour resumer une rangee de sapins en deux bandes pleines alignees
+    # sur les sapins : [0, left_end) a gauche du trou et [right_start, right_end)
+    # a droite ; retourne (left_end, right_start, right_end)
+    if tree_w <= 0:
+        return 0, 0, 0
+    gap_left = int(gap_x)
+    gap_right = int(gap_x + gap_w)
+    left_end = max(0, gap_left // tree_w) * tree_w
+    right_start = -(-gap_right // tree_w) * tree_w
+    right_end = -(-screen_w // tree_w) * tree_w
+    return left_end, min(right_start, right_end), right_end
+
+
+@lru_cache(maxsize=GATE_CACHE_SIZE)
+def _gate_row_surface(tree_image, screen_w, left_end, right_start):
+    # ca c'est pour dessiner une rangee de sapins une seule fois : les portes
+    # avec le meme trou (aligne sur les sapins) partagent la meme surface
+    tree_w, tree_h = tree_image.get_size()
+    surface = pygame.Surface((screen_w, tree_h), pygame.SRCALPHA)
+    for x in range(0, screen_w, tree_w):
+        if x < left_end or x >= right_start:
+            surface.blit(tree_image, (x, 0))
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
 
 
 class Player:
-    def __init__(self, x, y, frames):
+    # ca c'est pour avoir des attributs fixes (pas de __dict__, acces plus rapide)
+    __slots__ = ("x", "y", "prev_x", "prev_y", "w", "h", "rect", "base_speed", "speed",
+                 "boost_timer", "slow_timer", "freeze_timer", "frames", "frame_index",
+                 "frame_timer", "moonwalk", "sway_t")
+
+    def __init__(self, x, y, frames, size=None):
         # ca c'est pour le perso principal (bouger/afficher)
         self.x = x
         self.y = y
-        self.w = frames[0].get_width()
-        self.h = frames[0].get_height()
+        self.prev_x = x
+        self.prev_y = y
+        self.w, self.h = _sprite_size(frames[0] if frames else None, size)
         self.base_speed = 4
         self.speed = self.base_speed
         self.boost_timer = 0.0
@@ -19,13 +72,20 @@ class Player:
         self.frame_index = 0
         self.frame_timer = 0.0
         self.moonwalk = 0.0
+        self.sway_t = 0.0
+        # ca c'est le rectangle de collision, un seul pour toute la partie
+        self.rect = pygame.Rect(int(x), int(y), self.w, self.h)
 
-    def rect(self):
-        # ca fonction est de donner le rectangle de collision
-        return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
+    def sync_rect(self):
+        # ca fonction est de recaler le rectangle de collision sur la position
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
 
     def update(self, dt, keys, screen_w, screen_h):
         # ca c'est pour gerer la vitesse (boost / ralentit) puis le deplacement
+        # (la vitesse est en pixels par pas de simulation, le pas est fixe)
+        self.prev_x = self.x
+        self.prev_y = self.y
         if self.boost_timer > 0:
             self.boost_timer = max(0.0, self.boost_timer - dt)
         if self.slow_timer > 0:
@@ -55,7 +115,8 @@ class Player:
             # ca c'est pour l'effet "clavier inverser" pendant un petit moment
             move_x *= -1
             move_y *= -1
-            sway = math.sin(pygame.time.get_ticks() * 0.02) * 1.5
+            self.sway_t += dt
+            sway = math.sin(self.sway_t * 20.0) * 1.5
             self.x += sway
             self.moonwalk = max(0.0, self.moonwalk - dt)
 
@@ -63,170 +124,130 @@ class Player:
         self.y += move_y * self.speed
         self.x = max(10, min(screen_w - self.w - 10, self.x))
         self.y = max(70, min(screen_h - self.h - 10, self.y))
+        self.sync_rect()
 
         self.frame_timer += dt
         if self.frame_timer >= 0.1:
             self.frame_timer = 0.0
-            self.frame_index = (self.frame_index + 1) % len(self.frames)
+            self.frame_index = (self.frame_index + 1) % max(1, len(self.frames))
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         # ca c'est pour dessiner la frame courante
-        screen.blit(self.frames[self.frame_index], (int(self.x), int(self.y)))
+        x = _lerp(self.prev_x, self.x, alpha)
+        y = _lerp(self.prev_y, self.y, alpha)
+        screen.blit(self.frames[self.frame_index], (int(x), int(y)))
 
 
 class Obstacle:
-    def __init__(self, x, y, kind, speed, image):
+    __slots__ = ("kind", "image", "w", "h")
+
+    def __init__(self, kind="rock", image=None, size=None):
         # ca c'est pour un rocher / obstacle qui descend
-        self.x = x
-        self.y = y
+        # (position et vitesse sont rangees dans l'EntityStore)
+        self.reset(kind, image, size)
+
+    def reset(self, kind, image, size=None):
+        # ca c'est pour recycler l'objet (voir EntityPool)
         self.kind = kind
-        self.speed = speed
         self.image = image
-        self.w = image.get_width()
-        self.h = image.get_height()
+        self.w, self.h = _sprite_size(image, size)
 
-    def rect(self):
-        return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
-
-    def update(self, dt):
-        self.y += self.speed * dt
-
-    def draw(self, screen):
-        screen.blit(self.image, (int(self.x), int(self.y)))
+    def draw(self, screen, x, y):
+        screen.blit(self.image, (int(x), int(y)))
 
 
 class Gate:
-    def __init__(self, y, gap_x, gap_w, speed, tree_image, screen_w):
+    __slots__ = ("gap_x", "gap_w", "tree_image", "tree_w", "tree_h", "screen_w", "w", "h", "passed",
+                 "left_end", "right_start", "right_end", "surface")
+
+    def __init__(self, gap_x=0, gap_w=0, tree_image=None, screen_w=0, tree_size=None):
         # ca c'est pour une porte = rangee de sapins avec un trou (gap)
-        self.y = y
+        # (sa hauteur y et sa vitesse sont rangees dans l'EntityStore)
+        self.reset(gap_x, gap_w, tree_image, screen_w, tree_size)
+
+    def reset(self, gap_x, gap_w, tree_image, screen_w, tree_size=None):
+        # ca c'est pour recycler l'objet (voir EntityPool)
         self.gap_x = gap_x
         self.gap_w = gap_w
-        self.speed = speed
         self.tree_image = tree_image
-        self.tree_w = tree_image.get_width()
-        self.tree_h = tree_image.get_height()
+        self.tree_w, self.tree_h = _sprite_size(tree_image, tree_size)
         self.screen_w = screen_w
+        self.w = screen_w
+        self.h = self.tree_h
         self.passed = False
-
-    def update(self, dt):
-        self.y += self.speed * dt
-
-    def _tree_positions(self):
-        # ca c'est pour placer des sapins partout sauf dans le trou
-        positions = []
-        x = 0
-        gap_left = int(self.gap_x)
-        gap_right = int(self.gap_x + self.gap_w)
-        while x < self.screen_w:
-            if x + self.tree_w <= gap_left or x >= gap_right:
-                positions.append(x)
-            x += self.tree_w
-        return positions
-
-    def tree_rects(self):
-        y = int(self.y)
-        return [pygame.Rect(x, y, self.tree_w, self.tree_h) for x in self._tree_positions()]
-
-    def draw(self, screen):
-        y = int(self.y)
-        for x in self._tree_positions():
-            screen.blit(self.tree_image, (x, y))
+        self._compute_spans()
+        self.surface = None
+        if tree_image is not None:
+            self.surface = _gate_row_surface(tree_image, screen_w, self.left_end, self.right_start)
+
+    def _compute_spans(self):
+        # ca c'est pour les bandes pleines de la rangee (voir gate_spans)
+        self.left_end, self.right_start, self.right_end = gate_spans(self.gap_x, self.gap_w, self.tree_w, self.screen_w)
+
+    def collides(self, rect, y):
+        # ca fonction est de dire si rect touche un sapin de la rangee placee en y
+        # (meme resultat que tester chaque Rect de sapin, sans les construire)
+        y = int(y)
+        if rect.bottom <= y or rect.top >= y + self.tree_h or rect.w <= 0 or rect.h <= 0:
+            return False
+        left = rect.left
+        right = rect.right
+        if self.left_end > 0 and left < self.left_end and right > 0:
+            return True
+        return self.right_start < self.right_end and left < self.right_end and right > self.right_start
+
+    def draw(self, screen, x, y):
+        # ca c'est un seul blit pour toute la rangee (surface en cache)
+        screen.blit(self.surface, (0, int(y)))
 
 
 class Bonus:
-    def __init__(self, x, y, image, speed, kind):
+    __slots__ = ("image", "w", "h", "kind")
+
+    def __init__(self, image=None, kind="speed", size=None):
         # ca c'est pour un bonus = danse ou boost
-        self.x = x
-        self.y = y
+        # (position et vitesse sont rangees dans l'EntityStore)
+        self.reset(image, kind, size)
+
+    def reset(self, image, kind, size=None):
+        # ca c'est pour recycler l'objet (voir EntityPool)
         self.image = image
-        self.w = image.get_width()
-        self.h = image.get_height()
-        self.speed = speed
+        self.w, self.h = _sprite_size(image, size)
         self.kind = kind
 
-    def rect(self):
-        return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
-
-    def update(self, dt):
-        self.y += self.speed * dt
-
-    def draw(self, screen):
-        screen.blit(self.image, (int(self.x), int(self.y)))
+    def draw(self, screen, x, y):
+        screen.blit(self.image, (int(x), int(y)))
 
 
 class Drone:
-    def __init__(self, x, image):
+    __slots__ = ("rng", "x", "prev_x", "base_x", "y", "image", "t")
+
+    def __init__(self, x, image, rng=None):
         # ca c'est pour le drone qui lache parfois un objet
+        self.rng = rng if rng is not None else random.Random()
         self.x = x
+        self.prev_x = x
         self.base_x = x
         self.y = 60
-        self.cooldown = 0.0
         self.image = image
         self.t = 0.0
 
     def update(self, dt):
+        self.prev_x = self.x
         self.t += dt
         sway = math.sin(self.t * 1.2) * 140
         self.x = self.base_x + sway
-        self.cooldown = max(0.0, self.cooldown - dt)
-
-    def try_drop(self, obstacles, speed, drop_image):
-        if self.cooldown == 0.0 and random.random() < 0.02:
-            obstacles.append(Obstacle(self.x - 10, self.y + 10, "drone_drop", speed + 50, drop_image))
-            self.cooldown = 1.5
-
-    def draw(self, screen):
-        screen.blit(self.image, (int(self.x - self.image.get_width() / 2), int(self.y - 8)))
-
-
-class Yeti:
-    def __init__(self, x, y, frames):
-        # ca c'est pour le yeti qui poursuit le joueur (il commence derriere)
-        self.x = x
-        self.y = y
-        self.frames = frames
-        self.frame_index = 0
-        self.frame_timer = 0.0
-        self.w = frames[0].get_width()
-        self.h = frames[0].get_height()
-        self.knockback = 0.0
-        self.slow_timer = 0.0
-        self.moonwalk_timer = 0.0
 
-    def rect(self):
-        return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
+    def next_drop_delay(self):
+        # ca c'est le temps avant le prochain largage : 1.5 s de recharge puis
+        # en moyenne une chance sur 50 par pas (loi exponentielle equivalente)
+        return 1.5 + self.rng.expovariate(DROP_RATE)
 
-    def update(self, dt, target_x, target_y, speed, speed_bonus, screen_h, screen_w):
-        # ca c'est pour l'IA simple: aller vers le joueur + un peu de logic
-        if self.slow_timer > 0:
-            self.slow_timer = max(0.0, self.slow_timer - dt)
-        if self.moonwalk_timer > 0:
-            self.moonwalk_timer = max(0.0, self.moonwalk_timer - dt)
-
-        if self.moonwalk_timer > 0:
-            # ca c'est pour quand le joueur a le moonwalk, le yeti se trompe de direction
-            target_x = screen_w - target_x
-
-        slow_mult = 0.7 if self.slow_timer > 0 else 1.0
-        chase_speed = ((speed + speed_bonus) * 0.42 + 28) * slow_mult
-        self.y -= chase_speed * dt * 0.9
-        self.x += (target_x - (self.x + self.w / 2)) * 0.04
-        self.x = max(0, min(screen_w - self.w, self.x))
-
-        desired_y = target_y + 190
-        if self.y < desired_y:
-            self.y = min(desired_y, self.y + chase_speed * dt * 0.8)
-        if self.knockback > 0:
-            self.y += 200 * dt
-            self.knockback = max(0.0, self.knockback - dt)
-        if self.y < -self.h - 60:
-            self.y = screen_h + 140
-            self.x = random.randint(0, screen_w - self.w)
-
-        self.frame_timer += dt
-        if self.frame_timer >= 0.12:
-            self.frame_timer = 0.0
-            self.frame_index = (self.frame_index + 1) % len(self.frames)
+    def drop(self, drops, camera_y, drop_image, drop_size=None):
+        # drops : EntityStore des blocs de glace (coordonnees de piste)
+        # le bloc glisse un peu plus vite que la piste (20 px/s de plus)
+        drops.spawn(self.x - 10, camera_y + self.y + 10, 20.0, KIND_DRONE_DROP, 0, "drone_drop", drop_image, drop_size)
 
-    def draw(self, screen):
-        screen.blit(self.frames[self.frame_index], (int(self.x), int(self.y)))
+    def draw(self, screen, alpha=1.0):
+        x = _lerp(self.prev_x, self.x, alpha)
+        screen.blit(self.image, (int(x - self.image.get_width() / 2), int(self.y - 8)))
@@ -0,0 +1,207 @@
+"""
+Stockage en colonnes (NumPy) des entités qui défilent : obstacles, bonus, portes
+
+Au lieu d'une liste d'objets mis à jour un par un, chaque colonne (x, y,
+vitesse, type, taille) est un tableau : le déplacement est un seul
+y += vitesse * dt, et le pré-filtrage des collisions est une opération de
+masque. Les positions sont en coordonnées de piste (monde) : le défilement
+vient de la caméra du GameManager, pas des entités.
+
+Les lignes forment une file ordonnée en y : chaque entité apparaît plus haut
+que les précédentes et toutes celles d'un même stockage vont à la même
+vitesse, donc la plus basse est toujours en tête. Le retrait par le bas
+avance simplement la tête (head) ; une entité retirée au milieu (collision)
+devient une ligne morte (alive = False), effacée au prochain compactage.
+L'objet associé à chaque ligne (items) vient d'une EntityPool et y retourne
+quand la ligne est retirée.
+"""
+
+import numpy as np
+
+KIND_ROCK = 0
+KIND_DRONE_DROP = 1
+KIND_MOONWALK = 2
+KIND_SPEED = 3
+KIND_GATE = 4
+
+KIND_NAMES = ("rock", "drone_drop", "moonwalk", "speed", "gate")
+KIND_CODES = {name: code for code, name in enumerate(KIND_NAMES)}
+
+
+class EntityStore:
+    """Entités rangées en colonnes, en file ordonnée du bas vers le haut
+
+    Les lignes vivantes sont entre head et count ; les indices retournés
+    (near_y, overlapping...) sont des indices de ligne, valables jusqu'au
+    prochain add().
+    """
+
+    def __init__(self, capacity=32, pool=None):
+        self.head = 0
+        self.count = 0
+        self.live = 0
+        self.pool = pool
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.w = np.zeros(capacity, dtype=np.int32)
+        self.h = np.zeros(capacity, dtype=np.int32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.variant = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.items = []
+
+    def _columns(self):
+        return (self.x, self.y, self.prev_y, self.speed, self.w, self.h, self.kind, self.variant, self.alive)
+
+    def _repack(self, capacity):
+        # ramène les lignes vivantes en début de tableaux (et agrandit si besoin)
+        head, end = self.head, self.count
+        keep = self.alive[head:end].copy()
+        k = self.live
+        old = self._columns()
+        items = [item for item, ok in zip(self.items[head:end], keep.tolist()) if ok]
+        if capacity != self.capacity:
+            self._allocate(capacity)
+        for new_col, old_col in zip(self._columns(), old):
+            new_col[:k] = old_col[head:end][keep]
+        self.alive[k:] = False
+        self.items = items
+        self.head = 0
+        self.count = k
+
+    def reserve(self, capacity):
+        """Agrandit les colonnes d'avance (pas de réallocation en jeu)"""
+        if capacity > self.capacity:
+            self._repack(capacity)
+
+    def __len__(self):
+        return self.live
+
+    def clear(self):
+        """Vide le stockage ; les objets retournent dans leur réserve"""
+        if self.pool is not None:
+            for i in self.indices():
+                self.pool.release(self.items[i])
+        self.alive[:self.count] = False
+        self.head = 0
+        self.count = 0
+        self.live = 0
+        self.items.clear()
+
+    def add(self, x, y, speed, w, h, kind, variant=0, item=None):
+        """Ajoute une entité en queue de file et retourne son indice"""
+        if self.count == self.capacity:
+            # compactage si au moins la moitié des lignes est morte, sinon on double
+            if self.live <= self.capacity // 2:
+                self._repack(self.capacity)
+            else:
+                self._repack(self.capacity * 2)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.prev_y[i] = y
+        self.speed[i] = speed
+        self.w[i] = w
+        self.h[i] = h
+        self.kind[i] = kind
+        self.variant[i] = variant
+        self.alive[i] = True
+        self.items.append(item)
+        self.count = i + 1
+        self.live += 1
+        return i
+
+    def spawn(self, x, y, speed, kind, variant, *item_args):
+        """Ajoute une entité dont l'objet est pris dans la réserve"""
+        item = self.pool.acquire(*item_args)
+        return self.add(x, y, speed, item.w, item.h, kind, variant, item)
+
+    def indices(self):
+        """Indices des lignes vivantes, de la plus basse à la plus haute"""
+        head = self.head
+        return (np.flatnonzero(self.alive[head:self.count]) + head).tolist()
+
+    def update(self, dt):
+        """Déplace toutes les entités d'un coup (vitesse propre, en px/s)"""
+        head, end = self.head, self.count
+        self.prev_y[head:end] = self.y[head:end]
+        self.y[head:end] += self.speed[head:end] * dt
+
+    def _release(self, i):
+        self.alive[i] = False
+        self.live -= 1
+        if self.pool is not None:
+            self.pool.release(self.items[i])
+        self.items[i] = None
+
+    def _advance_head(self):
+        # saute les lignes mortes en tête de file
+        head, end = self.head, self.count
+        alive = self.alive
+        while head < end and not alive[head]:
+            head += 1
+        self.head = head
+        if head == end:
+            # file vide : on repart du début sans copie
+            self.head = 0
+            self.count = 0
+            self.items.clear()
+
+    def retire_below(self, limit):
+        """Retire les entités sorties par le bas (y > limit), depuis la tête"""
+        head, end = self.head, self.count
+        y = self.y
+        removed = 0
+        while head < end and y[head] > limit:
+            if self.alive[head]:
+                self._release(head)
+                removed += 1
+            head += 1
+        self.head = head
+        self._advance_head()
+        return removed
+
+    def remove(self, indices):
+        """Retire les entités d'indices donnés (l'ordre des autres est gardé)"""
+        if len(indices) == 0:
+            return
+        for i in indices:
+            if self.alive[i]:
+                self._release(i)
+        self._advance_head()
+
+    def overlapping(self, left, top, right, bottom):
+        """Indices des entités dont le rectangle touche (left, top, right, bottom)
+
+        Même règle que pygame.Rect.colliderect sur Rect(int(x), int(y), w, h).
+        """
+        head, end = self.head, self.count
+        if head == end:
+            return []
+        x = np.trunc(self.x[head:end])
+        y = np.trunc(self.y[head:end])
+        hit = (x < right) & (x + self.w[head:end] > left) & (y < bottom) & (y + self.h[head:end] > top)
+        hit &= self.alive[head:end]
+        return (np.flatnonzero(hit) + head).tolist()
+
+    def near_y(self, y, tolerance):
+        """Indices des entités à moins de tolerance pixels verticalement de y"""
+        head, end = self.head, self.count
+        if head == end:
+            return []
+        near = (np.abs(self.y[head:end] - y) < tolerance) & self.alive[head:end]
+        return (np.flatnonzero(near) + head).tolist()
+
+    def draw_positions(self, alpha=1.0, camera_y=0.0):
+        """Positions d'affichage interpolées : liste de (objet, x, y écran)"""
+        head, end = self.head, self.count
+        ys = self.prev_y[head:end] + (self.y[head:end] - self.prev_y[head:end]) * alpha - camera_y
+        alive = self.alive[head:end].tolist()
+        rows = zip(self.items[head:end], self.x[head:end].tolist(), ys.tolist())
+        return [row for row, ok in zip(rows, alive) if ok]
@@ -0,0 +1,92 @@
+"""
+Bus d'événements du ski : la simulation annonce, les consommateurs réagissent
+
+Le jeu émet des événements typés (porte franchie, rocher touché, bonus pris,
+contact avec un yeti, arrivée) dans un tampon, vidé une fois par image vers
+les consommateurs (sons, statistiques...). Les événements d'un même type et
+d'une même variante émis avant le vidage sont fusionnés en un seul, avec
+leur nombre : deux portes franchies dans la même image ne jouent qu'un son.
+
+La simulation ne touche plus au son : en headless, aucun consommateur n'est
+branché et le tampon, borné par le nombre de (type, variante), ne grossit pas.
+"""
+
+GATE_PASSED = "gate_passed"
+ROCK_HIT = "rock_hit"  # variante : "rock" (rocher) ou "drop" (bloc de glace)
+BONUS_TAKEN = "bonus_taken"  # variante : type du bonus
+YETI_CONTACT = "yeti_contact"
+FINISH = "finish"  # variante : "win", "missed" (trou raté) ou "crash" (sapin)
+
+EVENT_TYPES = (GATE_PASSED, ROCK_HIT, BONUS_TAKEN, YETI_CONTACT, FINISH)
+
+
+class Event:
+    """Un événement (fusionné) : type, variante et nombre d'occurrences"""
+
+    __slots__ = ("type", "variant", "count")
+
+    def __init__(self, type, variant=None, count=1):
+        self.type = type
+        self.variant = variant
+        self.count = count
+
+    def __repr__(self):
+        return f"Event({self.type!r}, {self.variant!r}, {self.count})"
+
+
+class EventBus:
+    """Tampon d'événements d'une image et consommateurs qui le vident"""
+
+    def __init__(self):
+        # (type, variante) -> Event, dans l'ordre de la première émission
+        self.pending = {}
+        self.consumers = []
+
+    def __len__(self):
+        return len(self.pending)
+
+    def subscribe(self, consumer):
+        """Branche consumer(events), appelé à chaque dispatch avec la liste des événements"""
+        self.consumers.append(consumer)
+        return consumer
+
+    def emit(self, type, variant=None, count=1):
+        key = (type, variant)
+        event = self.pending.get(key)
+        if event is None:
+            self.pending[key] = Event(type, variant, count)
+        else:
+            event.count += count
+
+    def drain(self):
+        """Retire et retourne les événements en attente"""
+        events = list(self.pending.values())
+        self.pending.clear()
+        return events
+
+    def dispatch(self):
+        """Vide le tampon vers tous les consommateurs (une fois par image)"""
+        if not self.pending:
+            return []
+        events = self.drain()
+        for consumer in self.consumers:
+            consumer(events)
+        return events
+
+    def clear(self):
+        self.pending.clear()
+
+
+class EventCounter:
+    """Consommateur qui compte les occurrences par type (statistiques d'une course)"""
+
+    def __init__(self):
+        self.counts = dict.fromkeys(EVENT_TYPES, 0)
+
+    def __call__(self, events):
+        for event in events:
+            self.counts[event.type] = self.counts.get(event.type, 0) + event.count
+
+    def reset(self):
+        for name in self.counts:
+            self.counts[name] = 0
@@ -0,0 +1,188 @@
+"""
+Champ de poursuite des yetis (flow field)
+
+L'écran est découpé en cases de FLOW_CELL pixels. Une recherche en largeur
+part de la case du skieur et donne, pour chaque case, le nombre de cases à
+traverser pour l'atteindre en contournant les rangées de sapins des portes,
+les rochers et les blocs de glace. Un yeti n'a plus qu'à lire sa case et
+les huit voisines : le calcul du champ ne dépend pas du nombre de yetis, et
+leur lecture se fait pour tous d'un coup (NumPy).
+
+Les cases sont alignées sur la piste, pas sur l'écran, et la grille ne
+glisse que toutes les SLIDE cases : tant qu'elle n'a pas glissé, que le
+skieur reste dans sa case et que les murs ne bougent pas, la recherche du
+pas précédent est reprise au lieu d'être refaite. Elle s'arrête dès que les
+yetis sont atteints.
+
+Le champ ne sert qu'à partir de FLOW_MIN_YETIS yetis (la horde) : pour un
+ou deux yetis, la poursuite directe (yetis.py) coûte bien moins cher.
+"""
+
+import numpy as np
+from .config import SCREEN_WIDTH, SCREEN_HEIGHT, FLOW_CELL
+
+# zone couverte : les yetis réapparaissent sous l'écran et sortent par le haut
+FLOW_TOP = -4 * FLOW_CELL
+FLOW_BOTTOM = SCREEN_HEIGHT + 6 * FLOW_CELL
+
+# la grille glisse avec la caméra par SLIDE cases à la fois : entre deux
+# glissements, ses cases restent les mêmes cases de piste
+SLIDE = 4
+
+FAR = np.iinfo(np.int32).max  # case pas atteinte
+
+# huit voisines (ligne, colonne), celles du haut d'abord : à distance égale
+# le yeti préfère monter
+NEIGHBOUR_ROWS = np.array([-1, -1, -1, 0, 0, 1, 1, 1])
+NEIGHBOUR_COLS = np.array([-1, 0, 1, -1, 1, -1, 0, 1])
+
+
+class FlowField:
+    """Distances (en cases) jusqu'au skieur, pour chaque case de l'écran"""
+
+    def __init__(self, width=SCREEN_WIDTH, top=FLOW_TOP, bottom=FLOW_BOTTOM, cell=FLOW_CELL):
+        self.cell = cell
+        self.top = top
+        self.cols = -(-width // cell)
+        self.rows = -(-(bottom - top) // cell) + SLIDE  # + SLIDE : marge entre deux glissements
+        shape = (self.rows, self.cols)
+        self.blocked = np.zeros(shape, dtype=bool)
+        self.centers_x = (np.arange(self.cols) + 0.5) * cell
+        # ligne d'un point écran : (y + offset) // cell ; origin : première
+        # ligne de la grille, en cases de piste
+        self.offset = -top
+        self.origin = 0
+        # distances entourées d'une bordure FAR : les voisines se lisent sans test
+        self.padded = np.full((self.rows + 2, self.cols + 2), FAR, dtype=np.int32)
+        self.dist = self.padded[1:-1, 1:-1]
+        # recherche en cours (avec bordure) : front, cases libres pas encore
+        # atteintes, distance du front
+        padded_shape = (self.rows + 2, self.cols + 2)
+        self.front = np.zeros(padded_shape, dtype=bool)
+        self.grow = np.zeros(padded_shape, dtype=bool)
+        self.open = np.zeros(padded_shape, dtype=bool)
+        self.step = 0
+        # ce qui a servi au dernier calcul
+        self.target = None
+        self.last_blocked = np.zeros(shape, dtype=bool)
+        self.builds = 0  # recherches commencées (les autres pas reprennent la précédente)
+        self.iterations = 0  # itérations du dernier pas
+
+    def begin(self, camera_y):
+        """Nouveau pas : la grille suit la caméra (par SLIDE cases) et se vide
+
+        L'origine ne dépend que de camera_y : une course restaurée
+        (snapshot) retrouve la même grille.
+        """
+        self.origin = int((camera_y + self.top) // (self.cell * SLIDE)) * SLIDE
+        self.offset = camera_y - self.origin * self.cell
+        self.blocked[:] = False
+
+    def cells(self, xs, ys):
+        """Cases (lignes, colonnes) des points (xs, ys) en pixels écran, ramenées dans la grille"""
+        rows = ((np.asarray(ys) + self.offset) // self.cell).astype(np.intp)
+        cols = (np.asarray(xs) // self.cell).astype(np.intp)
+        np.minimum(np.maximum(rows, 0, out=rows), self.rows - 1, out=rows)
+        np.minimum(np.maximum(cols, 0, out=cols), self.cols - 1, out=cols)
+        return rows, cols
+
+    def _row_range(self, top, bottom):
+        r0 = max(0, int((top + self.offset) // self.cell))
+        r1 = min(self.rows, int((bottom - 1 + self.offset) // self.cell) + 1)
+        return r0, r1
+
+    def block_gate(self, y, h, left_end, right_start, right_end):
+        """Bloque une rangée de sapins (bandes de Gate, voir gate_spans) à la hauteur écran y
+
+        Une case est bloquée si son centre est dans une bande : une case dont
+        le centre est dans le trou reste ouverte, le yeti y passe.
+        """
+        r0, r1 = self._row_range(y, y + h)
+        if r0 >= r1:
+            return
+        cx = self.centers_x
+        self.blocked[r0:r1] |= (cx < left_end) | ((cx >= right_start) & (cx < right_end))
+
+    def block_rects(self, xs, ys, ws, hs):
+        """Bloque les cases touchées par des rectangles (rochers, blocs de glace)"""
+        cell = self.cell
+        for x, y, w, h in zip(xs.tolist(), ys.tolist(), ws.tolist(), hs.tolist()):
+            r0, r1 = self._row_range(y, y + h)
+            c0 = max(0, int(x // cell))
+            c1 = min(self.cols, int((x + w - 1) // cell) + 1)
+            if r0 < r1 and c0 < c1:
+                self.blocked[r0:r1, c0:c1] = True
+
+    def build(self, target_x, target_y, need_x=(), need_y=()):
+        """Champ vers la case du point (target_x, target_y), calculé seulement si besoin
+
+        La recherche s'arrête dès que les cases des points (need_x, need_y)
+        (les yetis) sont atteintes : au-delà, le champ ne sait rien. Si le
+        skieur est dans la même case de piste et que les cases bloquées n'ont
+        pas changé, la recherche du pas précédent est reprise là où elle
+        s'était arrêtée au lieu d'être refaite.
+        """
+        row = min(max(int((target_y + self.offset) // self.cell), 0), self.rows - 1)
+        col = min(max(int(target_x // self.cell), 0), self.cols - 1)
+        target = (self.origin, row, col)
+        changed = target != self.target or not np.array_equal(self.blocked, self.last_blocked)
+        if changed:
+            self.target = target
+            self.last_blocked[:] = self.blocked
+            self._start(row, col)
+        need_rows, need_cols = self.cells(need_x, need_y)
+        # une case bloquée n'est jamais atteinte : inutile de l'attendre
+        wanted = ~self.blocked[need_rows, need_cols]
+        self.iterations = self._search(need_rows[wanted], need_cols[wanted])
+
+    def _start(self, row, col):
+        """Nouvelle recherche depuis (row, col)"""
+        self.dist[:] = FAR
+        self.dist[row, col] = 0
+        # front et cases libres entourés d'une bordure vide : les quatre
+        # voisines se lisent par tranches
+        np.logical_not(self.blocked, out=self.open[1:-1, 1:-1])
+        self.open[row + 1, col + 1] = False
+        self.front[:] = False
+        self.front[row + 1, col + 1] = True
+        self.step = 0
+        self.builds += 1
+
+    def _search(self, need_rows, need_cols):
+        """Avance le front d'une case par itération jusqu'aux cases demandées, retourne les itérations faites"""
+        dist = self.dist
+        front, grow = self.front, self.grow
+        open_inner = self.open[1:-1, 1:-1]
+        iterations = 0
+        while len(need_rows) and (dist[need_rows, need_cols] == FAR).any():
+            inner = grow[1:-1, 1:-1]
+            np.logical_or(front[:-2, 1:-1], front[2:, 1:-1], out=inner)
+            inner |= front[1:-1, :-2]
+            inner |= front[1:-1, 2:]
+            inner &= open_inner
+            if not inner.any():
+                break
+            self.step += 1
+            iterations += 1
+            dist[inner] = self.step
+            open_inner &= ~inner
+            front, grow = grow, front
+        self.front, self.grow = front, grow
+        return iterations
+
+    def sample(self, xs, ys):
+        """Pas conseillé aux points (xs, ys) en pixels écran : (dx, dy, connu)
+
+        dx, dy valent -1, 0 ou 1, vers la voisine la plus proche du skieur ;
+        connu est faux quand le champ ne sait rien de mieux (case du
+        skieur, case murée ou coupée du skieur) : le yeti va alors tout droit.
+        """
+        rows, cols = self.cells(xs, ys)
+        # huit voisines de chaque case, lues dans la grille avec bordure
+        neighbours = self.padded[rows + NEIGHBOUR_ROWS[:, None] + 1, cols + NEIGHBOUR_COLS[:, None] + 1]
+        best = neighbours.argmin(axis=0)
+        # case pas atteinte (murée, ou laissée par une recherche arrêtée tôt) :
+        # rien de sûr, quelle que soit la recherche qui l'a précédée
+        own = self.dist[rows, cols]
+        known = (own != FAR) & (neighbours[best, np.arange(len(best))] < own)
+        return np.where(known, NEIGHBOUR_COLS[best], 0), np.where(known, NEIGHBOUR_ROWS[best], 0), known
@@ -1,289 +1,590 @@
-import random
+import math
 import pygame
 from .config import *
-from .entities import Player, Obstacle, Gate, Bonus, Drone, Yeti
-from .audio import play_sfx
+from .entities import Player, Obstacle, Gate, Bonus, Drone
+from .entity_store import EntityStore, KIND_ROCK, KIND_GATE, KIND_CODES
+from .pool import EntityPool
+from .spatial_hash import SpatialHash
+from .flow_field import FlowField
+from .masks import sprite_masks, gate_row_mask, overlap
+from .scheduler import SpawnScheduler
+from .state import SkiState
+from .yetis import Yetis
+from . import snapshot, timeline
+from .timeline import SPEED_RAMP, FINISH_GAP, TIMELINE_AHEAD, ENDLESS, HORDE
+from .assets import SPRITE_SIZES, BONUS_SPRITES
+from .audio import event_sounds
+from .events import EventBus, EventCounter, GATE_PASSED, ROCK_HIT, BONUS_TAKEN, YETI_CONTACT, FINISH
+from .rng import make_rng, new_seed
+from .replay import InputLog, key_mask
+
+
 
 
 class GameManager:
-    """Gestion de la logique du jeu"""
+    """Gestion de la logique du jeu
+    
+    Sans écran ni images (screen=None, images=None), le jeu tourne en mode
+    headless : pas d'affichage, pas de son, pas de flocons (purement
+    décoratifs), tailles prises dans SPRITE_SIZES.
+    """
     
-    def __init__(self, screen, images, audio, fonts):
+    def __init__(self, screen=None, images=None, audio=None, fonts=None):
         self.screen = screen
         self.images = images
         self.audio = audio
         self.fonts = fonts
-        self.data = None
+        self.state = None
         self.paused = False
         self.game_over = False
         self.mode = "jo"  # "jo" ou "training"
         self.curling_data = None
         self.biathlon_data = None
+        self.seed = None
+        self.snow_rng = None
+        self.input_log = None
+        # Réserves d'objets recyclés, gardées d'une course à l'autre
+        self.pools = {
+            "obstacles": EntityPool(Obstacle),
+            "gates": EntityPool(Gate),
+            "bonuses": EntityPool(Bonus),
+        }
+        self.stores = {name: EntityStore(pool=pool) for name, pool in self.pools.items()}
+        # blocs de glace du drone : seuls obstacles qui bougent dans le monde
+        self.stores["drops"] = EntityStore(pool=self.pools["obstacles"])
+        self.grid = SpatialHash()
+        self.flow = FlowField()  # champ de poursuite de la horde (FLOW_MIN_YETIS yetis et plus)
+        # événements du ski (events.py), vidés une fois par image vers le son
+        # et les compteurs de la course
+        self.events = EventBus()
+        self.event_counts = self.events.subscribe(EventCounter())
+        if audio is not None:
+            self.events.subscribe(event_sounds(audio["sfx"]))
+        self.scheduler = SpawnScheduler()
+        # course pré-générée (timeline.py) et prochain événement à planifier
+        self.timeline = None
+        self.timeline_pos = 0
+        self.check_gates = COURSE_CHECK  # portes toujours passables (course_check.py)
+        # collisions du skieur confirmées au pixel près (masks.py)
+        self.pixel_collisions = PIXEL_COLLISIONS
+        self.masks = sprite_masks()
+        self.start_snapshot = None  # état de départ du niveau (rejouer instantané)
+        self.checkpoint = None  # état à la dernière porte franchie (mode entraînement)
+        self._checkpoint_due = False
+        # ca c'est un type d'événement = une fonction d'apparition
+        self.spawners = {
+            "rock": self._spawn_rock,
+            "gate": self._spawn_gate,
+            "bonus": self._spawn_bonus,
+            "drop": self._spawn_drop,
+            "finish": self._spawn_finish,
+        }
         
-    def reset_game(self, level=1):
-        """Réinitialise le jeu pour un nouveau niveau"""
-        player = Player(0, SCREEN_HEIGHT // 2, self.images["skier"])
+    def reset_game(self, level=1, seed=None, course=None):
+        """Réinitialise le jeu pour un nouveau niveau
+        
+        Toute la partie (apparitions, drone, yetis, neige) découle de seed :
+        la même graine redonne la même course. Sans graine, on en tire une.
+        level=ENDLESS (0) lance la course sans fin, level=HORDE la même
+        course poursuivie par une horde de yetis.
+        course : course déjà générée (Timeline, par exemple chargée d'un
+        fichier) ; sa graine et son niveau remplacent alors seed et level.
+        """
+        if course is not None:
+            level, seed = course.level, course.seed
+        if seed is None:
+            seed = new_seed()
+        self.seed = seed
+        self.timeline = course if course is not None else timeline.build(level, seed, self.check_gates)
+        self.snow_rng = make_rng(seed, "snow")
+        self.input_log = InputLog("ski", seed, level)
+        self.events.clear()
+        self.event_counts.reset()
+        
+        # Les objets de la course précédente retournent dans les réserves
+        for store in self.stores.values():
+            store.clear()
+        # sans fin : la piste finit aussi dense qu'au dernier niveau
+        pools_cfg = LEVEL_SETTINGS[max(LEVEL_SETTINGS)] if timeline.is_endless(level) else LEVEL_SETTINGS.get(level, LEVEL_SETTINGS[1])
+        for name, pool in self.pools.items():
+            size = pools_cfg["pools"][name]
+            pool.reserve(size)
+            self.stores[name].reserve(size)
+        
+        player = Player(0, SCREEN_HEIGHT // 2, self._frames("skier"), self._size("skier"))
         player.x = SCREEN_WIDTH // 2 - player.w // 2
-        drone = Drone(SCREEN_WIDTH // 2, self.images["drone"])
+        player.sync_rect()
+        drone = Drone(SCREEN_WIDTH // 2, self._image("drone"), make_rng(seed, "drone"))
+        
+        yetis = self._create_yetis(level, make_rng(seed, "yetis"))
+        
+        self.state = SkiState(
+            player, drone, yetis,
+            self.stores["obstacles"], self.stores["gates"], self.stores["bonuses"], self.stores["drops"],
+            self._create_snowflakes(120 if self.screen is not None else 0),
+            level=level, seed=seed,
+        )
+        
+        self.apply_level_settings()
+        self.start_snapshot = self.snapshot()
+        self.checkpoint = None
+        self._checkpoint_due = False
+        return self.state
+    
+    def _create_yetis(self, level, rng):
+        """Yetis du niveau : aucun au niveau 1, un ou deux ensuite, HORDE_SIZE en mode horde"""
+        size = self._size("yeti")
+        if level == HORDE:
+            # la horde part de sous l'écran, en file : les yetis arrivent un à un
+            xs = [rng.randint(0, SCREEN_WIDTH - size[0]) for _ in range(HORDE_SIZE)]
+            ys = [SCREEN_HEIGHT + 60 + i * 40 for i in range(HORDE_SIZE)]
+            spread_x = [rng.uniform(-90, 90) for _ in range(HORDE_SIZE)]
+            spread_y = [rng.uniform(0, 160) for _ in range(HORDE_SIZE)]
+            return Yetis(xs, ys, self._frames("yeti"), size, rng, spread_x, spread_y)
         
         yeti_count = 0
-        if level >= 2:
+        if level >= 2 or level == ENDLESS:
             yeti_count = 1
         if level >= 3:
             yeti_count = 2
-        
-        yetis = []
-        for i in range(yeti_count):
-            x = (SCREEN_WIDTH // 2) + (i * 80) - (40 * (yeti_count - 1))
-            yetis.append(Yeti(x, SCREEN_HEIGHT + 60 + i * 60, self.images["yeti"]))
-        
-        self.data = {
-            "player": player,
-            "drone": drone,
-            "yetis": yetis,
-            "yeti_active": level >= 2,
-            "obstacles": [],
-            "gates": [],
-            "bonuses": [],
-            "bg_offset": 0.0,
-            "score": 0,
-            "level": level,
-            "speed": 130,
-            "max_speed": 260,
-            "spawn_timer": 0.0,
-            "bonus_timer": 2.5,
-            "gate_timer": 1.8,
-            "race_time": 0.0,
-            "finish_time": 25.0,
-            "finish_score": 100,
-            "distance_left": 0.0,
-            "distance_total": 0.0,
-            "distance_scale": 0.0,
-            "race_time_end": None,
-            "final_done": False,
-            "finish_passed": False,
-            "finish_line": None,
-            "win": False,
-            "particles": [],
-            "snowflakes": self._create_snowflakes(120),
-        }
-        
-        self.apply_level_settings()
-        return self.data
+        xs = [(SCREEN_WIDTH // 2) + (i * 80) - (40 * (yeti_count - 1)) for i in range(yeti_count)]
+        ys = [SCREEN_HEIGHT + 60 + i * 60 for i in range(yeti_count)]
+        return Yetis(xs, ys, self._frames("yeti"), size, rng)
+    
+    def snapshot(self):
+        """État complet de la course en binaire (voir snapshot.py)"""
+        return snapshot.take(self)
+    
+    def restore(self, data):
+        """Remet la course dans l'état d'un snapshot"""
+        snapshot.restore(self, data)
+        self._checkpoint_due = False
+    
+    def retry(self):
+        """Rejoue la même course depuis le départ, sans tout reconstruire"""
+        self.restore(self.start_snapshot)
+        self.event_counts.reset()
+        self.checkpoint = None
+        self.paused = False
+        self.game_over = False
+    
+    def retry_from_checkpoint(self):
+        """Reprend à la dernière porte franchie (mode entraînement)
+        
+        Retourne False s'il n'y a pas encore de point de reprise. Les
+        compteurs d'événements reviennent à ceux du point de reprise.
+        """
+        if self.checkpoint is None:
+            return False
+        self.restore(self.checkpoint)
+        self.paused = False
+        self.game_over = False
+        return True
+    
+    def _image(self, name, index=None):
+        """Retourne une image chargée (None en mode headless)"""
+        if self.images is None:
+            return None
+        image = self.images[name]
+        return image[index] if index is not None else image
+    
+    def _frames(self, name):
+        """Retourne les frames d'animation (liste vide en mode headless)"""
+        return self.images[name] if self.images is not None else []
+    
+    def _size(self, name):
+        """Taille d'un sprite, sans avoir besoin de l'image en mode headless"""
+        if self.images is None:
+            return SPRITE_SIZES[name]
+        image = self.images[name]
+        if isinstance(image, list):
+            image = image[0]
+        return image.get_width(), image.get_height()
     
     def _create_snowflakes(self, count):
         """Crée des flocons de neige"""
+        rng = self.snow_rng
         flakes = []
         for _ in range(count):
-            r = random.choice([2, 2, 3])
+            r = rng.choice([2, 2, 3])
             flakes.append({
-                "x": random.randint(0, SCREEN_WIDTH),
-                "y": random.randint(0, SCREEN_HEIGHT),
+                "x": rng.randint(0, SCREEN_WIDTH),
+                "y": rng.randint(0, SCREEN_HEIGHT),
                 "r": r,
-                "spd": random.uniform(25, 60) if r >= 3 else random.uniform(30, 80),
-                "drift": random.uniform(-18, 18),
+                "spd": rng.uniform(25, 60) if r >= 3 else rng.uniform(30, 80),
+                "drift": rng.uniform(-18, 18),
             })
         return flakes
     
     def apply_level_settings(self):
         """Applique les paramètres du niveau actuel"""
-        level_cfg = LEVEL_SETTINGS.get(self.data["level"], LEVEL_SETTINGS[5])
-        self.data["max_speed"] = level_cfg["max_speed"]
-        self.data["speed"] = min(self.data["max_speed"], level_cfg["speed_base"])
-        
-        gate_min, gate_max = level_cfg["gate_range"]
-        self.data["gate_timer"] = random.uniform(gate_min, gate_max)
-        self.data["bonus_timer"] = random.uniform(*level_cfg["bonus_range"])
-        self.data["finish_score"] = level_cfg["finish_score"]
-        self.data["finish_time"] = level_cfg["finish_time"]
-        self.data["distance_total"] = level_cfg["distance_m"]
-        
-        denom = max(1.0, level_cfg["finish_time"] * level_cfg["speed_base"])
-        self.data["distance_scale"] = level_cfg["distance_m"] / denom
-        self.data["distance_left"] = level_cfg["distance_m"]
+        level_cfg = timeline.start_settings(self.state.level)
+        self.state.max_speed = level_cfg["max_speed"]
+        self.state.speed = min(self.state.max_speed, level_cfg["speed_base"])
+        
+        self.state.finish_score = level_cfg["finish_score"]
+        self.state.finish_time = level_cfg["finish_time"]
+        
+        self.state.distance_total = self.timeline.distance_m
+        self.state.distance_scale = timeline.distance_scale(level_cfg)
+        self.state.distance_left = self.timeline.distance_m
+        if timeline.is_endless(self.state.level):
+            # sans fin : distance_total compte ce qui a été parcouru
+            self.state.distance_total = 0.0
+        
+        # Premières apparitions
+        self.scheduler.clear()
+        self.timeline_pos = 0
+        self._stream_timeline(0.0)
+        self._plan_drop(self.state.drone.next_drop_delay())
+        if not timeline.is_endless(self.state.level):
+            self._plan_finish(0.0)
+    
+    # --- Apparitions planifiées (voir scheduler.py) ---
+    # Rochers, portes et bonus viennent de la course pré-générée (timeline.py),
+    # confiée au planificateur au fil de la course ; le drone et la ligne
+    # d'arrivée se planifient eux-mêmes (_plan_xxx). _spawn_xxx(t, payload)
+    # réalise l'apparition prévue au temps t.
+    
+    def _stream_timeline(self, now):
+        """Planifie les événements de la course des TIMELINE_AHEAD prochaines secondes"""
+        events, self.timeline_pos = self.timeline.stream(self.timeline_pos, now + TIMELINE_AHEAD)
+        for event in events:
+            self.scheduler.schedule(*event)
+    
+    def _spawn_y(self, time, offset):
+        """Hauteur (monde) d'une apparition prévue au temps time
+        
+        Un événement traité en retard (grand pas de temps) est placé là où il
+        serait s'il était apparu à l'heure.
+        """
+        state = self.state
+        late = state.race_time - time
+        return state.camera_y + offset + late * (state.speed + 30)
+    
+    # _xxx_args(...) : arguments de l'objet (Obstacle, Gate, Bonus) pris dans la réserve
+    
+    def _rock_args(self, variant):
+        rock_img = self._image("rock", variant)
+        rock_size = rock_img.get_size() if rock_img is not None else SPRITE_SIZES["rock"]
+        return "rock", rock_img, rock_size
+    
+    def _gate_args(self, gap_x, gap_w):
+        return gap_x, gap_w, self._image("tree"), SCREEN_WIDTH, self._size("tree")
+    
+    def _bonus_args(self, bonus_kind):
+        bonus_name = BONUS_SPRITES[bonus_kind]
+        return self._image(bonus_name), bonus_kind, self._size(bonus_name)
+    
+    def _drop_args(self):
+        return "drone_drop", self._image("drop"), self._size("drop")
+    
+    def _spawn_rock(self, time, payload):
+        x, variant = payload
+        self.state.obstacles.spawn(x, self._spawn_y(time, -60), 0.0, KIND_ROCK, variant, *self._rock_args(variant))
+    
+    def _spawn_gate(self, time, payload):
+        gap_x, gap_w = payload
+        self.state.gates.spawn(0, self._spawn_y(time, -80), 0.0, KIND_GATE, 0, *self._gate_args(gap_x, gap_w))
+    
+    def _spawn_bonus(self, time, payload):
+        x, bonus_kind = payload
+        self.state.bonuses.spawn(x, self._spawn_y(time, -40), 0.0, KIND_CODES[bonus_kind], 0, *self._bonus_args(bonus_kind))
+    
+    def _plan_drop(self, time):
+        self.scheduler.schedule(time, "drop")
+    
+    def _spawn_drop(self, time, payload):
+        drone = self.state.drone
+        drone.drop(self.state.drops, self.state.camera_y, self._image("drop"), self._size("drop"))
+        self._plan_drop(time + drone.next_drop_delay())
+    
+    def _finish_eta(self):
+        """Temps restant avant d'avoir parcouru distance_left (vitesse en rampe)"""
+        state = self.state
+        return timeline.finish_eta(state.distance_left, state.distance_scale, state.speed, state.max_speed)
+    
+    def _plan_finish(self, now):
+        # toujours strictement après now : un report ne boucle pas dans le même pas
+        self.scheduler.schedule(max(now + self._finish_eta(), math.nextafter(now, math.inf)), "finish")
+    
+    def _spawn_finish(self, time, payload):
+        state = self.state
+        if state.distance_left > 0:
+            # arrondis du pas fixe : on replanifie
+            self._plan_finish(state.race_time)
+            return
+        gap_x = self.timeline.finish_x
+        state.finish_line = {"y": state.camera_y - 100, "gap_x": gap_x, "gap_w": FINISH_GAP}
+    
+    def _update_snowflakes(self, dt):
+        """Fait tomber les flocons (flux aléatoire à part : sans effet sur la course)"""
+        state = self.state
+        for f in state.snowflakes:
+            f["px"] = f["x"]
+            f["py"] = f["y"]
+            f["y"] += f["spd"] * dt
+            f["x"] += f["drift"] * dt
+            if f["x"] < -10:
+                f["x"] = SCREEN_WIDTH + 10
+            if f["x"] > SCREEN_WIDTH + 10:
+                f["x"] = -10
+            if f["y"] > SCREEN_HEIGHT + 10:
+                f["y"] = self.snow_rng.randint(-200, -20)
+                f["x"] = self.snow_rng.randint(0, SCREEN_WIDTH)
+            if abs(f["x"] - f["px"]) > SCREEN_WIDTH // 2 or f["y"] < f["py"]:
+                # Flocon recyclé : pas d'interpolation
+                f["px"] = f["x"]
+                f["py"] = f["y"]
     
     def update(self, dt, keys):
         """Met à jour l'état du jeu"""
         if self.paused or self.game_over:
             return
         
-        data = self.data
-        level_cfg = LEVEL_SETTINGS.get(data["level"], LEVEL_SETTINGS[5])
+        state = self.state
+        self.input_log.record(key_mask(keys))
         
         # Mise à jour du temps
-        data["race_time"] += dt
+        state.race_time += dt
         
         # Mise à jour du joueur
-        data["player"].update(dt, keys, SCREEN_WIDTH, SCREEN_HEIGHT)
+        state.player.update(dt, keys, SCREEN_WIDTH, SCREEN_HEIGHT)
         
         # Mise à jour de la distance
-        data["distance_left"] -= data["speed"] * dt * data["distance_scale"]
-        if data["distance_left"] <= 0:
-            data["distance_left"] = 0
-        
-        # Vitesse progressive
-        if data["speed"] < data["max_speed"]:
-            data["speed"] = min(data["max_speed"], data["speed"] + 4.0 * dt)
-        
-        # Défilement du fond
-        data["bg_offset"] += data["speed"] * dt
-        
-        # Mise à jour des flocons
-        for f in data["snowflakes"]:
-            f["y"] += f["spd"] * dt
-            f["x"] += f["drift"] * dt
-            if f["x"] < -10:
-                f["x"] = SCREEN_WIDTH + 10
-            if f["x"] > SCREEN_WIDTH + 10:
-                f["x"] = -10
-            if f["y"] > SCREEN_HEIGHT + 10:
-                f["y"] = random.randint(-200, -20)
-                f["x"] = random.randint(0, SCREEN_WIDTH)
-        
-        # Spawn obstacles
-        data["spawn_timer"] += dt
-        if data["spawn_timer"] >= 1.2:
-            data["spawn_timer"] = 0.0
-            rock_img = random.choice(self.images["rock"])
-            x = random.randint(50, SCREEN_WIDTH - 50 - rock_img.get_width())
-            data["obstacles"].append(Obstacle(x, -60, "rock", data["speed"] + 30, rock_img))
-        
-        # Spawn portes
-        data["gate_timer"] -= dt
-        if data["gate_timer"] <= 0:
-            gap_min = max(150, 230 - data["level"] * 15)
-            gap_max = min(300, gap_min + 100)
-            gap_w = random.randint(gap_min, gap_max)
-            gap_x = random.randint(40, SCREEN_WIDTH - gap_w - 40)
-            data["gates"].append(Gate(-80, gap_x, gap_w, data["speed"] + 30, self.images["tree"], SCREEN_WIDTH))
-            gate_min, gate_max = level_cfg["gate_range"]
-            data["gate_timer"] = random.uniform(gate_min, gate_max) + level_cfg["extra_gate"]
-        
-        # Spawn bonus
-        data["bonus_timer"] -= dt
-        if data["bonus_timer"] <= 0:
-            bonus_kind = random.choice(["moonwalk", "speed"])
-            bonus_img = self.images["bonus"] if bonus_kind == "moonwalk" else self.images["speed_boost"]
-            x = random.randint(60, SCREEN_WIDTH - 60 - bonus_img.get_width())
-            data["bonuses"].append(Bonus(x, -40, bonus_img, data["speed"] + 30, bonus_kind))
-            data["bonus_timer"] = random.uniform(*level_cfg["bonus_range"])
-        
-        # Mise à jour obstacles
-        for obs in data["obstacles"][:]:
-            obs.update(dt)
-            if obs.y > SCREEN_HEIGHT + 60:
-                data["obstacles"].remove(obs)
-        
-        # Mise à jour portes
-        for gate in data["gates"][:]:
-            gate.update(dt)
-            if gate.y > SCREEN_HEIGHT + 100:
-                data["gates"].remove(gate)
-        
-        # Mise à jour bonus
-        for bonus in data["bonuses"][:]:
-            bonus.update(dt)
-            if bonus.y > SCREEN_HEIGHT + 40:
-                data["bonuses"].remove(bonus)
-        
-        # Mise à jour drone
-        data["drone"].update(dt)
-        data["drone"].try_drop(data["obstacles"], data["speed"], self.images["drop"])
-        
-        # Mise à jour yetis
-        speed_bonus = max(0, data["speed"] - 130)
-        for yeti in data["yetis"]:
-            yeti.update(dt, data["player"].x, data["player"].y, data["speed"], speed_bonus, SCREEN_HEIGHT, SCREEN_WIDTH)
+        travelled = state.speed * dt * state.distance_scale
+        state.distance_left -= travelled
+        if state.distance_left <= 0:
+            state.distance_left = 0
+        
+        # Vitesse progressive (sans fin : la vitesse maximale monte avec la difficulté)
+        if timeline.is_endless(state.level):
+            state.distance_total += travelled
+            state.max_speed = timeline.endless_max_speed(state.race_time)
+        if state.speed < state.max_speed:
+            state.speed = min(state.max_speed, state.speed + SPEED_RAMP * dt)
+        
+        # Caméra : les entités sont en coordonnées de piste (écran = monde - camera_y),
+        # seule la caméra avance, vers le haut de l'axe y
+        state.camera_prev = state.camera_y
+        state.camera_y -= (state.speed + 30) * dt
+        camera_y = state.camera_y
+        
+        # Mise à jour des flocons (décor seulement : rien à faire sans écran)
+        if self.screen is not None:
+            self._update_snowflakes(dt)
+        
+        # Retrait de ce qui est sorti par le bas de l'écran
+        bottom = camera_y + SCREEN_HEIGHT
+        state.obstacles.retire_below(bottom + 60)
+        state.gates.retire_below(bottom + 100)
+        state.bonuses.retire_below(bottom + 40)
+        
+        # Mise à jour drone (ses blocs de glace glissent sur la piste)
+        state.drops.update(dt)
+        state.drops.retire_below(bottom + 60)
+        state.drone.update(dt)
+        
+        # Apparitions arrivées à échéance (rochers, portes, bonus, drone, arrivée)
+        self._stream_timeline(state.race_time)
+        for time, kind, payload in self.scheduler.pop_due(state.race_time):
+            self.spawners[kind](time, payload)
+        
+        # Mise à jour yetis (la horde suit le champ de poursuite, les autres foncent droit)
+        yetis = state.yetis
+        if len(yetis):
+            player = state.player
+            field = None
+            if len(yetis) >= FLOW_MIN_YETIS:
+                self._build_flow_field()
+                field = self.flow
+            speed_bonus = max(0, state.speed - 130)
+            yetis.update(dt, player.x, player.y, player.x + player.w / 2,
+                         state.speed, speed_bonus, SCREEN_HEIGHT, SCREEN_WIDTH, field)
         
         # Collisions
         self._check_collisions()
         
         # Ligne d'arrivée
-        if data["distance_left"] <= 0 and data["finish_line"] is None:
-            gap_w = 280
-            gap_x = (SCREEN_WIDTH - gap_w) // 2
-            data["finish_line"] = {"y": -100, "gap_x": gap_x, "gap_w": gap_w}
-        
-        if data["finish_line"] is not None:
-            data["finish_line"]["y"] += (data["speed"] + 30) * dt
-            if data["finish_line"]["y"] > data["player"].y and not data["finish_passed"]:
-                gap_x = data["finish_line"]["gap_x"]
-                gap_w = data["finish_line"]["gap_w"]
-                px = data["player"].x
-                pw = data["player"].w
+        if state.finish_line is not None:
+            if state.finish_line["y"] - camera_y > state.player.y and not state.finish_passed:
+                gap_x = state.finish_line["gap_x"]
+                gap_w = state.finish_line["gap_w"]
+                px = state.player.x
+                pw = state.player.w
                 if px + pw < gap_x or px > gap_x + gap_w:
                     # Raté
-                    data["win"] = False
-                    data["final_done"] = True
+                    state.win = False
+                    state.final_done = True
                     self.game_over = True
-                    play_sfx(self.audio["sfx"], "game_over")
+                    self.events.emit(FINISH, "missed")
                 else:
                     # Gagné
-                    data["win"] = True
-                    data["race_time_end"] = data["race_time"]
-                    data["final_done"] = True
+                    state.win = True
+                    state.race_time_end = state.race_time
+                    state.final_done = True
                     self.game_over = True
-                data["finish_passed"] = True
+                    self.events.emit(FINISH, "win")
+                state.finish_passed = True
+        
+        # Point de reprise pris en fin de pas (état complet et cohérent)
+        if self._checkpoint_due and not self.game_over:
+            self.checkpoint = self.snapshot()
+            self._checkpoint_due = False
+    
+    def _build_flow_field(self):
+        """Champ de poursuite du pas : rangées de sapins, rochers et blocs de glace à contourner"""
+        state = self.state
+        camera_y = state.camera_y
+        field = self.flow
+        field.begin(camera_y)
+        gates = state.gates
+        for i in gates.indices():
+            gate = gates.items[i]
+            field.block_gate(gates.y[i] - camera_y, gate.tree_h, gate.left_end, gate.right_start, gate.right_end)
+        for store in (state.obstacles, state.drops):
+            rows = store.indices()
+            if rows:
+                field.block_rects(store.x[rows], store.y[rows] - camera_y, store.w[rows], store.h[rows])
+        player = state.player
+        field.build(player.x + player.w / 2, player.y + player.h / 2, *self.state.yetis.centers())
+    
+    def step(self, keys, dt=SIM_DT):
+        """Avance la simulation d'un pas avec un état clavier (réel ou synthétique)
+        
+        Retourne le résultat de la course (voir outcome).
+        """
+        self.update(dt, keys)
+        self.events.dispatch()
+        return self.outcome()
+    
+    def pool_stats(self):
+        """Statistiques des réserves (pic d'utilisation, taux de recyclage)"""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+    
+    def outcome(self):
+        """Résultat de la course en cours"""
+        state = self.state
+        return {
+            "done": self.game_over,
+            "win": state.win,
+            "score": state.score,
+            "level": state.level,
+            "race_time": state.race_time,
+            "distance_left": state.distance_left,
+        }
     
     def _check_collisions(self):
         """Vérifie les collisions"""
-        data = self.data
-        player_rect = data["player"].rect()
-        
-        # Collision avec obstacles
-        for obs in data["obstacles"][:]:
-            if player_rect.colliderect(obs.rect()):
-                if obs.kind == "rock":
-                    data["player"].slow_timer = 1.2
-                    play_sfx(self.audio["sfx"], "rock")
-                elif obs.kind == "drone_drop":
-                    data["player"].freeze_timer = 0.8
-                    play_sfx(self.audio["sfx"], "rock")
-                data["obstacles"].remove(obs)
+        state = self.state
+        player = state.player
+        player_rect = player.rect
+        obstacles = state.obstacles
+        drops = state.drops
+        bonuses = state.bonuses
+        yetis = state.yetis
+        camera_y = state.camera_y
+        
+        # Phase large : grille reconstruite à chaque pas, en coordonnées écran
+        grid = self.grid
+        grid.clear()
+        grid.insert_store("obstacles", obstacles, -camera_y)
+        grid.insert_store("drops", drops, -camera_y)
+        grid.insert_store("bonuses", bonuses, -camera_y)
+        yeti_rects = yetis.rects()
+        for k, edges in enumerate(yeti_rects):
+            grid.insert(("yetis", k), *edges)
+        
+        # Collision avec rochers et blocs de glace (rectangles, puis pixels si
+        # PIXEL_COLLISIONS : seulement pour les rares rectangles qui se touchent)
+        masks = self.masks
+        rock_hits = [i for i in grid.indices(player_rect, "obstacles")
+                     if self._player_touches(masks["rock"][obstacles.variant[i]],
+                                             obstacles.x[i], obstacles.y[i] - camera_y)]
+        if rock_hits:
+            player.slow_timer = 1.2
+            self.events.emit(ROCK_HIT, "rock", len(rock_hits))
+        drop_hits = [i for i in grid.indices(player_rect, "drops")
+                     if self._player_touches(masks["drop"], drops.x[i], drops.y[i] - camera_y)]
+        if drop_hits:
+            player.freeze_timer = 0.8
+            self.events.emit(ROCK_HIT, "drop", len(drop_hits))
+        
+        # Yetis contre rochers / blocs de glace : le yeti recule, l'obstacle casse
+        # (une requête de la grille par yeti)
+        hits_by_layer = {"obstacles": rock_hits, "drops": drop_hits}
+        for k, edges in enumerate(yeti_rects):
+            for layer, i in grid.query(*edges):
+                hits = hits_by_layer.get(layer)
+                if hits is not None and i not in hits:
+                    hits.append(i)
+                    yetis.knockback[k] = max(yetis.knockback[k], 0.4)
+        obstacles.remove(rock_hits)
+        drops.remove(drop_hits)
         
         # Collision avec portes
-        for gate in data["gates"]:
-            if abs(gate.y - data["player"].y) < 30:
-                for tree_rect in gate.tree_rects():
-                    if player_rect.colliderect(tree_rect):
-                        data["win"] = False
-                        data["final_done"] = True
-                        self.game_over = True
-                        play_sfx(self.audio["sfx"], "game_over")
-                        return
-                if not gate.passed and gate.y > data["player"].y:
-                    gate.passed = True
-                    data["score"] += 10
-                    play_sfx(self.audio["sfx"], "gate")
+        gates = state.gates
+        for i in gates.near_y(player.y + camera_y, 30):
+            gate = gates.items[i]
+            gate_y = gates.y[i] - camera_y
+            if gate.collides(player_rect, gate_y) and self._player_touches(
+                    gate_row_mask(SCREEN_WIDTH, gate.left_end, gate.right_start), 0, gate_y):
+                state.win = False
+                state.final_done = True
+                self.game_over = True
+                self.events.emit(FINISH, "crash")
+                return
+            if not gate.passed and gate_y > player.y:
+                gate.passed = True
+                state.score += 10
+                self.events.emit(GATE_PASSED)
+                if self.mode == "training":
+                    self._checkpoint_due = True
         
         # Collision avec bonus
-        for bonus in data["bonuses"][:]:
-            if player_rect.colliderect(bonus.rect()):
-                if bonus.kind == "moonwalk":
-                    data["player"].moonwalk = 3.0
-                    for yeti in data["yetis"]:
-                        yeti.moonwalk_timer = 3.0
-                    play_sfx(self.audio["sfx"], "bonus")
-                elif bonus.kind == "speed":
-                    data["player"].boost_timer = 2.8
-                    for yeti in data["yetis"]:
-                        yeti.slow_timer = 2.8
-                    play_sfx(self.audio["sfx"], "speed")
-                data["bonuses"].remove(bonus)
-        
-        # Collision avec yeti
-        for yeti in data["yetis"]:
-            if player_rect.colliderect(yeti.rect()):
-                yeti.knockback = 0.6
-                data["player"].slow_timer = 1.5
-                play_sfx(self.audio["sfx"], "rock")
-    
-    def draw_background(self):
+        hits = [i for i in grid.indices(player_rect, "bonuses")
+                if self._player_touches(masks[BONUS_SPRITES[bonuses.items[i].kind]], bonuses.x[i], bonuses.y[i] - camera_y)]
+        for i in hits:
+            bonus = bonuses.items[i]
+            if bonus.kind == "moonwalk":
+                player.moonwalk = 3.0
+                yetis.moonwalk_timer[:] = 3.0
+            elif bonus.kind == "speed":
+                player.boost_timer = 2.8
+                yetis.slow_timer[:] = 2.8
+            self.events.emit(BONUS_TAKEN, bonus.kind)
+        bonuses.remove(hits)
+        
+        # Collision avec yeti : seulement au début du contact (pas à chaque
+        # pas tant que le yeti chevauche le skieur)
+        touched = [k for _, k in grid.query_rect(player_rect, "yetis")]
+        if touched or yetis.contact.any():
+            new = [k for k in touched if not yetis.contact[k]]
+            yetis.contact[:] = False
+            yetis.contact[touched] = True
+            if new:
+                yetis.knockback[new] = 0.6
+                player.slow_timer = 1.5
+                self.events.emit(YETI_CONTACT, count=len(new))
+    
+    def _player_touches(self, mask, x, y):
+        """Confirme au pixel près un contact du skieur trouvé par les rectangles"""
+        if not self.pixel_collisions:
+            return True
+        rect = self.state.player.rect
+        return overlap(self.masks["skier"], rect.x, rect.y, mask, x, y)
+    
+    def _lerp(self, prev, current, alpha):
+        """Position interpolée entre les deux derniers pas de simulation"""
+        return prev + (current - prev) * alpha
+    
+    def draw_background(self, alpha=1.0):
         """Dessine le fond qui défile"""
         bg_tile = self.images["bg_tile"]
         tile_w = bg_tile.get_width()
         tile_h = bg_tile.get_height()
-        y = -tile_h + int(self.data["bg_offset"] % tile_h)
+        offset = -self._lerp(self.state.camera_prev, self.state.camera_y, alpha)
+        y = -tile_h + int(offset % tile_h)
         while y < SCREEN_HEIGHT:
             x = 0
             while x < SCREEN_WIDTH:
@@ -291,50 +592,51 @@ class GameManager:
                 x += tile_w
             y += tile_h
     
-    def draw_game(self):
-        """Dessine l'état du jeu"""
-        data = self.data
+    def draw_game(self, alpha=1.0):
+        """Dessine l'état du jeu
+        
+        alpha (0..1) : position du rendu entre les deux derniers pas de
+        simulation, pour un affichage fluide quel que soit le nombre d'images/s.
+        """
+        state = self.state
+        if self.paused or self.game_over:
+            alpha = 1.0
         
         # Fond
-        self.draw_background()
+        self.draw_background(alpha)
         
         # Flocons
-        for f in data["snowflakes"]:
-            pygame.draw.circle(self.screen, COLOR_SNOW, (int(f["x"]), int(f["y"])), int(f["r"]))
-        
-        # Obstacles
-        for obs in data["obstacles"]:
-            obs.draw(self.screen)
+        for f in state.snowflakes:
+            fx = self._lerp(f.get("px", f["x"]), f["x"], alpha)
+            fy = self._lerp(f.get("py", f["y"]), f["y"], alpha)
+            pygame.draw.circle(self.screen, COLOR_SNOW, (int(fx), int(fy)), int(f["r"]))
         
-        # Portes
-        for gate in data["gates"]:
-            gate.draw(self.screen)
-        
-        # Bonus
-        for bonus in data["bonuses"]:
-            bonus.draw(self.screen)
+        # Obstacles, portes, bonus
+        camera_y = self._lerp(state.camera_prev, state.camera_y, alpha)
+        for store in (state.obstacles, state.drops, state.gates, state.bonuses):
+            for item, x, y in store.draw_positions(alpha, camera_y):
+                item.draw(self.screen, x, y)
         
         # Drone
-        data["drone"].draw(self.screen)
+        state.drone.draw(self.screen, alpha)
         
         # Yetis
-        for yeti in data["yetis"]:
-            yeti.draw(self.screen)
+        state.yetis.draw(self.screen, alpha)
         
         # Joueur
-        data["player"].draw(self.screen)
+        state.player.draw(self.screen, alpha)
         
         # Ligne d'arrivée
-        if data["finish_line"] is not None:
-            self._draw_finish_line()
+        if state.finish_line is not None:
+            self._draw_finish_line(alpha)
         
         # HUD
         self._draw_hud()
     
-    def _draw_finish_line(self):
+    def _draw_finish_line(self, alpha=1.0):
         """Dessine la ligne d'arrivée"""
-        finish = self.data["finish_line"]
-        fy = int(finish["y"])
+        finish = self.state.finish_line
+        fy = int(finish["y"] - self._lerp(self.state.camera_prev, self.state.camera_y, alpha))
         gap_x = finish["gap_x"]
         gap_w = finish["gap_w"]
         
@@ -352,12 +654,12 @@ class GameManager:
         pygame.draw.polygon(self.screen, (200, 30, 30), [(left_x + 10, fy + 6), (left_x + 40, fy + 16), (left_x + 10, fy + 26)])
         pygame.draw.polygon(self.screen, (200, 30, 30), [(right_x + 10, fy + 6), (right_x + 40, fy + 16), (right_x + 10, fy + 26)])
         
-        banner = self.fonts["small"].render(f"ARRIVEE {int(self.data['distance_total'])} m", True, (200, 30, 30))
+        banner = self.fonts["small"].render(f"ARRIVEE {int(self.state.distance_total)} m", True, (200, 30, 30))
         self.screen.blit(banner, (SCREEN_WIDTH // 2 - banner.get_width() // 2, fy - 38))
     
     def _draw_hud(self):
         """Dessine l'interface de jeu"""
-        data = self.data
+        state = self.state
         
         # Panel HUD
         hud_panel = pygame.Surface((SCREEN_WIDTH, 50), pygame.SRCALPHA)
@@ -366,18 +668,23 @@ class GameManager:
         self.screen.blit(hud_panel, (0, 0))
         
         # Informations
-        hud_text = f"Score: {data['score']}  |  Niveau: {data['level']}  |  Distance: {int(data['distance_left'])} m"
+        if timeline.is_endless(state.level):
+            level = timeline.endless_level(state.race_time)
+            mode = "Horde" if state.level == HORDE else "Sans fin"
+            hud_text = f"Score: {state.score}  |  {mode} : niveau {level:.1f}  |  Distance: {int(state.distance_total)} m"
+        else:
+            hud_text = f"Score: {state.score}  |  Niveau: {state.level}  |  Distance: {int(state.distance_left)} m"
         hud = self.fonts["small"].render(hud_text, True, COLOR_TEXT_DARK)
         self.screen.blit(hud, (14, 14))
         
         # Indicateurs d'effets
         effect_x = SCREEN_WIDTH - 180
-        if data["player"].boost_timer > 0:
+        if state.player.boost_timer > 0:
             boost_txt = self.fonts["small"].render("⚡ BOOST", True, (255, 200, 0))
             self.screen.blit(boost_txt, (effect_x, 14))
             effect_x -= 100
         
-        if data["player"].moonwalk > 0:
+        if state.player.moonwalk > 0:
             moon_txt = self.fonts["small"].render("🌙 MOONWALK", True, (200, 150, 255))
             self.screen.blit(moon_txt, (effect_x, 14))
     
@@ -397,34 +704,40 @@ class GameManager:
         self.screen.blit(panel, (panel_x, panel_y))
         
         # Titre
-        title_text = "🏁 ARRIVÉE !" if self.data.get("win") else "❌ FIN !"
-        title_color = (30, 180, 30) if self.data.get("win") else (200, 30, 30)
+        title_text = "🏁 ARRIVÉE !" if self.state.win else "❌ FIN !"
+        title_color = (30, 180, 30) if self.state.win else (200, 30, 30)
         over = self.fonts["big"].render(title_text, True, title_color)
         self.screen.blit(over, (SCREEN_WIDTH // 2 - over.get_width() // 2, panel_y + 20))
         
         # Score
         score_y = panel_y + 80
-        score_txt = self.fonts["medium"].render(f"Score: {self.data['score']}", True, COLOR_TEXT_DARK)
+        score_txt = self.fonts["medium"].render(f"Score: {self.state.score}", True, COLOR_TEXT_DARK)
         self.screen.blit(score_txt, (SCREEN_WIDTH // 2 - score_txt.get_width() // 2, score_y))
         
-        # Temps
-        if self.data.get("win"):
-            time_val = self.data.get("race_time_end", self.data["race_time"])
+        # Temps (sans fin : distance parcourue)
+        if timeline.is_endless(self.state.level):
+            dist_txt = self.fonts["small"].render(f"Distance: {int(self.state.distance_total)} m", True, COLOR_TEXT_DARK)
+            self.screen.blit(dist_txt, (SCREEN_WIDTH // 2 - dist_txt.get_width() // 2, score_y + 40))
+        elif self.state.win:
+            time_val = self.state.race_time_end
             time_txt = self.fonts["small"].render(f"Temps: {self._format_time(time_val)}", True, COLOR_TEXT_DARK)
             self.screen.blit(time_txt, (SCREEN_WIDTH // 2 - time_txt.get_width() // 2, score_y + 40))
         
         # Instructions
         instr_y = panel_y + 160
-        if self.data.get("win") and self.data["level"] < 5:
+        if self.state.win and self.state.level < 5:
             instr = self.fonts["small"].render("R : rejouer  |  ENTREE : niveau suivant", True, COLOR_TEXT_DARK)
-        elif self.data.get("win"):
+        elif self.state.win:
             instr = self.fonts["small"].render("R : rejouer  |  ENTREE : menu", True, COLOR_TEXT_DARK)
         else:
             instr = self.fonts["small"].render("R : rejouer  |  ENTREE : menu", True, COLOR_TEXT_DARK)
         self.screen.blit(instr, (SCREEN_WIDTH // 2 - instr.get_width() // 2, instr_y))
+        if self.mode == "training" and self.checkpoint is not None:
+            retry_txt = self.fonts["small"].render("C : reprendre à la dernière porte", True, COLOR_TEXT_DARK)
+            self.screen.blit(retry_txt, (SCREEN_WIDTH // 2 - retry_txt.get_width() // 2, instr_y + 26))
         
         # Classement
-        if leaderboard and self.mode == "jo" and self.data.get("final_done"):
+        if leaderboard and self.mode == "jo" and self.state.final_done:
             ly = panel_y + 210
             title = self.fonts["small"].render("🏆 Classement:", True, COLOR_TEXT_DARK)
             self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, ly))
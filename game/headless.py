@@ -0,0 +1,76 @@
+"""
+Simulation du ski sans affichage (tests d'équilibrage, tests d'endurance)
+
+Lancement:
+    python -m game.headless --runs 1000 --level 3
+    python -m game.headless --runs 100 --level 3 --autopilot
+"""
+
+import argparse
+import time
+from .config import SIM_DT
+from .game_manager import GameManager
+from .inputs import KeyState
+from .autopilot import Autopilot
+from .events import EVENT_TYPES
+
+
+def simulate_run(level=1, policy=None, dt=SIM_DT, max_time=120.0, game=None, seed=None):
+    """Joue une course complète sans écran et retourne son résultat
+
+    policy(game) retourne un masque de touches (voir inputs.py) ; sans
+    policy, le skieur ne touche à rien. Une même graine rejoue la même course.
+    """
+    if game is None:
+        game = GameManager()
+    game.reset_game(level=level, seed=seed)
+    game.paused = False
+    game.game_over = False
+    keys = KeyState()
+    result = game.outcome()
+    max_steps = int(max_time / dt)
+    for _ in range(max_steps):
+        keys.mask = policy(game) if policy is not None else 0
+        result = game.step(keys, dt)
+        if result["done"]:
+            break
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulation headless du ski")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None, help="graine de la premiere course (les suivantes : +1, +2...)")
+    parser.add_argument("--autopilot", action="store_true", help="le pilote automatique conduit (sinon : aucune touche)")
+    args = parser.parse_args(argv)
+
+    game = GameManager()
+    policy = Autopilot() if args.autopilot else None
+    wins = 0
+    total_score = 0
+    events = dict.fromkeys(EVENT_TYPES, 0)
+    start = time.perf_counter()
+    for i in range(args.runs):
+        seed = args.seed + i if args.seed is not None else None
+        result = simulate_run(level=args.level, policy=policy, game=game, seed=seed)
+        wins += 1 if result["win"] else 0
+        total_score += result["score"]
+        for name, count in game.event_counts.counts.items():
+            events[name] += count
+    elapsed = time.perf_counter() - start
+
+    runs = max(1, args.runs)
+    print(f"Niveau {args.level} : {args.runs} courses en {elapsed:.2f}s ({args.runs / max(elapsed, 1e-9):.1f} courses/s)")
+    print(f"Victoires : {wins}/{args.runs}  |  Score moyen : {total_score / runs:.1f}")
+    print("Événements par course : " + "  |  ".join(f"{name} {count / runs:.1f}" for name, count in events.items()))
+    for name, stats in game.pool_stats().items():
+        print(f"Réserve {name} : taille {stats['size']}  |  pic {stats['high_water']}  |  recyclage {stats['hit_rate'] * 100:.0f}%")
+    if policy is not None:
+        stats = policy.stats()
+        print(f"Pilote : {stats['decisions']} décisions  |  moyenne {stats['mean_ms']:.2f} ms  |  p99 {stats['p99_ms']:.2f} ms"
+              f"  |  max {stats['max_ms']:.2f} ms  |  hors budget ({stats['budget_ms']:.1f} ms) {stats['over_budget']}")
+
+
+if __name__ == "__main__":
+    main()
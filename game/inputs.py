@@ -0,0 +1,51 @@
+"""
+Etat clavier synthétique pour la simulation (headless, bots, replays)
+"""
+
+import pygame
+
+
+# Un bit par touche utilisée par les modes de jeu
+KEY_LEFT = 1
+KEY_RIGHT = 2
+KEY_UP = 4
+KEY_DOWN = 8
+KEY_SPACE = 16
+KEY_P = 32
+KEY_R = 64
+
+KEY_BITS = {
+    pygame.K_LEFT: KEY_LEFT,
+    pygame.K_RIGHT: KEY_RIGHT,
+    pygame.K_UP: KEY_UP,
+    pygame.K_DOWN: KEY_DOWN,
+    pygame.K_SPACE: KEY_SPACE,
+    pygame.K_p: KEY_P,
+    pygame.K_r: KEY_R,
+}
+
+
+class KeyState:
+    """Remplace pygame.key.get_pressed() : keys[pygame.K_LEFT] -> bool"""
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+    @classmethod
+    def from_pressed(cls, pressed):
+        """Construit l'état à partir du tableau de pygame.key.get_pressed()"""
+        return cls(mask_from_pressed(pressed))
+
+
+def mask_from_pressed(pressed):
+    """Convertit un tableau de touches pygame en masque de bits"""
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if pressed[key]:
+            mask |= bit
+    return mask
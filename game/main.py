@@ -6,11 +6,13 @@ Contrôles:
 - Flèches: Déplacer le skieur
 - P / Espace: Pause
 - R: Rejouer (après game over)
+- Menu sans toucher à rien : démo (pilote automatique), une touche pour revenir
 - ENTREE: Valider les choix
 - ECHAP: Quitter
 """
 
 import pygame
+import random
 import sys
 from game.config import *
 from game.assets import ensure_assets, load_images
@@ -19,6 +21,11 @@ from game.menu import Menu
 from game.game_manager import GameManager
 from game.curling import CurlingGame
 from game.biathlon import BiathlonGame
+from game.replay import REPLAY_DIR, InputLog, replay_step
+from game.inputs import KeyState
+from game.timeline import ENDLESS, HORDE
+from game.autopilot import Autopilot
+from game import autosave
 
 
 def create_visual_effects(screen_w, screen_h):
@@ -29,27 +36,128 @@ def create_visual_effects(screen_w, screen_h):
     pygame.draw.rect(vignette, (10, 20, 30, 70), (0, 0, screen_w, screen_h), 40)
     
     # Grain neigeux
-    import random
     grain = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
-    random.seed(7)
+    rng = random.Random(7)
     for _ in range(240):
-        x = random.randint(0, screen_w - 1)
-        y = random.randint(0, screen_h - 1)
-        r = random.choice([1, 1, 2])
-        alpha = random.randint(30, 80)
+        x = rng.randint(0, screen_w - 1)
+        y = rng.randint(0, screen_h - 1)
+        r = rng.choice([1, 1, 2])
+        alpha = rng.randint(30, 80)
         pygame.draw.circle(grain, (255, 255, 255, alpha), (x, y), r)
     
     return vignette, grain
 
 
+def _set_mode(size, flags=0):
+    """Ouvre la fenetre, avec synchro verticale si la plateforme le permet"""
+    if VSYNC:
+        try:
+            return pygame.display.set_mode(size, flags, vsync=1)
+        except pygame.error:
+            pass
+    return pygame.display.set_mode(size, flags)
+
+
+def archive_finished_runs(*runs):
+    """Archive le journal d'entrées des parties terminées (voir replay.py)"""
+    if not RECORD_RUNS:
+        return
+    for log, finished in runs:
+        if finished and log is not None and not log.saved and log.steps:
+            try:
+                log.save(REPLAY_DIR)
+            except OSError as e:
+                log.saved = True
+                print(f"Replay non enregistré : {e}")
+
+
+def start_demo(game, level):
+    """Lance une course de démo (conduite par le pilote automatique)"""
+    game.reset_game(level=level)
+    game.paused = False
+    game.game_over = False
+    # une démo n'est pas archivée dans les replays
+    game.input_log.saved = True
+
+
+def capture_session(session, game, curling, biathlon):
+    """Copie de la session pour la sauvegarde automatique (voir autosave.py)
+
+    session : champs simples de la boucle principale. Les jeux sont copiés en
+    octets (snapshot du ski, journaux d'entrées des mini-jeux).
+    """
+    # le classement est une liste que la boucle principale continue de
+    # modifier pendant que le fil de l'AutoSaver écrit : on en garde une copie
+    session = dict(session, leaderboard=list(session["leaderboard"]))
+    blocks = {}
+    if game.state is not None:
+        blocks["ski"] = game.snapshot()
+        if game.input_log is not None:
+            blocks["ski_log"] = game.input_log.to_bytes()
+    if session["state"] == "curling":
+        blocks["curling_log"] = curling.input_log.to_bytes()
+    elif session["state"] == "biathlon":
+        blocks["biathlon_log"] = biathlon.input_log.to_bytes()
+    session["logs_saved"] = [
+        game.input_log is not None and game.input_log.saved,
+        curling.input_log.saved,
+        biathlon.input_log.saved,
+    ]
+    return session, blocks
+
+
+def _rebuild_minigame(minigame, data):
+    """Rejoue le journal d'un mini-jeu pour le remettre où il en était"""
+    log = InputLog.from_bytes(data)
+    dt = 1.0 / log.sim_hz
+    for mask in log.masks():
+        replay_step(minigame, log.mode, mask, dt)
+
+
+def resume_session(saved, game, curling, biathlon):
+    """Remet les jeux dans l'état de la dernière sauvegarde
+    
+    Retourne l'écran à reprendre (menu si la partie ne peut pas être reprise).
+    """
+    session, blocks = saved
+    ski_saved, curling_saved, biathlon_saved = session["logs_saved"]
+    game.mode = session["mode"]
+    if blocks["ski"] is not None:
+        if blocks["ski_log"] is not None:
+            game.input_log = InputLog.from_bytes(blocks["ski_log"])
+        game.restore(blocks["ski"])
+        game.input_log.saved = ski_saved
+    
+    state = session["state"]
+    if state in ("playing", "game_over"):
+        if game.state is None:
+            return "menu"
+        if state == "playing":
+            game.paused = True
+        return state
+    if state == "curling" and blocks["curling_log"] is not None:
+        curling.reset()
+        _rebuild_minigame(curling, blocks["curling_log"])
+        curling.input_log.saved = curling_saved
+        return state
+    if state == "biathlon" and blocks["biathlon_log"] is not None:
+        biathlon.reset(InputLog.from_bytes(blocks["biathlon_log"]).seed)
+        _rebuild_minigame(biathlon, blocks["biathlon_log"])
+        biathlon.input_log.saved = biathlon_saved
+        return state
+    if state == "name_entry" and session["pending_score"] is not None:
+        return state
+    return "menu"
+
+
 def init_display(mode_index):
     """Initialise l'affichage et les infos de mise a l'echelle"""
     label, size = WINDOW_PRESETS[mode_index]
     if label == "PLEIN ECRAN":
-        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        screen = _set_mode((0, 0), pygame.FULLSCREEN)
         actual_width, actual_height = screen.get_size()
     else:
-        screen = pygame.display.set_mode(size)
+        screen = _set_mode(size)
         actual_width, actual_height = size
 
 
@@ -128,6 +236,11 @@ def main():
     curling = CurlingGame(virtual_screen, fonts, audio)
     biathlon = BiathlonGame(virtual_screen, fonts, audio)
     
+    # Sauvegarde automatique (écriture en arrière-plan) et dernière session
+    autosaver = autosave.AutoSaver() if AUTOSAVE else None
+    saved = autosave.load() if AUTOSAVE else None
+    autosave_timer = 0.0
+    
     # Effets visuels
     vignette, grain = create_visual_effects(SCREEN_WIDTH, SCREEN_HEIGHT)
     
@@ -142,11 +255,44 @@ def main():
     jo_stage = "ski"  # ski -> curling -> biathlon
     jo_transition_timer = 0.0
     splash_ready = False
+    sim_accumulator = 0.0
+    idle_timer = 0.0  # temps passé sur le menu sans toucher à rien (démo)
+    demo_pilot = Autopilot()
+    demo_keys = KeyState()
+    demo_level = 1
+    
+    # Reprise après un plantage ou une coupure : même écran, classement et
+    # étape des JO (la course reprend en pause)
+    if saved is not None:
+        session = saved[0]
+        try:
+            state = resume_session(saved, game, curling, biathlon)
+        except (ValueError, KeyError) as e:
+            print(f"Session non reprise : {e}")
+            state = "splash"
+        else:
+            leaderboard = [tuple(entry) for entry in session["leaderboard"]]
+            name_input = session["name_input"]
+            pending_score = session["pending_score"]
+            pending_time = session["pending_time"]
+            jo_pending_score = session["jo_pending_score"]
+            jo_pending_time = session["jo_pending_time"]
+            jo_stage = session["jo_stage"]
+            jo_transition_timer = session["jo_transition_timer"]
+            volume = session["volume"]
+            set_master_volume(audio, volume)
+            print(f"Session reprise ({state})")
+            if state in ("playing", "curling", "biathlon"):
+                play_music(audio, "game")
     
     # Boucle principale
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
+        # Temps réel de l'image (animations de menu) et accumulation pour la
+        # simulation à pas fixe ; une image très lente est plafonnée à
+        # MAX_SIM_STEPS pas de rattrapage
+        dt = clock.tick(RENDER_FPS) / 1000.0
+        sim_accumulator = min(sim_accumulator + dt, MAX_SIM_STEPS * SIM_DT)
         
         # Surface de travail (toujours virtuelle, puis mise a l'echelle si besoin)
         work_surface = virtual_screen
@@ -159,6 +305,15 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
             
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                idle_timer = 0.0
+                if state == "demo":
+                    # Une touche ou un clic arrête la démo
+                    state = "menu"
+                    stop_music()
+                    play_music(audio, "menu")
+                    continue
+            
             # F11 pour basculer plein écran (bonus!)
             if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
                 print("Basculement plein ecran: utilisez le menu Options.")
@@ -226,6 +381,26 @@ def main():
                         stop_music()
                         play_music(audio, "game")
                     
+                    elif result == "start_endless":
+                        # Course sans fin (difficulté croissante)
+                        game.mode = "training"
+                        game.reset_game(level=ENDLESS)
+                        state = "playing"
+                        jo_stage = "ski"
+                        jo_transition_timer = 0.0
+                        stop_music()
+                        play_music(audio, "game")
+                    
+                    elif result == "start_horde":
+                        # Course sans fin poursuivie par une horde de yetis
+                        game.mode = "training"
+                        game.reset_game(level=HORDE)
+                        state = "playing"
+                        jo_stage = "ski"
+                        jo_transition_timer = 0.0
+                        stop_music()
+                        play_music(audio, "game")
+                    
                     elif result == "start_curling":
                         # Lancer le mode curling
                         game.mode = "training"
@@ -254,8 +429,12 @@ def main():
                             menu.training_choice = 1
                         elif buttons["btn_biathlon"].collidepoint(mx, my):
                             menu.training_choice = 2
-                        elif buttons["btn_back"].collidepoint(mx, my):
+                        elif buttons["btn_endless"].collidepoint(mx, my):
                             menu.training_choice = 3
+                        elif buttons["btn_horde"].collidepoint(mx, my):
+                            menu.training_choice = 4
+                        elif buttons["btn_back"].collidepoint(mx, my):
+                            menu.training_choice = 5
 
                 # Options
                 elif state == "options":
@@ -353,7 +532,7 @@ def main():
                     if event.key == pygame.K_RETURN and game.mode == "jo" and jo_stage == "biathlon" and biathlon.game_over:
                         jo_stage = "ski"
                         jo_transition_timer = 0.0
-                        game.data["final_done"] = True
+                        game.state.final_done = True
                         pending_score = jo_pending_score
                         pending_time = jo_pending_time
                         state = "game_over"
@@ -367,29 +546,33 @@ def main():
                 # Game over
                 elif state == "game_over":
                     if event.key == pygame.K_r:
-                        # Rejouer le niveau
-                        game.reset_game(level=game.data["level"])
+                        # Rejouer le niveau (même piste, depuis le snapshot de départ)
+                        game.retry()
+                        state = "playing"
+                        stop_music()
+                        play_music(audio, "game")
+                    
+                    elif event.key == pygame.K_c and game.mode == "training" and game.retry_from_checkpoint():
+                        # Entraînement : reprendre à la dernière porte franchie
                         state = "playing"
-                        game.paused = False
-                        game.game_over = False
                         stop_music()
                         play_music(audio, "game")
                     
                     elif event.key == pygame.K_RETURN:
-                        if game.mode == "jo" and game.data.get("final_done") and pending_score is not None and name_input.strip() == "":
+                        if game.mode == "jo" and game.state.final_done and pending_score is not None and name_input.strip() == "":
                             state = "name_entry"
                         else:
-                            if not game.data.get("win"):
+                            if not game.state.win:
                                 # Rejouer le niveau
-                                game.reset_game(level=game.data["level"])
+                                game.reset_game(level=game.state.level)
                                 state = "playing"
                                 game.paused = False
                                 game.game_over = False
                                 stop_music()
                                 play_music(audio, "game")
-                            elif game.data.get("win") and game.data["level"] < 5:
+                            elif game.state.win and game.state.level < 5:
                                 # Niveau suivant
-                                game.reset_game(level=game.data["level"] + 1)
+                                game.reset_game(level=game.state.level + 1)
                                 state = "playing"
                                 game.paused = False
                                 game.game_over = False
@@ -464,8 +647,12 @@ def main():
                             menu.training_choice = 1
                         elif buttons["btn_biathlon"].collidepoint(mx, my):
                             menu.training_choice = 2
-                        elif buttons["btn_back"].collidepoint(mx, my):
+                        elif buttons["btn_endless"].collidepoint(mx, my):
                             menu.training_choice = 3
+                        elif buttons["btn_horde"].collidepoint(mx, my):
+                            menu.training_choice = 4
+                        elif buttons["btn_back"].collidepoint(mx, my):
+                            menu.training_choice = 5
                 elif state == "options":
                     result = menu.handle_options_menu_input(event)
                     if result == "mouse_click":
@@ -509,59 +696,110 @@ def main():
         # Récupérer les touches pressées
         keys = pygame.key.get_pressed()
         
-        # Mise à jour
-        if state == "playing" and not game.paused:
-            game.update(dt, keys)
-            # Vérifier si le jeu est terminé
-            if game.game_over:
-                # Transition JO vers Curling/Biathlon apres le ski (niveau 5)
-                if game.mode == "jo" and game.data.get("win") and game.data["level"] >= 5 and jo_stage == "ski":
-                    jo_pending_score = game.data["score"]
-                    jo_pending_time = game.data.get("race_time_end")
-                    game.data["final_done"] = False
-                    jo_stage = "curling"
-                    jo_transition_timer = 0.0
-                    curling.reset()
-                    state = "curling"
-                    stop_music()
-                    play_music(audio, "game")
-                else:
-                    state = "game_over"
-                    stop_music()
-                    # Enregistrer le score si mode JO
-                    if game.mode == "jo" and game.data.get("final_done"):
-                        pending_score = game.data["score"]
-                        pending_time = game.data.get("race_time_end")
-                        if name_input.strip() != "":
-                            leaderboard.append((pending_score, name_input.strip(), pending_time))
-                            leaderboard.sort(key=lambda x: x[0], reverse=True)
-                            leaderboard = leaderboard[:5]
-                            pending_score = None
-                            pending_time = None
+        # Mise à jour (pas fixe, plusieurs pas si l'image a été longue)
+        while sim_accumulator >= SIM_DT:
+            sim_accumulator -= SIM_DT
+            if state == "playing" and not game.paused:
+                game.update(SIM_DT, keys)
+                # Vérifier si le jeu est terminé
+                if game.game_over:
+                    # Transition JO vers Curling/Biathlon apres le ski (niveau 5)
+                    if game.mode == "jo" and game.state.win and game.state.level >= 5 and jo_stage == "ski":
+                        jo_pending_score = game.state.score
+                        jo_pending_time = game.state.race_time_end
+                        game.state.final_done = False
+                        jo_stage = "curling"
+                        jo_transition_timer = 0.0
+                        curling.reset()
+                        state = "curling"
+                        stop_music()
+                        play_music(audio, "game")
+                    else:
+                        state = "game_over"
+                        stop_music()
+                        # Enregistrer le score si mode JO
+                        if game.mode == "jo" and game.state.final_done:
+                            pending_score = game.state.score
+                            pending_time = game.state.race_time_end
+                            if name_input.strip() != "":
+                                leaderboard.append((pending_score, name_input.strip(), pending_time))
+                                leaderboard.sort(key=lambda x: x[0], reverse=True)
+                                leaderboard = leaderboard[:5]
+                                pending_score = None
+                                pending_time = None
         
-        elif state == "curling":
-            curling.update(dt, keys)
-            if curling.game_over and game.mode == "jo" and jo_stage == "curling":
-                jo_transition_timer += dt
-                if jo_transition_timer >= 1.0:
-                    jo_stage = "biathlon"
-                    jo_transition_timer = 0.0
-                    biathlon.reset()
-                    state = "biathlon"
+            elif state == "demo":
+                demo_keys.mask = demo_pilot(game)
+                game.update(SIM_DT, demo_keys)
+                if game.game_over:
+                    demo_level = demo_level % 5 + 1
+                    start_demo(game, demo_level)
+            
+            elif state == "curling":
+                curling.update(SIM_DT, keys)
+                if curling.game_over and game.mode == "jo" and jo_stage == "curling":
+                    jo_transition_timer += SIM_DT
+                    if jo_transition_timer >= 1.0:
+                        jo_stage = "biathlon"
+                        jo_transition_timer = 0.0
+                        biathlon.reset()
+                        state = "biathlon"
         
-        elif state == "biathlon":
-            biathlon.update(dt, keys)
-            if biathlon.game_over and game.mode == "jo" and jo_stage == "biathlon":
-                jo_transition_timer += dt
-                if jo_transition_timer >= 1.0:
-                    jo_stage = "ski"
-                    jo_transition_timer = 0.0
-                    game.data["final_done"] = True
-                    pending_score = jo_pending_score
-                    pending_time = jo_pending_time
-                    state = "game_over"
-                    stop_music()
-                    play_music(audio, "menu")
+            elif state == "biathlon":
+                biathlon.update(SIM_DT, keys)
+                if biathlon.game_over and game.mode == "jo" and jo_stage == "biathlon":
+                    jo_transition_timer += SIM_DT
+                    if jo_transition_timer >= 1.0:
+                        jo_stage = "ski"
+                        jo_transition_timer = 0.0
+                        game.state.final_done = True
+                        pending_score = jo_pending_score
+                        pending_time = jo_pending_time
+                        state = "game_over"
+                        stop_music()
+                        play_music(audio, "menu")
+        
+        # Événements du ski des pas de cette image (fusionnés) : sons, compteurs
+        game.events.dispatch()
+        
+        # Démo (attract mode) après un moment sans toucher au menu
+        if state == "menu":
+            idle_timer += dt
+            if idle_timer >= ATTRACT_DELAY:
+                idle_timer = 0.0
+                start_demo(game, demo_level)
+                state = "demo"
+                stop_music()
+                play_music(audio, "game")
+        
+        archive_finished_runs(
+            (game.input_log, game.game_over),
+            (curling.input_log, curling.game_over),
+            (biathlon.input_log, biathlon.game_over),
+        )
+        
+        # Sauvegarde automatique : copie de la session ici (entre deux images,
+        # donc cohérente), écriture sur disque par le fil de l'AutoSaver ;
+        # toujours à la dernière image avant de quitter
+        autosave_timer += dt
+        if autosaver is not None and (autosave_timer >= AUTOSAVE_INTERVAL or not running):
+            autosave_timer = 0.0
+            autosaver.submit(*capture_session({
+                "state": state,
+                "mode": game.mode,
+                "leaderboard": leaderboard,
+                "name_input": name_input,
+                "pending_score": pending_score,
+                "pending_time": pending_time,
+                "jo_pending_score": jo_pending_score,
+                "jo_pending_time": jo_pending_time,
+                "jo_stage": jo_stage,
+                "jo_transition_timer": jo_transition_timer,
+                "volume": volume,
+            }, game, curling, biathlon))
+        
+        # Position du rendu entre les deux derniers pas de simulation
+        alpha = sim_accumulator / SIM_DT
         
         # Affichage
         work_surface.fill(COLOR_BLUE_SKY)
@@ -583,15 +821,20 @@ def main():
             menu.draw_leaderboard(leaderboard)
         
         elif state == "playing":
-            game.draw_game()
+            game.draw_game(alpha)
             if game.paused:
                 menu.draw_pause()
         
+        elif state == "demo":
+            game.draw_game(alpha)
+            label = fonts["medium"].render("DÉMO - appuie sur une touche", True, COLOR_TEXT_DARK)
+            work_surface.blit(label, (SCREEN_WIDTH // 2 - label.get_width() // 2, SCREEN_HEIGHT - 60))
+        
         elif state == "curling":
-            curling.draw()
+            curling.draw(alpha)
         
         elif state == "biathlon":
-            biathlon.draw()
+            biathlon.draw(alpha)
         
         elif state == "game_over":
             game.draw_game()
@@ -639,7 +882,9 @@ def main():
         # Mise à jour de l'affichage
         pygame.display.flip()
     
-    # Fin du jeu
+    # Fin du jeu : la dernière copie (déposée à la dernière image) est écrite avant de quitter
+    if autosaver is not None:
+        autosaver.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,53 @@
+"""
+Masques de collision au pixel près (skieur, sapins, rochers, bonus, blocs de glace)
+
+Les rectangles de collision comptent les coins transparents des sapins
+(triangles), des bonus (ronds) et des rochers (polygones). Avec
+PIXEL_COLLISIONS (config.py), un contact trouvé par les rectangles est
+confirmé sur les pixels opaques des sprites.
+
+Les masques sont construits une seule fois par processus, à partir de
+assets.draw_sprites : ni écran ni fichier, ils servent aussi en headless et
+un replay retrouve les mêmes collisions avec ou sans affichage. Ils ne sont
+lus qu'après un chevauchement des rectangles : le cas courant (rien ne se
+touche) ne coûte rien de plus.
+"""
+
+from functools import lru_cache
+import pygame
+from .assets import draw_sprites
+from .config import GATE_CACHE_SIZE
+
+
+@lru_cache(maxsize=None)
+def sprite_masks():
+    """Masques des sprites : "skier", "rock" (un par variante), "bonus", "speed_boost", "drop", "tree"
+
+    Le skieur a un seul masque, réunion de ses images : l'animation ne
+    tourne pas en headless, la collision ne doit pas en dépendre.
+    """
+    sprites = draw_sprites()
+    skier = pygame.mask.from_surface(sprites["skier"][0])
+    for frame in sprites["skier"][1:]:
+        skier.draw(pygame.mask.from_surface(frame), (0, 0))
+    masks = {"skier": skier, "rock": [pygame.mask.from_surface(rock) for rock in sprites["rock"]]}
+    for name in ("bonus", "speed_boost", "drop", "tree"):
+        masks[name] = pygame.mask.from_surface(sprites[name])
+    return masks
+
+
+@lru_cache(maxsize=GATE_CACHE_SIZE)
+def gate_row_mask(screen_w, left_end, right_start):
+    """Masque d'une rangée de sapins, placé comme _gate_row_surface (entities.py)"""
+    tree = sprite_masks()["tree"]
+    tree_w, tree_h = tree.get_size()
+    mask = pygame.mask.Mask((screen_w, tree_h))
+    for x in range(0, screen_w, tree_w):
+        if x < left_end or x >= right_start:
+            mask.draw(tree, (x, 0))
+    return mask
+
+
+def overlap(mask, x, y, other, other_x, other_y):
+    """Vrai si deux masques placés en (x, y) et (other_x, other_y) ont un pixel opaque en commun"""
+    return mask.overlap(other, (int(other_x) - int(x), int(other_y) - int(y))) is not None
@@ -13,7 +13,7 @@ class Menu:
         self.fonts = fonts
         self.audio = audio
         self.menu_choice = 0  # 0 = MODE JO, 1 = ENTRAINEMENT, 2 = OPTIONS, 3 = CLASSEMENT
-        self.training_choice = 0  # 0 = course, 1 = curling, 2 = biathlon, 3 = retour
+        self.training_choice = 0  # 0 = course, 1 = curling, 2 = biathlon, 3 = sans fin, 4 = horde, 5 = retour
         self.options_choice = 0  # 0 = volume, 1 = fenetre, 2 = retour
         self._mouse_pos = None
         self.snowflakes = self._create_snowflakes(110)
@@ -330,7 +330,7 @@ class Menu:
             )
         
         # Panel
-        panel_w, panel_h = 520, 360
+        panel_w, panel_h = 520, 480
         panel_x = SCREEN_WIDTH // 2 - panel_w // 2
         panel_y = SCREEN_HEIGHT // 2 - panel_h // 2
         
@@ -356,7 +356,7 @@ class Menu:
         )
         
         # Sélection actuelle
-        sel_txt = ["COURSE", "CURLING", "BIATHLON", "RETOUR"][self.training_choice]
+        sel_txt = ["COURSE", "CURLING", "BIATHLON", "SANS FIN", "HORDE", "RETOUR"][self.training_choice]
         sel = self.fonts["small"].render(f"Sélection: {sel_txt}", True, COLOR_BUTTON_PRIMARY)
         self.screen.blit(sel, (panel_x + 40, panel_y + 62))
         
@@ -364,6 +364,8 @@ class Menu:
         btn_train_course = pygame.Rect(panel_x + 40, panel_y + 100, 440, 46)
         btn_train_curling = pygame.Rect(panel_x + 40, panel_y + 160, 440, 46)
         btn_train_biathlon = pygame.Rect(panel_x + 40, panel_y + 220, 440, 46)
+        btn_train_endless = pygame.Rect(panel_x + 40, panel_y + 280, 440, 46)
+        btn_train_horde = pygame.Rect(panel_x + 40, panel_y + 340, 440, 46)
         btn_train_back = pygame.Rect(panel_x + panel_w - 160, panel_y + panel_h - 60, 120, 36)
         
         mouse = self._get_mouse_pos()
@@ -372,6 +374,8 @@ class Menu:
             (btn_train_course, "COURSE", self._draw_icon_course),
             (btn_train_curling, "CURLING", self._draw_icon_curling),
             (btn_train_biathlon, "BIATHLON", self._draw_icon_biathlon),
+            (btn_train_endless, "SANS FIN", self._draw_icon_endless),
+            (btn_train_horde, "HORDE", self._draw_icon_horde),
         ]):
             is_hover = rect.collidepoint(mouse)
             col = COLOR_BUTTON_PRIMARY if self.training_choice == idx or is_hover else COLOR_BUTTON_SECONDARY
@@ -392,13 +396,13 @@ class Menu:
         
         # Bouton retour
         is_hover_back = btn_train_back.collidepoint(mouse)
-        back_col = COLOR_BUTTON_PRIMARY if self.training_choice == 3 or is_hover_back else COLOR_BUTTON_SECONDARY
+        back_col = COLOR_BUTTON_PRIMARY if self.training_choice == 5 or is_hover_back else COLOR_BUTTON_SECONDARY
         pygame.draw.rect(self.screen, back_col, btn_train_back, border_radius=6)
         pygame.draw.rect(
             self.screen,
             COLOR_WHITE,
             btn_train_back,
-            3 if self.training_choice == 3 else 1,
+            3 if self.training_choice == 5 else 1,
             border_radius=6
         )
         back_txt = self.fonts["small"].render("← RETOUR", True, COLOR_TEXT_LIGHT)
@@ -411,6 +415,8 @@ class Menu:
             "btn_course": btn_train_course,
             "btn_curling": btn_train_curling,
             "btn_biathlon": btn_train_biathlon,
+            "btn_endless": btn_train_endless,
+            "btn_horde": btn_train_horde,
             "btn_back": btn_train_back
         }
 
@@ -438,6 +444,20 @@ class Menu:
         pygame.draw.circle(self.screen, COLOR_WHITE, (cx, cy), 10, 2)
         pygame.draw.circle(self.screen, COLOR_WHITE, (cx, cy), 5, 2)
     
+    def _draw_icon_endless(self, rect):
+        """Petit logo 'infini'"""
+        cx = rect.x + 28
+        cy = rect.centery
+        pygame.draw.circle(self.screen, COLOR_WHITE, (cx - 7, cy), 7, 2)
+        pygame.draw.circle(self.screen, COLOR_WHITE, (cx + 7, cy), 7, 2)
+    
+    def _draw_icon_horde(self, rect):
+        """Petit logo 'horde' (trois têtes de yeti)"""
+        cx = rect.x + 28
+        cy = rect.centery
+        for dx, dy in ((-9, 4), (9, 4), (0, -5)):
+            pygame.draw.circle(self.screen, COLOR_WHITE, (cx + dx, cy + dy), 6)
+    
     def draw_pause(self):
         """Affiche l'écran de pause"""
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
@@ -745,7 +765,7 @@ class Menu:
                 self.training_choice = max(0, self.training_choice - 1)
                 return "changed"
             elif event.key == pygame.K_DOWN:
-                self.training_choice = min(3, self.training_choice + 1)
+                self.training_choice = min(5, self.training_choice + 1)
                 return "changed"
             elif event.key == pygame.K_RETURN:
                 if self.training_choice == 0:
@@ -754,6 +774,10 @@ class Menu:
                     return "start_curling"
                 elif self.training_choice == 2:
                     return "start_biathlon"
+                elif self.training_choice == 3:
+                    return "start_endless"
+                elif self.training_choice == 4:
+                    return "start_horde"
                 else:
                     return "back_to_main"
             elif event.key == pygame.K_ESCAPE:
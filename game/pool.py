@@ -0,0 +1,65 @@
+"""
+Réserve d'objets recyclés pour les entités qui apparaissent en continu
+
+Au lieu de créer un Obstacle, une Gate ou un Bonus à chaque apparition (et
+de laisser le ramasse-miettes les détruire), les objets sortis de l'écran
+reviennent dans la réserve et sont réinitialisés à la prochaine apparition.
+Les statistiques (pic d'utilisation, taux de réussite) servent à régler la
+taille des réserves par niveau (LEVEL_SETTINGS[...]["pools"]).
+"""
+
+
+class EntityPool:
+    """Réserve d'objets d'une classe ayant une méthode reset(*args)
+
+    factory() sans argument doit créer un objet vide (utilisé pour pré-remplir).
+    """
+
+    def __init__(self, factory, size=0):
+        self.factory = factory
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0
+        self.hits = 0
+        self.misses = 0
+        self.reserve(size)
+
+    def reserve(self, size):
+        """Pré-remplit la réserve jusqu'à size objets (libres + utilisés)"""
+        while len(self.free) + self.in_use < size:
+            self.free.append(self.factory())
+
+    def acquire(self, *args):
+        """Retourne un objet réinitialisé avec args (recyclé si possible)"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.hits += 1
+        else:
+            obj = self.factory(*args)
+            self.misses += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """Rend un objet à la réserve"""
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def reset_stats(self):
+        self.high_water = self.in_use
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "size": len(self.free) + self.in_use,
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 1.0,
+        }
@@ -0,0 +1,293 @@
+"""
+Enregistrement compact des entrées et rejeu déterministe des parties
+
+Une partie = une graine + le masque de touches de chaque pas de simulation.
+Format binaire (.wrr) :
+    b"WRR" | version | mode | niveau | graine | SIM_HZ | nombre d'entrées
+    puis des paires (répétitions, masque XOR masque précédent) en varint.
+
+Masque d'un pas : bits 0-7 = touches maintenues, bits 8-15 = touches
+enfoncées pendant ce pas (ESPACE, R...), bit 16 = pas sans mise à jour
+(deux appuis sur la même touche avant un seul pas).
+
+Rejeu:
+    python -m game.replay replays/ski_xxx.wrr          (sans affichage)
+    python -m game.replay replays/ski_xxx.wrr --show   (à l'écran)
+"""
+
+import argparse
+import os
+import time
+import pygame
+from .config import *
+from .inputs import KeyState, KEY_BITS
+
+MAGIC = b"WRR"
+# à augmenter quand les règles de la simulation changent : un ancien journal
+# ne rejouerait plus la même partie (2 : caméra et coordonnées de piste,
+# horde de yetis, contact yeti compté au premier pas, collisions au pixel ;
+# 3 : portes vérifiées avec les blocs de glace du drone)
+VERSION = 3
+MODES = ("ski", "curling", "biathlon")
+
+EDGE_SHIFT = 8
+EVENTS_ONLY = 1 << 16
+HELD_MASK = 0xFF
+
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "replays")
+
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class InputLog:
+    """Journal des entrées d'une partie (en mémoire, encodé au fil de l'eau)"""
+
+    def __init__(self, mode, seed, level=0, sim_hz=SIM_HZ):
+        self.mode = mode
+        self.seed = seed
+        self.level = level
+        self.sim_hz = sim_hz
+        self.runs = []  # [masque, répétitions]
+        self.steps = 0
+        self.saved = False
+
+    def record(self, mask):
+        """Ajoute le masque d'un pas de simulation"""
+        self.steps += 1
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+
+    def truncated(self, steps):
+        """Copie du journal limitée à ses steps premiers pas (reprise d'un snapshot)"""
+        log = InputLog(self.mode, self.seed, self.level, self.sim_hz)
+        remaining = steps
+        for mask, count in self.runs:
+            if remaining <= 0:
+                break
+            take = min(count, remaining)
+            log.runs.append([mask, take])
+            remaining -= take
+        log.steps = steps - remaining
+        return log
+
+    def masks(self):
+        """Itère sur les masques, un par pas enregistré"""
+        for mask, count in self.runs:
+            for _ in range(count):
+                yield mask
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        out.append(MODES.index(self.mode))
+        for value in (self.level, self.seed, self.sim_hz, len(self.runs)):
+            _write_varint(out, value)
+        prev = 0
+        for mask, count in self.runs:
+            _write_varint(out, count)
+            _write_varint(out, mask ^ prev)
+            prev = mask
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:3] != MAGIC:
+            raise ValueError("fichier de replay invalide")
+        if data[3] != VERSION:
+            raise ValueError(f"version de replay non supportée : {data[3]}")
+        mode = MODES[data[4]]
+        pos = 5
+        level, pos = _read_varint(data, pos)
+        seed, pos = _read_varint(data, pos)
+        sim_hz, pos = _read_varint(data, pos)
+        run_count, pos = _read_varint(data, pos)
+        log = cls(mode, seed, level, sim_hz)
+        prev = 0
+        for _ in range(run_count):
+            count, pos = _read_varint(data, pos)
+            delta, pos = _read_varint(data, pos)
+            prev ^= delta
+            log.runs.append([prev, count])
+            log.steps += count
+        return log
+
+    def save(self, directory=REPLAY_DIR):
+        """Archive le journal dans directory et retourne le chemin du fichier"""
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory, f"{self.mode}_{stamp}_{self.seed}.wrr")
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        self.saved = True
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class EdgeRecorder:
+    """Enregistre les appuis de touches (KEYDOWN) des mini-jeux entre deux pas"""
+
+    def __init__(self, log):
+        self.log = log
+        self.pending = 0
+
+    def key_down(self, key):
+        bit = KEY_BITS.get(key, 0) << EDGE_SHIFT
+        if not bit:
+            return
+        if self.pending & bit:
+            # deuxième appui avant le prochain pas : entrée sans mise à jour
+            self.log.record(self.pending | EVENTS_ONLY)
+            self.pending = 0
+        self.pending |= bit
+
+    def step(self, held):
+        """A appeler à chaque pas de mise à jour"""
+        self.log.record(held | self.pending)
+        self.pending = 0
+
+
+def key_mask(keys):
+    """Masque des touches maintenues (KeyState ou tableau pygame)"""
+    if isinstance(keys, KeyState):
+        return keys.mask & HELD_MASK
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+def _key_events(edges):
+    for key, bit in KEY_BITS.items():
+        if edges & bit:
+            yield pygame.event.Event(pygame.KEYDOWN, key=key, unicode="", mod=0)
+
+
+def make_runner(log, screen=None, images=None, audio=None, fonts=None):
+    """Crée le jeu correspondant au journal, prêt à être rejoué"""
+    if log.mode == "ski":
+        from .game_manager import GameManager
+        game = GameManager(screen, images, audio, fonts)
+        game.reset_game(level=log.level, seed=log.seed)
+    elif log.mode == "curling":
+        from .curling import CurlingGame
+        game = CurlingGame(screen, fonts, audio)
+    else:
+        from .biathlon import BiathlonGame
+        game = BiathlonGame(screen, fonts, audio, seed=log.seed)
+    return game
+
+
+def replay_step(game, mode, mask, dt):
+    """Rejoue un pas : appuis de touches puis mise à jour"""
+    if mode != "ski":
+        for event in _key_events(mask >> EDGE_SHIFT):
+            game.handle_input(event)
+        if mask & EVENTS_ONLY:
+            return
+    game.update(dt, KeyState(mask & HELD_MASK))
+    if mode == "ski":
+        game.events.dispatch()
+
+
+def replay_headless(log):
+    """Rejoue le journal sans affichage et retourne le jeu dans son état final"""
+    dt = 1.0 / log.sim_hz
+    game = make_runner(log)
+    for mask in log.masks():
+        replay_step(game, log.mode, mask, dt)
+    return game
+
+
+def summary(game, mode):
+    """Résultat lisible d'une partie rejouée"""
+    if mode == "ski":
+        return game.outcome()
+    if mode == "curling":
+        return {"done": game.game_over, "best_score": game.best_score, "throws_left": game.throws_left}
+    return {"done": game.game_over, "hits": game.hits, "shots_left": game.shots_left}
+
+
+def replay_on_screen(log):
+    """Rejoue le journal dans une fenêtre, au rythme de la simulation"""
+    from .assets import ensure_assets, load_images
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"{GAME_TITLE} - replay {log.mode} #{log.seed}")
+    fonts = {
+        "small": pygame.font.SysFont(FONT_NAME, FONT_SIZE_SMALL),
+        "medium": pygame.font.SysFont(FONT_NAME, FONT_SIZE_MEDIUM),
+        "big": pygame.font.SysFont(FONT_NAME, FONT_SIZE_MEDIUM),
+        "title": pygame.font.SysFont(FONT_NAME, FONT_SIZE_LARGE, bold=True),
+    }
+    images = load_images(ensure_assets()) if log.mode == "ski" else None
+    game = make_runner(log, screen, images, None, fonts)
+    dt = 1.0 / log.sim_hz
+    masks = log.masks()
+    clock = pygame.time.Clock()
+    accumulator = 0.0
+    finished = False
+    running = True
+    while running:
+        accumulator = min(accumulator + clock.tick(RENDER_FPS) / 1000.0, MAX_SIM_STEPS * dt)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        while accumulator >= dt and not finished:
+            accumulator -= dt
+            mask = next(masks, None)
+            if mask is None:
+                finished = True
+            else:
+                replay_step(game, log.mode, mask, dt)
+        alpha = 1.0 if finished else accumulator / dt
+        if log.mode == "ski":
+            game.draw_game(alpha)
+        else:
+            game.draw(alpha)
+        pygame.display.flip()
+    pygame.quit()
+    return game
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rejeu d'une partie enregistrée")
+    parser.add_argument("path")
+    parser.add_argument("--show", action="store_true", help="rejouer à l'écran")
+    args = parser.parse_args(argv)
+
+    log = InputLog.load(args.path)
+    print(f"{log.mode} | graine {log.seed} | niveau {log.level} | {log.steps} pas | {len(log.to_bytes())} octets")
+    game = replay_on_screen(log) if args.show else replay_headless(log)
+    print(summary(game, log.mode))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Flux aléatoires indépendants pour le gameplay
+
+Chaque partie possède une graine ; chaque sous-système (apparitions, drone,
+yetis, neige, cibles...) tire dans son propre flux dérivé de cette graine.
+Une même graine redonne donc exactement la même partie, et plusieurs
+simulations dans le même processus ne se perturbent pas.
+"""
+
+import random
+
+SEED_BITS = 31
+
+_seed_source = random.SystemRandom()
+
+
+def new_seed():
+    """Tire une graine au hasard pour une nouvelle partie"""
+    return _seed_source.getrandbits(SEED_BITS)
+
+
+def make_rng(seed, stream):
+    """Flux aléatoire dérivé d'une graine et d'un nom de sous-système"""
+    # une graine str est hachée (sha512) : stable d'une machine à l'autre
+    return random.Random(f"{seed}:{stream}")
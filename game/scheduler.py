@@ -0,0 +1,53 @@
+"""
+Planificateur d'apparitions (file de priorité)
+
+Chaque apparition (rocher, porte, bonus, bloc de glace, ligne d'arrivée) est
+un événement daté en temps de course. À chaque pas, on ne retire que les
+événements arrivés à échéance : aucun test par type d'entité et par image,
+et un grand pas de temps ne fait rien perdre (tous les événements en retard
+sont traités, dans l'ordre).
+
+Les paramètres d'une apparition (position, trou d'une porte...) sont tirés
+au moment où elle est planifiée : preview() montre donc ce qui va arriver.
+"""
+
+import heapq
+
+
+class SpawnScheduler:
+    """Événements (temps, type, données) triés par temps"""
+
+    def __init__(self):
+        self.heap = []
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def clear(self):
+        self.heap.clear()
+        self.seq = 0
+
+    def schedule(self, time, kind, payload=None):
+        """Planifie l'événement kind au temps time (secondes de course)"""
+        # seq départage deux événements au même temps (ordre de planification)
+        heapq.heappush(self.heap, (time, self.seq, kind, payload))
+        self.seq += 1
+
+    def next_time(self):
+        """Temps du prochain événement (None si la file est vide)"""
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        """Retire et donne les événements dus (temps <= now), dans l'ordre
+
+        Un événement planifié pendant l'itération et déjà dû est aussi donné.
+        """
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            time, _, kind, payload = heapq.heappop(heap)
+            yield time, kind, payload
+
+    def preview(self, until):
+        """Événements prévus jusqu'au temps until, sans les retirer"""
+        return [(time, kind, payload) for time, _, kind, payload in sorted(self.heap) if time <= until]
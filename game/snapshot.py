@@ -0,0 +1,270 @@
+"""
+Sauvegarde instantanée (snapshot) de l'état complet d'une course de ski
+
+Format binaire compact (petit-boutiste, module struct) :
+    b"WSS" | version | champs simples de SkiState | joueur | drone | yetis (colonnes)
+    | obstacles, blocs de glace, portes, bonus (colonnes) | ligne d'arrivée
+    | flocons | planificateur | position dans la course (timeline) | neige | pause / fin
+    | pas joués | compteurs d'événements
+
+Restaurer un snapshot redonne exactement la même suite de la course (la
+course pré-générée se retrouve par sa graine, les générateurs aléatoires du
+drone et des yetis font partie de l'état) : c'est ce qui sert au
+« rejouer » instantané et à la reprise à la dernière porte.
+"""
+
+import math
+import struct
+import numpy as np
+from .entity_store import KIND_ROCK, KIND_DRONE_DROP, KIND_NAMES
+from .replay import InputLog
+from .events import EVENT_TYPES
+from .yetis import FIELDS as YETI_FIELDS
+from . import timeline
+
+MAGIC = b"WSS"
+VERSION = 7
+
+# formats struct des champs simples, dans l'ordre de SkiState.SCALARS
+# (race_time_end vaut NaN quand il n'est pas encore connu)
+SCALAR_FORMAT = "<iq?idddddddiddd???"
+
+PLAYER_FIELDS = ("x", "y", "prev_x", "prev_y", "base_speed", "speed", "boost_timer", "slow_timer",
+                 "freeze_timer", "frame_timer", "moonwalk", "sway_t")
+DRONE_FIELDS = ("x", "prev_x", "base_x", "y", "t")
+SNOW_FIELDS = ("x", "y", "px", "py", "spd", "drift", "r")
+
+STORES = ("obstacles", "drops", "gates", "bonuses")
+EVENTS = ("rock", "gate", "bonus", "drop", "finish")
+BONUS_KINDS = ("moonwalk", "speed")
+
+
+class _Writer:
+    def __init__(self):
+        self.buf = bytearray(MAGIC)
+        self.buf.append(VERSION)
+
+    def pack(self, fmt, *values):
+        self.buf += struct.pack("<" + fmt, *values)
+
+    def fields(self, obj, names):
+        self.pack(f"{len(names)}d", *(getattr(obj, name) for name in names))
+
+    def rng(self, rng):
+        version, internal, gauss = rng.getstate()
+        self.pack("625Id", *internal, math.nan if gauss is None else gauss)
+
+    def array(self, values):
+        self.buf += values.tobytes()
+
+
+class _Reader:
+    def __init__(self, data):
+        if data[:3] != MAGIC:
+            raise ValueError("snapshot invalide")
+        if data[3] != VERSION:
+            raise ValueError(f"version de snapshot non supportée : {data[3]}")
+        self.data = data
+        self.pos = 4
+
+    def unpack(self, fmt):
+        fmt = "<" + fmt
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return values
+
+    def one(self, fmt):
+        return self.unpack(fmt)[0]
+
+    def fields(self, obj, names):
+        for name, value in zip(names, self.unpack(f"{len(names)}d")):
+            setattr(obj, name, value)
+
+    def rng(self, rng):
+        values = self.unpack("625Id")
+        gauss = values[-1]
+        rng.setstate((3, values[:-1], None if math.isnan(gauss) else gauss))
+
+    def array(self, dtype, n):
+        values = np.frombuffer(self.data, dtype=dtype, count=n, offset=self.pos)
+        self.pos += values.nbytes
+        return values
+
+
+def take(game):
+    """Snapshot binaire de la course en cours (GameManager)"""
+    state = game.state
+    out = _Writer()
+
+    scalars = list(state.scalars())
+    end_index = state.SCALARS.index("race_time_end")
+    if scalars[end_index] is None:
+        scalars[end_index] = math.nan
+    out.buf += struct.pack(SCALAR_FORMAT, *scalars)
+
+    out.pack("i", state.player.frame_index)
+    out.fields(state.player, PLAYER_FIELDS)
+    out.fields(state.drone, DRONE_FIELDS)
+    out.rng(state.drone.rng)
+    yetis = state.yetis
+    out.pack("I", len(yetis))
+    out.array(yetis.frame_index.astype("<i4"))
+    out.array(yetis.contact)
+    for name in YETI_FIELDS:
+        out.array(getattr(yetis, name).astype("<f8", copy=False))
+    out.rng(yetis.rng)
+
+    # entités : colonnes des lignes vivantes, puis ce qui n'est pas en colonne
+    for name in STORES:
+        store = game.stores[name]
+        rows = store.indices()
+        out.pack("I", len(rows))
+        for column, dtype in ((store.x, "<f8"), (store.y, "<f8"), (store.prev_y, "<f8"),
+                              (store.speed, "<f8"), (store.kind, "i1"), (store.variant, "i1")):
+            out.array(column[rows].astype(dtype, copy=False))
+        if name == "gates":
+            for i in rows:
+                gate = store.items[i]
+                out.pack("ii?", gate.gap_x, gate.gap_w, gate.passed)
+
+    finish = state.finish_line
+    if finish is None:
+        out.pack("?", False)
+    else:
+        out.pack("?dii", True, finish["y"], finish["gap_x"], finish["gap_w"])
+
+    out.pack("I", len(state.snowflakes))
+    for f in state.snowflakes:
+        out.pack("7d", f["x"], f["y"], f.get("px", f["x"]), f.get("py", f["y"]), f["spd"], f["drift"], f["r"])
+
+    scheduler = game.scheduler
+    out.pack("qI", scheduler.seq, len(scheduler.heap))
+    for time, seq, kind, payload in scheduler.heap:
+        out.pack("dqB", time, seq, EVENTS.index(kind))
+        if kind in ("rock", "gate"):
+            out.pack("ii", *payload)
+        elif kind == "bonus":
+            out.pack("iB", payload[0], BONUS_KINDS.index(payload[1]))
+    out.pack("I", game.timeline_pos)
+
+    out.rng(game.snow_rng)
+    out.pack("??q", game.paused, game.game_over, game.input_log.steps)
+
+    # compteurs, y compris les événements du pas pas encore distribués (le
+    # point de reprise est pris avant le dispatch, et restore les efface)
+    counts = dict(game.event_counts.counts)
+    for event in game.events.pending.values():
+        counts[event.type] += event.count
+    out.pack(f"{len(EVENT_TYPES)}q", *(counts[name] for name in EVENT_TYPES))
+    return bytes(out.buf)
+
+
+def restore(game, data):
+    """Remet la course dans l'état du snapshot data
+
+    La course en cours doit avoir le même nombre de yetis (même niveau) ;
+    sinon elle est d'abord reconstruite avec reset_game.
+    """
+    src = _Reader(data)
+    scalars = list(struct.unpack_from(SCALAR_FORMAT, data, src.pos))
+    src.pos += struct.calcsize(SCALAR_FORMAT)
+    state = game.state
+    level, seed = scalars[0], scalars[1]
+    if state is None or state.level != level:
+        # reset_game repart d'un journal vide : on garde celui de l'appelant
+        log = game.input_log
+        game.reset_game(level=level, seed=seed)
+        game.input_log = log
+        state = game.state
+    elif game.timeline.seed != seed:
+        # même niveau, autre course
+        game.seed = seed
+        game.timeline = timeline.build(level, seed, game.check_gates)
+    end_index = state.SCALARS.index("race_time_end")
+    if math.isnan(scalars[end_index]):
+        scalars[end_index] = None
+    state.set_scalars(scalars)
+
+    player = state.player
+    player.frame_index = src.one("i")
+    src.fields(player, PLAYER_FIELDS)
+    player.sync_rect()
+    src.fields(state.drone, DRONE_FIELDS)
+    src.rng(state.drone.rng)
+    yetis = state.yetis
+    yeti_count = src.one("I")
+    if yeti_count != len(yetis):
+        raise ValueError("snapshot d'un autre niveau (nombre de yetis)")
+    yetis.frame_index[:] = src.array("<i4", yeti_count)
+    yetis.contact[:] = src.array("?", yeti_count)
+    for name in YETI_FIELDS:
+        getattr(yetis, name)[:] = src.array("<f8", yeti_count)
+    src.rng(yetis.rng)
+
+    for name in STORES:
+        store = game.stores[name]
+        store.clear()
+        n = src.one("I")
+        xs = src.array("<f8", n).tolist()
+        ys = src.array("<f8", n).tolist()
+        prev_ys = src.array("<f8", n).tolist()
+        speeds = src.array("<f8", n).tolist()
+        kinds = src.array("i1", n).tolist()
+        variants = src.array("i1", n).tolist()
+        for j in range(n):
+            kind = kinds[j]
+            variant = variants[j]
+            if name == "gates":
+                gap_x, gap_w, passed = src.unpack("ii?")
+                i = store.spawn(xs[j], ys[j], speeds[j], kind, variant, *game._gate_args(gap_x, gap_w))
+                store.items[i].passed = passed
+            elif kind == KIND_ROCK:
+                i = store.spawn(xs[j], ys[j], speeds[j], kind, variant, *game._rock_args(variant))
+            elif kind == KIND_DRONE_DROP:
+                i = store.spawn(xs[j], ys[j], speeds[j], kind, variant, *game._drop_args())
+            else:
+                i = store.spawn(xs[j], ys[j], speeds[j], kind, variant, *game._bonus_args(KIND_NAMES[kind]))
+            store.prev_y[i] = prev_ys[j]
+
+    if src.one("?"):
+        y, gap_x, gap_w = src.unpack("dii")
+        state.finish_line = {"y": y, "gap_x": gap_x, "gap_w": gap_w}
+    else:
+        state.finish_line = None
+
+    flake_count = src.one("I")
+    flakes = state.snowflakes
+    del flakes[flake_count:]
+    while len(flakes) < flake_count:
+        flakes.append({})
+    for f in flakes:
+        f.update(zip(SNOW_FIELDS, src.unpack("7d")))
+
+    scheduler = game.scheduler
+    seq, event_count = src.unpack("qI")
+    heap = []
+    for _ in range(event_count):
+        time, event_seq, kind_index = src.unpack("dqB")
+        kind = EVENTS[kind_index]
+        payload = None
+        if kind in ("rock", "gate"):
+            payload = src.unpack("ii")
+        elif kind == "bonus":
+            x, bonus_index = src.unpack("iB")
+            payload = (x, BONUS_KINDS[bonus_index])
+        heap.append((time, event_seq, kind, payload))
+    # le tas a été écrit dans son ordre interne : c'est déjà un tas valide
+    scheduler.heap = heap
+    scheduler.seq = seq
+    game.timeline_pos = src.one("I")
+    game.timeline.seek(game.timeline_pos)
+
+    src.rng(game.snow_rng)
+    game.paused, game.game_over, steps = src.unpack("??q")
+    # événements de la course abandonnée : plus rien à jouer
+    game.events.clear()
+    game.event_counts.counts.update(zip(EVENT_TYPES, src.unpack(f"{len(EVENT_TYPES)}q")))
+    if game.input_log is None or game.input_log.seed != state.seed or game.input_log.steps < steps:
+        game.input_log = InputLog("ski", state.seed, state.level)
+    else:
+        game.input_log = game.input_log.truncated(steps)
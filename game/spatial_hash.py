@@ -0,0 +1,109 @@
+"""
+Grille de hachage spatial pour les collisions du ski (phase large)
+
+L'écran est découpé en cases carrées de GRID_CELL pixels. Chaque entité est
+rangée dans les cases que touche son rectangle ; une requête ne regarde que
+les cases du rectangle demandé, donc son coût dépend de la zone interrogée
+et pas du nombre total d'entités.
+
+Les clés sont des paires (couche, indice), par exemple ("obstacles", 3)
+pour la ligne 3 de l'EntityStore des obstacles.
+"""
+
+from .config import GRID_CELL
+
+
+class SpatialHash:
+    """Grille uniforme, reconstruite à chaque pas de simulation"""
+
+    def __init__(self, cell_size=GRID_CELL):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = {}
+        self.used = []  # cases remplies depuis le dernier clear()
+
+    def clear(self):
+        # les listes des cases sont gardées (pas de réallocation d'un pas à
+        # l'autre) ; seules celles remplies à ce pas sont vidées
+        for bucket in self.used:
+            bucket.clear()
+        self.used.clear()
+        self.rects.clear()
+
+    def _cell_range(self, left, top, right, bottom):
+        size = self.cell_size
+        return (
+            range(left // size, (right - 1) // size + 1),
+            range(top // size, (bottom - 1) // size + 1),
+        )
+
+    def insert(self, key, left, top, right, bottom):
+        """Range key dans les cases touchées par le rectangle (bords en pixels entiers)"""
+        if right <= left or bottom <= top:
+            return
+        self.rects[key] = (left, top, right, bottom)
+        cols, rows = self._cell_range(left, top, right, bottom)
+        cells = self.cells
+        for cy in rows:
+            for cx in cols:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = []
+                if not bucket:
+                    self.used.append(bucket)
+                bucket.append(key)
+
+    def insert_rect(self, key, rect):
+        self.insert(key, rect.left, rect.top, rect.right, rect.bottom)
+
+    def insert_store(self, layer, store, offset_y=0.0):
+        """Range toutes les lignes d'un EntityStore sous les clés (layer, i)
+
+        offset_y passe des coordonnées du stockage à celles de la grille
+        (par exemple -camera_y pour l'écran). Même règle que
+        pygame.Rect(int(x), int(y), w, h).
+        """
+        head, end = store.head, store.count
+        alive = store.alive[head:end].tolist()
+        xs = store.x[head:end].tolist()
+        ys = (store.y[head:end] + offset_y).tolist()
+        ws = store.w[head:end].tolist()
+        hs = store.h[head:end].tolist()
+        for j in range(end - head):
+            if alive[j]:
+                left = int(xs[j])
+                top = int(ys[j])
+                self.insert((layer, head + j), left, top, left + ws[j], top + hs[j])
+
+    def query(self, left, top, right, bottom, layer=None):
+        """Clés des entités dont le rectangle touche (left, top, right, bottom)
+
+        Le résultat est trié (ordre d'apparition dans chaque couche).
+        """
+        if right <= left or bottom <= top:
+            return []
+        cols, rows = self._cell_range(left, top, right, bottom)
+        cells = self.cells
+        found = set()
+        for cy in rows:
+            for cx in cols:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        rects = self.rects
+        hits = []
+        for key in found:
+            if layer is not None and key[0] != layer:
+                continue
+            l, t, r, b = rects[key]
+            if l < right and r > left and t < bottom and b > top:
+                hits.append(key)
+        hits.sort()
+        return hits
+
+    def query_rect(self, rect, layer=None):
+        return self.query(rect.left, rect.top, rect.right, rect.bottom, layer)
+
+    def indices(self, rect, layer):
+        """Indices (dans la couche layer) des entités qui touchent rect"""
+        return [i for _, i in self.query_rect(rect, layer)]
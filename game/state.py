@@ -0,0 +1,75 @@
+"""
+État d'une course de ski
+
+Tout ce qui change pendant une course est ici, dans des champs fixes
+(__slots__) : c'est la seule source de vérité du GameManager, pour
+l'affichage, les bots, les replays et les sauvegardes.
+"""
+
+
+class SkiState:
+    """État complet d'une course (remplace l'ancien dictionnaire data)"""
+
+    __slots__ = (
+        # entités
+        "player", "drone", "yetis", "obstacles", "gates", "bonuses", "drops",
+        "finish_line", "snowflakes",
+        # course
+        "level", "seed", "yeti_active", "score", "speed", "max_speed",
+        "camera_y", "camera_prev", "race_time", "race_time_end",
+        "finish_time", "finish_score", "distance_left", "distance_total", "distance_scale",
+        "final_done", "finish_passed", "win",
+    )
+
+    # champs simples (nombres, booléens) : copiés tels quels par clone()
+    SCALARS = (
+        "level", "seed", "yeti_active", "score", "speed", "max_speed",
+        "camera_y", "camera_prev", "race_time", "race_time_end",
+        "finish_time", "finish_score", "distance_left", "distance_total", "distance_scale",
+        "final_done", "finish_passed", "win",
+    )
+
+    def __init__(self, player, drone, yetis, obstacles, gates, bonuses, drops, snowflakes, level=1, seed=0):
+        self.player = player
+        self.drone = drone
+        self.yetis = yetis  # Yetis (colonnes, voir yetis.py)
+        self.obstacles = obstacles
+        self.gates = gates
+        self.bonuses = bonuses
+        self.drops = drops
+        self.finish_line = None  # dict {"y", "gap_x", "gap_w"} en coordonnées de piste, ou None
+        self.snowflakes: list = snowflakes
+
+        self.level: int = level
+        self.seed: int = seed
+        self.yeti_active: bool = len(yetis) > 0  # niveaux 2 à 5, sans fin, horde
+        self.score: int = 0
+        self.speed: float = 130.0
+        self.max_speed: float = 260.0
+        self.camera_y: float = 0.0
+        self.camera_prev: float = 0.0
+        self.race_time: float = 0.0
+        self.race_time_end = None  # float une fois la ligne franchie
+        self.finish_time: float = 25.0
+        self.finish_score: int = 100
+        self.distance_left: float = 0.0
+        self.distance_total: float = 0.0
+        self.distance_scale: float = 0.0
+        self.final_done: bool = False
+        self.finish_passed: bool = False
+        self.win: bool = False
+
+    def scalars(self):
+        """Valeurs des champs simples, dans l'ordre de SCALARS"""
+        return tuple(getattr(self, name) for name in self.SCALARS)
+
+    def set_scalars(self, values):
+        for name, value in zip(self.SCALARS, values):
+            setattr(self, name, value)
+
+    def clone(self):
+        """Copie superficielle : les champs simples sont copiés, les entités partagées"""
+        other = SkiState.__new__(SkiState)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
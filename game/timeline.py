@@ -0,0 +1,475 @@
+"""
+Course pré-générée d'un niveau (timeline)
+
+Toute la course est tirée d'avance, d'après la graine et LEVEL_SETTINGS :
+rochers (position, forme), portes (trou, vérifié par course_check.py), bonus
+(position, type), longueur de piste et place de la ligne d'arrivée. Le
+GameManager ne tire plus rien pendant la partie : il lit la timeline au fil
+de la course et ne confie au planificateur que les apparitions des
+TIMELINE_AHEAD prochaines secondes.
+
+La génération n'utilise que les tailles de référence des sprites
+(SPRITE_SIZES) et les flux aléatoires "spawn" et "drone" de la graine
+(hachage stable ; le second seulement pour prévoir les blocs de glace) :
+une même graine donne la même course sur toutes les machines, quelles que
+soient les images chargées. On peut donc partager une course par sa graine
+(daily_seed : défi du jour) ou par son fichier (.wtl, quelques centaines
+d'octets) :
+
+    python -m game.timeline --level 3 --daily
+    python -m game.timeline --level 3 --seed 42 --out course.wtl
+
+Le niveau ENDLESS (0) est une course sans fin (EndlessCourse) : la difficulté
+monte d'un niveau toutes les ENDLESS_LEVEL_TIME secondes, au-delà du niveau 5
+(level_settings), et la course est générée par morceaux de CHUNK_SECONDS
+juste devant la caméra. Chaque pas ne tire que quelques apparitions
+(CHUNK_WORK) et les morceaux déjà joués sont libérés : mémoire et coût par
+image restent les mêmes du début à la fin d'une longue partie. Le mode
+HORDE joue la même course, avec une horde de yetis.
+
+Format (.wtl) :
+    b"WTL" | version | niveau | graine | distance | trou de l'arrivée
+    | nombre d'événements | événements (EVENT_DTYPE)
+"""
+
+import argparse
+import datetime
+import hashlib
+import heapq
+import math
+import struct
+from collections import deque
+import numpy as np
+from .config import SCREEN_WIDTH, LEVEL_SETTINGS, COURSE_CHECK, COURSE_CHECK_LOSS, ENDLESS_LEVEL_TIME
+from .assets import SPRITE_SIZES, ROCK_VARIANTS
+from .rng import make_rng, SEED_BITS
+from . import course_check
+
+MAGIC = b"WTL"
+VERSION = 1
+HEADER_FORMAT = "<BqiiI"
+
+ROCK_INTERVAL = 1.2  # secondes entre deux rochers
+SPEED_RAMP = 4.0  # accélération de la piste (px/s par seconde)
+GATE_ATTEMPTS = 8  # tirages d'un trou de porte avant de le recentrer (course_check.py)
+FINISH_GAP = 280  # largeur du passage de la ligne d'arrivée
+PLAYER_SPEED = 4  # Player.base_speed (px par pas)
+END_MARGIN = 4.0  # secondes générées après l'arrivée prévue (la ligne doit encore descendre)
+TIMELINE_AHEAD = 6.0  # secondes d'avance confiées au planificateur (aperçu du pilote)
+
+# course sans fin
+ENDLESS = 0  # numéro de niveau du mode sans fin
+HORDE = 100  # mode horde : la course sans fin, poursuivie par HORDE_SIZE yetis
+ENDLESS_START = 1.0  # difficulté au départ (niveau 1)
+CHUNK_SECONDS = 10.0  # longueur d'un morceau de course
+CHUNK_WORK = 4  # apparitions tirées au plus par pas (un morceau en compte ~40)
+CHUNK_AHEAD = 2  # morceaux prêts d'avance devant la caméra
+# au-delà du dernier niveau, les paramètres sont prolongés jusqu'à ces bornes
+ENDLESS_MAX_SPEED = 400
+ENDLESS_MIN_GATE = (0.9, 1.3)
+ENDLESS_MIN_BONUS = (1.5, 3.0)
+ENDLESS_MAX_EXTRA_GATE = 0.6
+ENDLESS_MIN_ROCK_INTERVAL = 0.7
+
+# types d'événements : (a, b) = (x, forme) d'un rocher, (gap_x, gap_w) d'une
+# porte, (x, BONUS_KINDS) d'un bonus
+KINDS = ("rock", "gate", "bonus")
+BONUS_KINDS = ("moonwalk", "speed")
+EVENT_DTYPE = np.dtype([("time", "<f8"), ("kind", "u1"), ("a", "<i2"), ("b", "<i2")])
+
+
+def _level_value(level, key):
+    """Valeur d'un paramètre pour un niveau fractionnaire (voir level_settings)"""
+    top = max(LEVEL_SETTINGS)
+    low = min(max(int(level), 1), top - 1)
+    a = LEVEL_SETTINGS[low][key]
+    b = LEVEL_SETTINGS[low + 1][key]
+    f = level - low
+    if isinstance(a, tuple):
+        return tuple(x + (y - x) * f for x, y in zip(a, b))
+    return a + (b - a) * f
+
+
+def level_settings(level):
+    """Paramètres d'un niveau, même fractionnaire (mode sans fin)
+
+    Un niveau entier de LEVEL_SETTINGS est rendu tel quel. Entre deux
+    niveaux, les valeurs sont interpolées ; au-delà du dernier, elles suivent
+    la pente des deux derniers niveaux, bornée par les ENDLESS_xxx.
+    """
+    if level in LEVEL_SETTINGS:
+        return LEVEL_SETTINGS[level]
+    top = max(LEVEL_SETTINGS)
+    cfg = {key: _level_value(level, key) for key in LEVEL_SETTINGS[top] if key != "pools"}
+    cfg["pools"] = LEVEL_SETTINGS[top]["pools"]
+    if level > top:
+        cfg["max_speed"] = min(cfg["max_speed"], ENDLESS_MAX_SPEED)
+        cfg["gate_range"] = tuple(max(v, low) for v, low in zip(cfg["gate_range"], ENDLESS_MIN_GATE))
+        cfg["bonus_range"] = tuple(max(v, low) for v, low in zip(cfg["bonus_range"], ENDLESS_MIN_BONUS))
+        cfg["extra_gate"] = min(cfg["extra_gate"], ENDLESS_MAX_EXTRA_GATE)
+        cfg["rock_interval"] = max(ENDLESS_MIN_ROCK_INTERVAL, ROCK_INTERVAL - 0.1 * (level - top))
+    return cfg
+
+
+def endless_level(time):
+    """Difficulté (niveau fractionnaire) de la course sans fin au temps de course time"""
+    return ENDLESS_START + time / ENDLESS_LEVEL_TIME
+
+
+def endless_max_speed(time):
+    """Vitesse maximale de la piste sans fin au temps time (lue à chaque pas)"""
+    level = endless_level(time)
+    if level <= max(LEVEL_SETTINGS):
+        return _level_value(level, "max_speed")
+    return min(_level_value(level, "max_speed"), ENDLESS_MAX_SPEED)
+
+
+def is_endless(level):
+    """Vrai pour les niveaux sans ligne d'arrivée (ENDLESS, HORDE)"""
+    return level in (ENDLESS, HORDE)
+
+
+def start_settings(level):
+    """Paramètres au départ d'une course du niveau level (ENDLESS compris)"""
+    if is_endless(level):
+        return level_settings(ENDLESS_START)
+    return LEVEL_SETTINGS.get(level, LEVEL_SETTINGS[5])
+
+
+def speed_base(level_cfg):
+    """Vitesse de la piste au départ (avant la rampe)"""
+    return min(level_cfg["max_speed"], level_cfg["speed_base"])
+
+
+def finish_eta(distance, scale, speed, max_speed):
+    """Temps pour parcourir distance (mètres) en partant de speed, vitesse en rampe"""
+    if distance <= 0 or scale <= 0:
+        return 0.0
+    ramp_time = max(0.0, (max_speed - speed) / SPEED_RAMP)
+    ramp_distance = scale * (speed * ramp_time + SPEED_RAMP * ramp_time ** 2 / 2)
+    if distance <= ramp_distance:
+        return (math.sqrt(speed ** 2 + 2 * SPEED_RAMP * distance / scale) - speed) / SPEED_RAMP
+    return ramp_time + (distance - ramp_distance) / (scale * max_speed)
+
+
+def distance_scale(level_cfg):
+    """Mètres parcourus par pixel de piste"""
+    return level_cfg["distance_m"] / max(1.0, level_cfg["finish_time"] * level_cfg["speed_base"])
+
+
+def daily_seed(day=None):
+    """Graine du défi du jour (la même sur toutes les bornes)"""
+    day = day or datetime.date.today()
+    digest = hashlib.sha256(f"daily:{day.isoformat()}".encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "little") & ((1 << SEED_BITS) - 1)
+
+
+def _event(row):
+    """Ligne de EVENT_DTYPE -> événement du planificateur (temps, type, données)"""
+    time, kind, a, b = row.tolist()
+    kind = KINDS[kind]
+    if kind == "bonus":
+        return time, kind, (a, BONUS_KINDS[b])
+    return time, kind, (a, b)
+
+
+class Timeline:
+    """Course complète d'un niveau : apparitions datées et ligne d'arrivée"""
+
+    __slots__ = ("level", "seed", "distance_m", "finish_x", "events", "times")
+
+    def __init__(self, level, seed, distance_m, finish_x, events):
+        self.level = level
+        self.seed = seed
+        self.distance_m = distance_m
+        self.finish_x = finish_x
+        self.events = events
+        # lu à chaque pas : liste Python plutôt que tableau
+        self.times = events["time"].tolist()
+
+    def __len__(self):
+        return len(self.events)
+
+    def event(self, i):
+        """Événement i au format du planificateur : (temps, type, données)"""
+        return _event(self.events[i])
+
+    def stream(self, pos, until):
+        """Événements à partir du numéro pos jusqu'au temps until ; retourne (événements, pos suivant)"""
+        times = self.times
+        out = []
+        while pos < len(times) and times[pos] <= until:
+            out.append(_event(self.events[pos]))
+            pos += 1
+        return out, pos
+
+    def seek(self, pos):
+        """Prépare la lecture à partir de l'événement pos (rien à faire : tout est en mémoire)"""
+
+    def gates(self):
+        """Portes de la course : (temps, gap_x, gap_w) en tableaux"""
+        rows = self.events[self.events["kind"] == KINDS.index("gate")]
+        return rows["time"], rows["a"].astype(np.int64), rows["b"].astype(np.int64)
+
+    def to_bytes(self):
+        header = struct.pack(HEADER_FORMAT, self.level, self.seed, self.distance_m, self.finish_x, len(self.events))
+        return MAGIC + bytes([VERSION]) + header + self.events.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:3] != MAGIC:
+            raise ValueError("fichier de course invalide")
+        if data[3] != VERSION:
+            raise ValueError(f"version de course non supportée : {data[3]}")
+        try:
+            level, seed, distance_m, finish_x, count = struct.unpack_from(HEADER_FORMAT, data, 4)
+            events = np.frombuffer(data, dtype=EVENT_DTYPE, count=count, offset=4 + struct.calcsize(HEADER_FORMAT))
+        except (struct.error, ValueError) as e:
+            raise ValueError(f"fichier de course illisible : {e}") from e
+        return cls(level, seed, distance_m, finish_x, events.copy())
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class _Planner:
+    """Tire la course dans l'ordre où le jeu la découvre
+
+    Comme dans le jeu, une apparition est tirée quand elle est planifiée, et
+    la suivante du même type quand elle apparaît. En mode sans fin, les
+    paramètres suivent la difficulté au temps de chaque apparition.
+    """
+
+    def __init__(self, level, seed, check):
+        self.level = level
+        self.endless = level == ENDLESS
+        self.cfg = start_settings(level)
+        self.rng = make_rng(seed, "spawn")
+        self.check = check
+        self.speed0 = speed_base(self.cfg)
+        self.player_w, self.player_h = SPRITE_SIZES["skier"]
+        self.tree_w, self.tree_h = SPRITE_SIZES["tree"]
+        # x atteignables à chaque porte planifiée : (temps, x min, x max)
+        start_x = SCREEN_WIDTH // 2 - self.player_w // 2
+        self.reach = [(0.0, start_x, start_x)]
+        # largages du drone : un bloc de glace peut geler le skieur entre deux portes
+        self.drops = course_check.DropSchedule(seed)
+        self.heap = []
+        self.seq = 0
+
+    def settings(self, time):
+        return level_settings(endless_level(time)) if self.endless else self.cfg
+
+    def schedule(self, time, kind, a, b):
+        heapq.heappush(self.heap, (time, self.seq, kind, a, b))
+        self.seq += 1
+
+    def start(self):
+        """Premières apparitions de chaque type"""
+        cfg = self.cfg
+        self.plan_rock(cfg.get("rock_interval", ROCK_INTERVAL))
+        self.plan_gate(self.rng.uniform(*cfg["gate_range"]))
+        self.plan_bonus(self.rng.uniform(*cfg["bonus_range"]))
+
+    def next_time(self):
+        return self.heap[0][0]
+
+    def advance(self, until, budget=math.inf):
+        """Apparitions jusqu'au temps until (budget au plus), dans l'ordre, en lignes de EVENT_DTYPE"""
+        rows = []
+        heap = self.heap
+        while heap[0][0] <= until and len(rows) < budget:
+            time, _, kind, a, b = heapq.heappop(heap)
+            rows.append((time, kind, a, b))
+            cfg = self.settings(time)
+            if kind == 0:
+                self.plan_rock(time + cfg.get("rock_interval", ROCK_INTERVAL))
+            elif kind == 1:
+                self.plan_gate(time + self.rng.uniform(*cfg["gate_range"]) + cfg["extra_gate"])
+            else:
+                self.plan_bonus(time + self.rng.uniform(*cfg["bonus_range"]))
+        return rows
+
+    def run(self):
+        """Course complète d'un niveau fixe : (événements, trou de l'arrivée)"""
+        cfg = self.cfg
+        finish_at = finish_eta(cfg["distance_m"], distance_scale(cfg), self.speed0, cfg["max_speed"])
+        self.start()
+        rows = self.advance(finish_at + END_MARGIN)
+        return np.array(rows, dtype=EVENT_DTYPE), self.finish(finish_at)
+
+    def plan_rock(self, time):
+        variant = self.rng.randrange(ROCK_VARIANTS)
+        x = self.rng.randint(50, SCREEN_WIDTH - 50 - SPRITE_SIZES["rock"][0])
+        self.schedule(time, 0, x, variant)
+
+    def plan_gate(self, time):
+        level = endless_level(time) if self.endless else self.level
+        gap_min = max(150, int(230 - level * 15))
+        gap_max = min(300, gap_min + 100)
+        for _ in range(GATE_ATTEMPTS):
+            gap_w = self.rng.randint(gap_min, gap_max)
+            gap_x = self.rng.randint(40, SCREEN_WIDTH - gap_w - 40)
+            lo, hi = self.gate_reach(time, gap_x, gap_w)
+            if lo <= hi or not self.check:
+                break
+        else:
+            # aucun tirage passable : trou centré sur ce que le skieur peut atteindre
+            lo, hi = self.reach_at(time, self.reach[-1])
+            center = (lo + hi + self.player_w) / 2
+            gap_x = int(min(max(40, center - gap_w / 2), SCREEN_WIDTH - gap_w - 40))
+            lo, hi = self.gate_reach(time, gap_x, gap_w)
+        if lo > hi:
+            # porte impassable (vérification coupée, piste trop serrée) : on repart du trou
+            lo, hi = course_check.passage(gap_x, gap_w, self.tree_w, self.player_w)
+        self.reach.append((time, lo, hi))
+        if self.endless:
+            # pas de ligne d'arrivée : seule la dernière porte compte
+            del self.reach[:-1]
+        self.schedule(time, 1, gap_x, gap_w)
+
+    def plan_bonus(self, time):
+        bonus_kind = self.rng.choice(["moonwalk", "speed"])
+        bonus_name = "bonus" if bonus_kind == "moonwalk" else "speed_boost"
+        x = self.rng.randint(60, SCREEN_WIDTH - 60 - SPRITE_SIZES[bonus_name][0])
+        self.schedule(time, 2, x, BONUS_KINDS.index(bonus_kind))
+
+    def finish(self, time):
+        """Place de la ligne d'arrivée : centrée, sauf si la dernière porte l'empêche"""
+        gap_x = (SCREEN_WIDTH - FINISH_GAP) // 2
+        if not self.check:
+            return gap_x
+        last = [reach for reach in self.reach if reach[0] <= time][-1]
+        at = course_check.finish_time(time, self.speed0, self.cfg["max_speed"], SPEED_RAMP, self.tree_h)
+        lo, hi = self.reach_at(at, last)
+        gap_lo, gap_hi = course_check.finish_passage(gap_x, FINISH_GAP, self.player_w)
+        if max(lo, gap_lo) > min(hi, gap_hi):
+            # ligne décalée vers ce que le skieur peut atteindre
+            center = (lo + hi + self.player_w) / 2
+            gap_x = int(min(max(0, center - FINISH_GAP / 2), SCREEN_WIDTH - FINISH_GAP))
+        return gap_x
+
+    def reach_at(self, time, last):
+        """x atteignables par une porte planifiée à time, depuis last = (temps, lo, hi)"""
+        last_time, lo, hi = last
+        free = course_check.free_time(last_time, time, self.speed0, self.settings(time)["max_speed"], SPEED_RAMP,
+                                      self.tree_h + self.player_h)
+        loss = self.drops.loss(last_time, time, COURSE_CHECK_LOSS)
+        return course_check.reach(lo, hi, free, PLAYER_SPEED, loss, self.player_w)
+
+    def gate_reach(self, time, gap_x, gap_w):
+        """x atteignables en passant le trou d'une porte planifiée à time (lo > hi : impossible)"""
+        lo, hi = self.reach_at(time, self.reach[-1])
+        gap_lo, gap_hi = course_check.passage(gap_x, gap_w, self.tree_w, self.player_w)
+        return max(lo, gap_lo), min(hi, gap_hi)
+
+
+class EndlessCourse:
+    """Course sans fin, générée par morceaux de CHUNK_SECONDS au fil de la partie
+
+    Même interface de lecture que Timeline (stream, seek). Les morceaux
+    prêts attendent dans une file ; un morceau entièrement lu est libéré.
+    """
+
+    def __init__(self, seed, check=COURSE_CHECK, level=ENDLESS):
+        self.level = level
+        self.seed = seed
+        self.check = check
+        self.distance_m = math.inf
+        self.finish_x = (SCREEN_WIDTH - FINISH_GAP) // 2
+        self._restart()
+
+    def _restart(self):
+        self.planner = _Planner(ENDLESS, self.seed, self.check)
+        self.planner.start()
+        self.chunks = deque()  # (numéro du premier événement, temps, événements)
+        self.pending = []  # lignes du morceau en cours de génération
+        self.generated = 0  # événements rangés dans des morceaux
+        self.ready = 0.0  # temps de course couvert par les morceaux prêts
+
+    def _work(self, budget):
+        """Avance la génération du morceau suivant d'au plus budget apparitions"""
+        planner = self.planner
+        end = self.ready + CHUNK_SECONDS
+        self.pending += planner.advance(end, budget)
+        if planner.next_time() > end:
+            events = np.array(self.pending, dtype=EVENT_DTYPE)
+            self.chunks.append((self.generated, events["time"].tolist(), events))
+            self.generated += len(events)
+            self.pending = []
+            self.ready = end
+
+    def stream(self, pos, until):
+        """Comme Timeline.stream ; génère au passage un peu du morceau suivant"""
+        if self.ready < until + CHUNK_AHEAD * CHUNK_SECONDS:
+            self._work(CHUNK_WORK)
+        while self.ready < until:
+            # grand saut dans le temps : on rattrape d'un coup
+            self._work(math.inf)
+        out = []
+        chunks = self.chunks
+        while chunks:
+            first, times, events = chunks[0]
+            i = pos - first
+            while i < len(times) and times[i] <= until:
+                out.append(_event(events[i]))
+                i += 1
+            pos = first + i
+            if i < len(times):
+                break
+            chunks.popleft()
+        return out, pos
+
+    def seek(self, pos):
+        """Prépare la lecture à partir de l'événement pos (retour en arrière : on régénère)"""
+        if not self.chunks or pos < self.chunks[0][0]:
+            self._restart()
+        while self.generated <= pos:
+            self._work(math.inf)
+        while self.chunks and self.chunks[0][0] + len(self.chunks[0][1]) <= pos:
+            self.chunks.popleft()
+
+
+def build(level, seed, check=COURSE_CHECK):
+    """Génère la course du niveau level pour la graine seed
+
+    check=False garde les portes brutes (sans vérification de passage).
+    Les niveaux ENDLESS et HORDE donnent une course sans fin (EndlessCourse),
+    la même pour une même graine.
+    """
+    if is_endless(level):
+        return EndlessCourse(seed, check, level)
+    events, finish_x = _Planner(level, seed, check).run()
+    distance_m = LEVEL_SETTINGS.get(level, LEVEL_SETTINGS[5])["distance_m"]
+    return Timeline(level, seed, distance_m, finish_x, events)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère une course de ski (timeline)")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--daily", action="store_true", help="course du jour (même graine sur toutes les bornes)")
+    parser.add_argument("--out", default=None, help="fichier .wtl à écrire")
+    args = parser.parse_args(argv)
+    if is_endless(args.level):
+        parser.error("la course sans fin se génère pendant la partie, elle ne s'écrit pas")
+
+    seed = daily_seed() if args.daily or args.seed is None else args.seed
+    timeline = build(args.level, seed)
+    kinds = timeline.events["kind"]
+    counts = ", ".join(f"{np.count_nonzero(kinds == i)} {name}" for i, name in enumerate(("rochers", "portes", "bonus")))
+    print(f"Niveau {args.level}, graine {seed} : {counts}, {timeline.distance_m} m, "
+          f"{len(timeline.to_bytes())} octets")
+    if args.out:
+        timeline.save(args.out)
+        print(f"Course écrite dans {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Réglage de LEVEL_SETTINGS : balayage de grilles de paramètres sur plusieurs cœurs
+
+Pour chaque point de la grille, des milliers de courses headless sont jouées
+(mêmes graines pour tous les points : les écarts viennent des paramètres,
+pas du tirage) par un joueur scripté ou par le pilote automatique, réparties
+sur un pool de processus. Le rapport donne, par niveau et par point, le taux
+de victoire, la répartition des scores et le temps pour finir.
+
+Lancement:
+    python -m game.tuner --level 3 --grid speed_base=140,150,160 --grid max_speed=x0.9,x1,x1.1
+    python -m game.tuner --grid gate_range=x0.9,x1 --runs 2000 --target 0.6
+    python -m game.tuner --level 5 --runs 200 --player pilote
+
+Valeurs d'un paramètre : absolues (150), relatives au niveau (x0.9) ou, pour
+les intervalles, bornes séparées par « : » (1.3:2.0).
+"""
+
+import argparse
+import contextlib
+import itertools
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from .config import LEVEL_SETTINGS, SCREEN_HEIGHT, SCREEN_WIDTH
+from .game_manager import GameManager
+from .headless import simulate_run
+from .autopilot import Autopilot
+from .inputs import KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN
+
+TUNABLE = ("speed_base", "max_speed", "gate_range", "extra_gate", "bonus_range", "distance_m")
+CHUNK = 50  # courses par tâche envoyée à un processus
+MAX_TIME = 120.0  # une course plus longue est comptée perdue
+
+HOME_Y = SCREEN_HEIGHT * 0.55  # hauteur de croisière du joueur scripté
+DODGE_RANGE = 160  # le joueur scripté évite les rochers à moins de 160 px devant lui
+
+
+class GateFollower:
+    """Joueur scripté : vise le trou de la porte suivante, évite les rochers proches
+
+    Bien moins fort que l'Autopilot mais ~10 fois plus rapide, ce qui
+    permet des milliers de courses par point de la grille. Il ne fuit pas
+    les yetis et ne cherche pas les bonus (un joueur moyen).
+    """
+
+    def __call__(self, game):
+        state = game.state
+        player = state.player
+        camera_y = state.camera_y
+        center = SCREEN_WIDTH / 2
+
+        # porte la plus proche encore au-dessus du skieur, sinon ligne d'arrivée
+        best = -math.inf
+        gates = game.stores["gates"]
+        for i in gates.indices():
+            gate = gates.items[i]
+            y = gates.y[i] - camera_y
+            if not gate.passed and best < y < player.y:
+                best = y
+                center = gate.gap_x + gate.gap_w / 2
+        finish = state.finish_line
+        if best == -math.inf and finish is not None and not state.finish_passed:
+            center = finish["gap_x"] + finish["gap_w"] / 2
+        target = center - player.w / 2
+
+        # rocher dans le couloir : passer du côté le plus proche de la cible
+        rocks = game.stores["obstacles"]
+        for i in rocks.indices():
+            dy = player.y - (rocks.y[i] - camera_y + rocks.h[i])
+            left = rocks.x[i] - player.w
+            right = rocks.x[i] + rocks.w[i]
+            if 0 < dy < DODGE_RANGE and left < player.x < right:
+                target = left - 4 if abs(left - target) < abs(right - target) else right + 4
+                break
+
+        move = player.base_speed
+        mask = 0
+        if target - player.x > move / 2:
+            mask |= KEY_RIGHT
+        elif target - player.x < -move / 2:
+            mask |= KEY_LEFT
+        if HOME_Y - player.y > move / 2:
+            mask |= KEY_DOWN
+        elif HOME_Y - player.y < -move / 2:
+            mask |= KEY_UP
+        if player.moonwalk > 0:
+            # bonus « moonwalk » : commandes inversées, comme pour un joueur
+            swapped = 0
+            for a, b in ((KEY_LEFT, KEY_RIGHT), (KEY_RIGHT, KEY_LEFT), (KEY_UP, KEY_DOWN), (KEY_DOWN, KEY_UP)):
+                if mask & a:
+                    swapped |= b
+            mask = swapped
+        return mask
+
+
+def _player(name):
+    if name == "pilote":
+        # budget illimité : les décisions ne dépendent pas de la charge des cœurs
+        return Autopilot(budget_ms=math.inf)
+    if name == "scripté":
+        return GateFollower()
+    return None
+
+
+PLAYERS = ("scripté", "pilote", "aucun")
+
+
+def parse_values(level, key, text):
+    """Valeurs d'un paramètre pour un niveau : "150,160", "x0.9,x1" ou "1.3:2.0,1.4:2.1" """
+    if key not in TUNABLE:
+        raise ValueError(f"paramètre inconnu : {key} (possibles : {', '.join(TUNABLE)})")
+    base = LEVEL_SETTINGS[level][key]
+    values = []
+    for item in text.split(","):
+        item = item.strip()
+        if item.startswith("x"):
+            factor = float(item[1:])
+            value = tuple(v * factor for v in base) if isinstance(base, tuple) else base * factor
+        elif isinstance(base, tuple):
+            value = tuple(float(v) for v in item.split(":"))
+            if len(value) != len(base):
+                raise ValueError(f"{key} : {len(base)} bornes attendues, « {item} » reçu")
+        else:
+            value = float(item)
+        if isinstance(base, int):
+            value = int(round(value))
+        values.append(value)
+    return values
+
+
+def grid_points(level, grid):
+    """Tous les points (dictionnaires de valeurs modifiées) de la grille pour un niveau"""
+    keys = list(grid)
+    choices = [parse_values(level, key, grid[key]) for key in keys]
+    return [dict(zip(keys, values)) for values in itertools.product(*choices)]
+
+
+@contextlib.contextmanager
+def level_overrides(level, overrides):
+    """Remplace le temps du bloc les réglages d'un niveau (dans ce processus)"""
+    saved = LEVEL_SETTINGS[level]
+    LEVEL_SETTINGS[level] = {**saved, **overrides}
+    try:
+        yield
+    finally:
+        LEVEL_SETTINGS[level] = saved
+
+
+_game = None
+
+
+def _run_chunk(task):
+    """Joue un paquet de courses d'un point de la grille (dans un processus du pool)"""
+    global _game
+    if _game is None:
+        _game = GameManager()
+    index, level, overrides, player, seeds = task
+    policy = _player(player)
+    wins = np.zeros(len(seeds), dtype=bool)
+    scores = np.zeros(len(seeds))
+    times = np.zeros(len(seeds))
+    with level_overrides(level, overrides):
+        for i, seed in enumerate(seeds):
+            result = simulate_run(level=level, policy=policy, max_time=MAX_TIME, game=_game, seed=seed)
+            wins[i] = result["win"]
+            scores[i] = result["score"]
+            times[i] = result["race_time"]
+    return index, seeds[0], wins, scores, times
+
+
+def sweep(levels, grid, runs, player="scripté", workers=None, seed=0, progress=None):
+    """Joue runs courses par point de la grille et par niveau
+
+    grid : {paramètre: "valeurs"} (voir parse_values), les mêmes pour tous
+    les niveaux ; les graines seed .. seed + runs - 1 servent à tous les
+    points. Retourne une liste de points : {"level", "overrides", "wins",
+    "scores", "times"} (tableaux NumPy, une valeur par graine).
+    """
+    points = [{"level": level, "overrides": overrides} for level in levels for overrides in grid_points(level, grid)]
+    tasks = []
+    for index, point in enumerate(points):
+        for start in range(seed, seed + runs, CHUNK):
+            seeds = list(range(start, min(start + CHUNK, seed + runs)))
+            tasks.append((index, point["level"], point["overrides"], player, seeds))
+    parts = [[] for _ in points]
+    with multiprocessing.Pool(workers or os.cpu_count()) as pool:
+        for done, (index, first, wins, scores, times) in enumerate(pool.imap_unordered(_run_chunk, tasks), 1):
+            parts[index].append((first, wins, scores, times))
+            if progress is not None:
+                progress(done, len(tasks))
+    for point, chunks in zip(points, parts):
+        # paquets remis dans l'ordre des graines
+        chunks.sort(key=lambda chunk: chunk[0])
+        point["wins"], point["scores"], point["times"] = (np.concatenate(column) for column in list(zip(*chunks))[1:])
+    return points
+
+
+def summary(point):
+    """Taux de victoire, scores (moyenne, p10, p50, p90) et temps pour finir (p50, p90)"""
+    wins, scores, times = point["wins"], point["scores"], point["times"]
+    p10, p50, p90 = np.percentile(scores, [10, 50, 90])
+    finish = np.percentile(times[wins], [50, 90]) if wins.any() else (math.nan, math.nan)
+    return {
+        "win_rate": wins.mean(),
+        "score_mean": scores.mean(),
+        "score_p10": p10,
+        "score_p50": p50,
+        "score_p90": p90,
+        "finish_p50": finish[0],
+        "finish_p90": finish[1],
+    }
+
+
+def _format_value(value):
+    if isinstance(value, tuple):
+        return ":".join(f"{v:g}" for v in value)
+    return f"{value:g}"
+
+
+def report(points, target=None):
+    """Tableau texte des résultats, par niveau ; avec target, le point le plus proche est marqué"""
+    lines = []
+    for level in sorted({point["level"] for point in points}):
+        rows = [(point, summary(point)) for point in points if point["level"] == level]
+        best = None
+        if target is not None:
+            best = min(range(len(rows)), key=lambda i: abs(rows[i][1]["win_rate"] - target))
+        lines.append(f"Niveau {level}")
+        for i, (point, stats) in enumerate(rows):
+            label = ", ".join(f"{key}={_format_value(value)}" for key, value in point["overrides"].items()) or "réglages actuels"
+            mark = " <" if i == best else ""
+            lines.append(f"  {label:<44} victoires {stats['win_rate'] * 100:5.1f}%"
+                         f"  |  score {stats['score_mean']:6.1f} (p10 {stats['score_p10']:.0f}, p50 {stats['score_p50']:.0f}, p90 {stats['score_p90']:.0f})"
+                         f"  |  arrivée p50 {stats['finish_p50']:.1f}s, p90 {stats['finish_p90']:.1f}s{mark}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balayage de LEVEL_SETTINGS (courses headless sur plusieurs cœurs)")
+    parser.add_argument("--level", type=int, action="append", help="niveau à régler (répétable ; par défaut : tous)")
+    parser.add_argument("--grid", action="append", default=[], metavar="PARAM=VALEURS",
+                        help=f"valeurs à essayer (répétable) ; paramètres : {', '.join(TUNABLE)}")
+    parser.add_argument("--runs", type=int, default=1000, help="courses par point de la grille")
+    parser.add_argument("--player", choices=PLAYERS, default="scripté")
+    parser.add_argument("--workers", type=int, default=None, help="processus (par défaut : un par cœur)")
+    parser.add_argument("--seed", type=int, default=0, help="première graine")
+    parser.add_argument("--target", type=float, default=None, help="taux de victoire visé (0-1) : marque le point le plus proche")
+    args = parser.parse_args(argv)
+
+    levels = args.level or sorted(LEVEL_SETTINGS)
+    for level in levels:
+        if level not in LEVEL_SETTINGS:
+            parser.error(f"niveau inconnu : {level}")
+    grid = {}
+    for item in args.grid:
+        key, sep, values = item.partition("=")
+        if not sep:
+            parser.error(f"--grid attend PARAM=VALEURS, reçu « {item} »")
+        grid[key.strip()] = values
+    try:
+        for level in levels:
+            grid_points(level, grid)
+    except ValueError as e:
+        parser.error(str(e))
+
+    def progress(done, total):
+        print(f"\r{done}/{total} paquets", end="", flush=True)
+
+    started = time.perf_counter()
+    points = sweep(levels, grid, args.runs, args.player, args.workers, args.seed, progress)
+    elapsed = time.perf_counter() - started
+    total = len(points) * args.runs
+    print(f"\r{len(points)} points x {args.runs} courses ({args.player}) en {elapsed:.1f}s"
+          f"  |  {total / max(elapsed, 1e-9):.0f} courses/s")
+    print(report(points, args.target))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Yetis du ski, en colonnes NumPy
+
+Un ou deux yetis (niveaux 2 à 5, sans fin) foncent droit sur le skieur, se
+tiennent à ~190 px sous lui puis se rapprochent lentement : une boucle
+Python sur si peu de yetis coûte moins que des opérations sur tableaux.
+À partir de FLOW_MIN_YETIS (la horde), chaque yeti lit le champ de
+poursuite (flow_field.py) dans sa case et contourne les rangées de sapins
+et les rochers ; les mises à jour sont alors faites pour tous d'un coup.
+
+Les yetis de la horde (timeline.HORDE) ont chacun un décalage (spread_x,
+spread_y) : ils visent un peu à côté du skieur et se tiennent plus ou moins
+loin, pour ne pas se fondre en un seul.
+"""
+
+import random
+import numpy as np
+from .entities import _sprite_size
+
+# colonnes (float) d'un yeti, dans l'ordre des sauvegardes
+FIELDS = ("x", "y", "prev_x", "prev_y", "frame_timer", "knockback", "slow_timer", "moonwalk_timer",
+          "spread_x", "spread_y")
+
+HOVER = 190  # distance de poursuite sous le skieur (pixels)
+RESPAWN_Y = 140  # réapparition sous l'écran après une sortie par le haut
+FRAME_TIME = 0.12
+
+
+class Yetis:
+    """Tous les yetis d'une course (positions, minuteurs, animation en tableaux)"""
+
+    def __init__(self, xs, ys, frames, size=None, rng=None, spread_x=None, spread_y=None):
+        count = len(xs)
+        self.rng = rng if rng is not None else random.Random()
+        self.frames = frames
+        self.w, self.h = _sprite_size(frames[0] if frames else None, size)
+        self.x = np.array(xs, dtype=np.float64)
+        self.y = np.array(ys, dtype=np.float64)
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+        self.frame_index = np.zeros(count, dtype=np.int64)
+        self.frame_timer = np.zeros(count)
+        self.knockback = np.zeros(count)
+        self.slow_timer = np.zeros(count)
+        self.moonwalk_timer = np.zeros(count)
+        self.contact = np.zeros(count, dtype=bool)  # touchait le skieur au pas précédent
+        self.spread_x = np.zeros(count) if spread_x is None else np.array(spread_x, dtype=np.float64)
+        self.spread_y = np.zeros(count) if spread_y is None else np.array(spread_y, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.x)
+
+    def centers(self):
+        return self.x + self.w / 2, self.y + self.h / 2
+
+    def rects(self):
+        """Bords (gauche, haut, droite, bas) de chaque yeti en pixels entiers, comme pygame.Rect(int(x), int(y), w, h)"""
+        w, h = self.w, self.h
+        return [(left, top, left + w, top + h)
+                for left, top in zip(map(int, self.x.tolist()), map(int, self.y.tolist()))]
+
+    def update(self, dt, target_x, target_y, target_cx, speed, speed_bonus, screen_h, screen_w, field=None):
+        """Avance tous les yetis d'un pas
+
+        target_x, target_y : coin du skieur (ce que les yetis visent),
+        target_cx : son centre. field : champ de poursuite déjà construit
+        pour ce pas (horde) ; sans champ, chaque yeti fonce droit sur le
+        skieur, comme un seul yeti l'a toujours fait.
+        """
+        if field is None:
+            self._chase(dt, target_x, target_y, speed, speed_bonus, screen_h, screen_w)
+        elif len(self):
+            self._follow(dt, field, target_x, target_y, target_cx, speed, speed_bonus, screen_h, screen_w)
+
+    def _chase(self, dt, target_x, target_y, speed, speed_bonus, screen_h, screen_w):
+        """Poursuite directe, yeti par yeti : pour un ou deux yetis, moins cher que les tableaux"""
+        w = self.w
+        frame_count = max(1, len(self.frames))
+        # colonnes lues en listes Python (une lecture par colonne), écrites
+        # case par case : pour deux yetis, bien moins cher que des tranches
+        xs, ys = self.x.tolist(), self.y.tolist()
+        slow_timers = self.slow_timer.tolist()
+        moonwalk_timers = self.moonwalk_timer.tolist()
+        knockbacks = self.knockback.tolist()
+        frame_timers = self.frame_timer.tolist()
+        spread_xs, spread_ys = self.spread_x.tolist(), self.spread_y.tolist()
+        for i in range(len(xs)):
+            x, y = xs[i], ys[i]
+            self.prev_x[i] = x
+            self.prev_y[i] = y
+            slow_timer = slow_timers[i]
+            if slow_timer > 0:
+                slow_timer = self.slow_timer[i] = max(0.0, slow_timer - dt)
+            moonwalk_timer = moonwalk_timers[i]
+            if moonwalk_timer > 0:
+                moonwalk_timer = self.moonwalk_timer[i] = max(0.0, moonwalk_timer - dt)
+
+            tx = target_x + spread_xs[i]
+            if moonwalk_timer > 0:
+                # le joueur a le moonwalk : le yeti se trompe de direction
+                tx = screen_w - tx
+            chase = ((speed + speed_bonus) * 0.42 + 28) * (0.7 if slow_timer > 0 else 1.0)
+            y -= chase * dt * 0.9
+            x = max(0, min(screen_w - w, x + (tx - (x + w / 2)) * 0.04))
+
+            # retenue : pas plus près que HOVER (+ spread_y) sous le skieur
+            desired_y = target_y + HOVER + spread_ys[i]
+            if y < desired_y:
+                y = min(desired_y, y + chase * dt * 0.8)
+            if knockbacks[i] > 0:
+                y += 200 * dt
+                self.knockback[i] = max(0.0, knockbacks[i] - dt)
+            if y < -self.h - 60:
+                # réapparition en bas, sans interpolation
+                y = screen_h + RESPAWN_Y
+                x = self.rng.randint(0, screen_w - w)
+                self.prev_x[i] = x
+                self.prev_y[i] = y
+            self.x[i] = x
+            self.y[i] = y
+
+            frame_timer = frame_timers[i] + dt
+            if frame_timer >= FRAME_TIME:
+                frame_timer = 0.0
+                self.frame_index[i] = (self.frame_index[i] + 1) % frame_count
+            self.frame_timer[i] = frame_timer
+
+    def _follow(self, dt, field, target_x, target_y, target_cx, speed, speed_bonus, screen_h, screen_w):
+        """Poursuite guidée par le champ, tous les yetis d'un coup (tableaux)"""
+        x, y = self.x, self.y
+        w = self.w
+        self.prev_x[:] = x
+        self.prev_y[:] = y
+        for timer in (self.slow_timer, self.moonwalk_timer):
+            np.maximum(timer - dt, 0.0, out=timer)
+
+        cx = x + w / 2
+        fx, fy, known = field.sample(cx, y + self.h / 2)
+        tx = target_x + self.spread_x
+        dx_player = target_cx - cx
+        moon = self.moonwalk_timer > 0
+        if moon.any():
+            # le joueur a le moonwalk : les yetis se trompent de direction
+            tx = np.where(moon, screen_w - tx, tx)
+            dx_player = np.where(moon, screen_w - target_cx - cx, dx_player)
+            fx = np.where(moon, -fx, fx)
+        dx = tx - cx
+
+        slow_mult = np.where(self.slow_timer > 0, 0.7, 1.0)
+        chase = ((speed + speed_bonus) * 0.42 + 28) * slow_mult
+
+        # le champ impose un détour (mur au-dessus, trou de l'autre côté) :
+        # on suit son pas ; sinon, droit vers la cible comme _chase
+        cell = field.cell
+        detour = known & ((fy >= 0) | (fx * dx_player < 0) | ((fx == 0) & (np.abs(dx_player) >= cell)))
+        climb = np.where(known & (fy >= 0), np.where(fy == 0, 0.0, -0.5), 1.0)
+        x += np.where(detour, fx * np.maximum(np.abs(dx), cell), dx) * 0.04
+        np.clip(x, 0, screen_w - w, out=x)
+        y -= chase * dt * 0.9 * climb
+
+        # retenue : pas plus près que HOVER (+ spread_y) sous le skieur
+        desired_y = target_y + HOVER + self.spread_y
+        hold = (y < desired_y) & (climb > 0)
+        if hold.any():
+            np.copyto(y, np.minimum(desired_y, y + chase * dt * 0.8 * climb), where=hold)
+        knocked = self.knockback > 0
+        if knocked.any():
+            y[knocked] += 200 * dt
+            np.maximum(self.knockback - dt, 0.0, out=self.knockback)
+
+        # sortis par le haut : réapparition en bas, sans interpolation
+        for i in np.flatnonzero(y < -self.h - 60).tolist():
+            y[i] = screen_h + RESPAWN_Y
+            x[i] = self.rng.randint(0, screen_w - w)
+            self.prev_x[i] = x[i]
+            self.prev_y[i] = y[i]
+
+        self.frame_timer += dt
+        tick = self.frame_timer >= FRAME_TIME
+        if tick.any():
+            self.frame_timer[tick] = 0.0
+            self.frame_index[tick] = (self.frame_index[tick] + 1) % max(1, len(self.frames))
+
+    def draw(self, screen, alpha=1.0):
+        xs = self.prev_x + (self.x - self.prev_x) * alpha
+        ys = self.prev_y + (self.y - self.prev_y) * alpha
+        height = screen.get_height()
+        visible = np.flatnonzero((ys < height) & (ys + self.h > 0))
+        frames = self.frames
+        for i, x, y in zip(visible.tolist(), xs[visible].tolist(), ys[visible].tolist()):
+            screen.blit(frames[self.frame_index[i]], (int(x), int(y)))
@@ -0,0 +1,25 @@
+from game.biathlon import BiathlonGame
+from game.curling import CurlingGame
+from game.game_manager import GameManager
+from game.main import capture_session
+
+
+def _session(leaderboard):
+    return {
+        "state": "playing", "mode": "jo", "leaderboard": leaderboard, "name_input": "",
+        "pending_score": None, "pending_time": None, "jo_pending_score": None,
+        "jo_pending_time": None, "jo_stage": "ski", "jo_transition_timer": 0.0, "volume": 0.5,
+    }
+
+
+def test_captured_leaderboard_is_a_copy():
+    game = GameManager()
+    game.reset_game(level=2, seed=11)
+    leaderboard = [(30, "ana", 21.5)]
+    session, blocks = capture_session(_session(leaderboard), game, CurlingGame(None, None, None),
+                                      BiathlonGame(None, None, None))
+    # la boucle principale continue de modifier son classement
+    leaderboard.append((50, "bob", 19.0))
+    leaderboard.sort(reverse=True)
+    assert session["leaderboard"] == [(30, "ana", 21.5)]
+
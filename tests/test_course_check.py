@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from game import course_check, timeline
+from game.assets import SPRITE_SIZES
+from game.config import COURSE_CHECK_LOSS, LEVEL_SETTINGS, SCREEN_WIDTH
+
+PLAYER_W, PLAYER_H = SPRITE_SIZES["skier"]
+ROW_H = SPRITE_SIZES["tree"][1] + PLAYER_H
+
+
+def _check(times, lo, hi, loss=0.0, start_x=450):
+    return course_check.check_batch(np.array(times, dtype=float), np.array(lo, dtype=float),
+                                     np.array(hi, dtype=float), 150.0, 250.0, timeline.SPEED_RAMP, ROW_H,
+                                     timeline.PLAYER_SPEED, loss, PLAYER_W, start_x)
+
+
+def test_check_batch_rejects_a_gap_too_far_to_reach():
+    # course 0 : deuxième trou juste à côté ; course 1 : à l'autre bout de la piste
+    ok, fail_at, slack = _check([[2.0, 3.0], [2.0, 3.0]], [[400, 520], [400, 850]], [[500, 560], [500, 900]])
+    assert ok.tolist() == [True, False]
+    assert fail_at.tolist() == [-1, 1]
+    assert slack[0] > 0
+
+
+def test_check_batch_loss_per_gate():
+    times, lo, hi = [[2.0, 3.0]], [[400, 520]], [[500, 560]]
+    assert _check(times, lo, hi, np.array([[0.0, 0.0]]))[0].all()
+    # temps perdu avant la deuxième porte : plus le temps de l'atteindre
+    assert not _check(times, lo, hi, np.array([[0.0, 0.5]]))[0].any()
+
+
+def test_nan_padding_ends_a_course():
+    ok, fail_at, _ = _check([[2.0, np.nan]], [[400, np.nan]], [[500, np.nan]])
+    assert ok.all() and fail_at.tolist() == [-1]
+
+
+def test_checked_generation_passes_its_own_model():
+    times, lo, hi, losses = course_check.generate(5, range(200), checked=True, loss=COURSE_CHECK_LOSS, workers=1)
+    cfg = LEVEL_SETTINGS[5]
+    ok, _, _ = course_check.check_batch(times, lo, hi, timeline.speed_base(cfg), cfg["max_speed"], timeline.SPEED_RAMP,
+                                        ROW_H, timeline.PLAYER_SPEED, losses, PLAYER_W,
+                                        SCREEN_WIDTH // 2 - PLAYER_W // 2)
+    assert ok.all()
+
+
+def test_drop_schedule_adds_the_freeze_around_drops():
+    drops = course_check.DropSchedule(seed=3)
+    first = drops.times[0]  # premier largage, tiré comme Drone.next_drop_delay
+    assert drops.loss(first - 0.1, first + 0.1, 0.5) == pytest.approx(0.5 + course_check.FREEZE_TIME)
+    # le premier largage n'arrive pas avant la recharge de 1,5 s
+    assert drops.loss(0.0, 1.4, 0.5) == 0.5
+
+
+@pytest.mark.parametrize("level", ["0", "100", "7"])
+def test_cli_rejects_levels_without_fixed_gates(level):
+    with pytest.raises(SystemExit):
+        course_check.main(["--level", level, "--seeds", "10"])
+
+
+def test_course_gates_rejects_unknown_level():
+    course = timeline.build(3, seed=1)
+    course.level = 9
+    with pytest.raises(ValueError):
+        course_check.course_gates(course)
@@ -0,0 +1,59 @@
+import pytest
+
+from game.autopilot import Autopilot
+from game.events import GATE_PASSED
+from game.game_manager import GameManager
+from game.inputs import KeyState
+from game.timeline import ENDLESS, HORDE
+
+
+@pytest.mark.parametrize("level, active", [(1, False), (3, True), (ENDLESS, True), (HORDE, True)])
+def test_yeti_active_follows_the_yetis_of_the_level(level, active):
+    game = GameManager()
+    game.reset_game(level=level, seed=3)
+    assert game.state.yeti_active is active
+    assert (len(game.state.yetis) > 0) is active
+
+
+def _play(game, steps, policy):
+    keys = KeyState()
+    for _ in range(steps):
+        if game.game_over:
+            break
+        keys.mask = policy(game)
+        game.step(keys)
+
+
+def test_retry_resets_event_counts():
+    game = GameManager()
+    game.reset_game(level=1, seed=4)
+    game.paused = False
+    game.game_over = False
+    _play(game, 600, Autopilot())
+    assert sum(game.event_counts.counts.values()) > 0
+    game.retry()
+    assert set(game.event_counts.counts.values()) == {0}
+
+
+def test_retry_from_checkpoint_restores_event_counts():
+    game = GameManager()
+    game.mode = "training"
+    game.reset_game(level=1, seed=4)
+    game.paused = False
+    game.game_over = False
+    keys = KeyState()
+    autopilot = Autopilot()
+    # jusqu'à la première porte franchie (point de reprise)
+    while game.checkpoint is None and not game.game_over:
+        keys.mask = autopilot(game)
+        game.step(keys)
+    assert game.checkpoint is not None
+    at_checkpoint = dict(game.event_counts.counts)
+    assert at_checkpoint[GATE_PASSED] == 1
+    checkpoint = game.checkpoint
+    _play(game, 600, autopilot)
+    assert game.event_counts.counts != at_checkpoint
+    # reprise à la première porte, même si d'autres ont été franchies depuis
+    game.checkpoint = checkpoint
+    assert game.retry_from_checkpoint()
+    assert game.event_counts.counts == at_checkpoint
@@ -0,0 +1,23 @@
+import pytest
+
+from game.replay import InputLog, VERSION
+
+
+def _log():
+    log = InputLog("ski", seed=42, level=3)
+    for mask in (0, 0, 1, 1, 1, 2, 0):
+        log.record(mask)
+    return log
+
+
+def test_round_trip():
+    log = InputLog.from_bytes(_log().to_bytes())
+    assert (log.mode, log.seed, log.level) == ("ski", 42, 3)
+    assert list(log.masks()) == [0, 0, 1, 1, 1, 2, 0]
+
+
+def test_older_version_is_rejected():
+    data = bytearray(_log().to_bytes())
+    data[3] = VERSION - 1
+    with pytest.raises(ValueError, match="version de replay non supportée"):
+        InputLog.from_bytes(bytes(data))
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from game.game_manager import GameManager
+from game.inputs import KeyState
+from game.timeline import HORDE
+
+
+def _masks(seed, count):
+    rng = random.Random(seed)
+    return [rng.choice([0, 1, 2, 4, 8, 5, 6]) for _ in range(count)]
+
+
+def _play(game, masks):
+    keys = KeyState()
+    for mask in masks:
+        if game.game_over:
+            break
+        keys.mask = mask
+        game.step(keys)
+    state = game.state
+    # les lignes des stockages sont renumérotées par restore : on compare les positions
+    rows = state.obstacles.indices()
+    return (game.outcome(), state.player.x, state.player.y, state.camera_y,
+            state.yetis.x.tolist(), state.yetis.y.tolist(),
+            state.obstacles.x[rows].tolist(), state.obstacles.y[rows].tolist())
+
+
+# graines dont la course dure encore au bout des 600 pas
+@pytest.mark.parametrize("level, seed", [(3, 15), (HORDE, 5)])
+def test_restore_continues_like_uninterrupted_play(level, seed):
+    masks = _masks(level, 600)
+    game = GameManager()
+    game.reset_game(level=level, seed=seed)
+    game.paused = False
+    game.game_over = False
+    _play(game, masks[:300])
+    data = game.snapshot()
+    expected = _play(game, masks[300:])
+    assert not expected[0]["done"]
+
+    restored = GameManager()
+    restored.restore(data)
+    assert _play(restored, masks[300:]) == expected
+
+
+def test_restore_rejects_other_version():
+    game = GameManager()
+    game.reset_game(level=2, seed=1)
+    data = bytearray(game.snapshot())
+    data[3] ^= 0xFF
+    with pytest.raises(ValueError, match="version de snapshot non supportée"):
+        game.restore(bytes(data))
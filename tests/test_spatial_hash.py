@@ -0,0 +1,34 @@
+from game.spatial_hash import SpatialHash
+
+
+def _grid():
+    grid = SpatialHash(cell_size=64)
+    grid.insert(("obstacles", 0), 0, 0, 40, 40)
+    grid.insert(("obstacles", 1), 100, 100, 300, 140)  # sur plusieurs cases
+    grid.insert(("bonuses", 0), 30, 30, 60, 60)
+    grid.insert(("bonuses", 1), 500, 500, 520, 520)
+    return grid
+
+
+def test_query_returns_touching_keys_sorted():
+    grid = _grid()
+    assert grid.query(20, 20, 35, 35) == [("bonuses", 0), ("obstacles", 0)]
+    assert grid.query(250, 120, 260, 130) == [("obstacles", 1)]
+    assert grid.query(600, 0, 640, 40) == []
+
+
+def test_query_needs_overlap_not_just_a_shared_cell():
+    grid = _grid()
+    # même case que ("obstacles", 0), mais à côté de son rectangle
+    assert grid.query(41, 41, 50, 50, "obstacles") == []
+    # bords qui se touchent sans se chevaucher
+    assert grid.query(40, 0, 50, 10, "obstacles") == []
+
+
+def test_layer_filter_and_clear():
+    grid = _grid()
+    assert grid.query(0, 0, 640, 640, "bonuses") == [("bonuses", 0), ("bonuses", 1)]
+    grid.clear()
+    assert grid.query(0, 0, 640, 640) == []
+    grid.insert(("obstacles", 3), 10, 10, 20, 20)
+    assert grid.query(0, 0, 640, 640) == [("obstacles", 3)]
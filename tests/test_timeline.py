@@ -0,0 +1,42 @@
+import pytest
+
+from game import timeline
+from game.game_manager import GameManager
+from game.inputs import KeyState
+
+
+def test_wtl_write_read_is_byte_identical(tmp_path):
+    course = timeline.build(3, seed=42)
+    path = tmp_path / "course.wtl"
+    course.save(path)
+    loaded = timeline.Timeline.load(path)
+    assert loaded.to_bytes() == course.to_bytes() == path.read_bytes()
+    assert (loaded.level, loaded.seed, loaded.finish_x) == (3, 42, course.finish_x)
+
+
+def test_same_seed_same_course():
+    assert timeline.build(4, seed=7).to_bytes() == timeline.build(4, seed=7).to_bytes()
+    assert timeline.build(4, seed=7).to_bytes() != timeline.build(4, seed=8).to_bytes()
+
+
+def test_loaded_course_plays_like_its_seed():
+    course = timeline.Timeline.from_bytes(timeline.build(2, seed=9).to_bytes())
+    results = []
+    for game in (GameManager(), GameManager()):
+        if results:
+            game.reset_game(course=course)
+        else:
+            game.reset_game(level=2, seed=9)
+        game.paused = False
+        game.game_over = False
+        keys = KeyState()
+        for _ in range(400):
+            game.step(keys)
+        results.append((game.outcome(), game.state.player.x, game.state.camera_y))
+    assert results[0] == results[1]
+
+
+def test_truncated_file_is_rejected():
+    data = timeline.build(1, seed=3).to_bytes()
+    with pytest.raises(ValueError):
+        timeline.Timeline.from_bytes(data[:-5])